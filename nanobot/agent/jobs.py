@@ -0,0 +1,184 @@
+"""Background shell jobs: commands that outlive a single tool call."""
+
+import asyncio
+import os
+import signal
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from loguru import logger
+
+from nanobot.bus.events import InboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.utils.offload import run_blocking
+
+# Finished jobs (and their spool files) kept around for job_output.
+MAX_FINISHED_JOBS = 20
+ANNOUNCE_TAIL_BYTES = 2000
+# A job whose spool file grows past this is killed and the file cut back to it.
+MAX_SPOOL_BYTES = 50_000_000
+SPOOL_CHECK_INTERVAL_S = 1.0
+
+
+@dataclass
+class Job:
+    id: str
+    command: str
+    cwd: str
+    output_path: Path
+    origin_channel: str
+    origin_chat_id: str
+    started_at: float = field(default_factory=time.time)
+    finished_at: float | None = None
+    returncode: int | None = None
+    killed: bool = False
+    overflowed: bool = False  # killed for passing the spool size cap
+    process: asyncio.subprocess.Process | None = None
+
+    @property
+    def running(self) -> bool:
+        return self.finished_at is None
+
+    def describe(self) -> str:
+        if self.running:
+            state = f"running for {time.time() - self.started_at:.0f}s"
+        elif self.killed:
+            state = "killed"
+        elif self.overflowed:
+            state = f"stopped after {self.finished_at - self.started_at:.0f}s: output passed the size limit"
+        else:
+            state = f"exited with code {self.returncode} after {self.finished_at - self.started_at:.0f}s"
+        return f"{self.id}: {state} — {self.command}"
+
+
+def _read_tail(path: Path, max_bytes: int) -> tuple[int, str]:
+    """Size of a spool file and its last `max_bytes`."""
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        f.seek(max(0, size - max_bytes))
+        return size, f.read().decode("utf-8", errors="replace")
+
+
+def _spool_size(path: Path) -> int:
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return 0
+
+
+def _killpg(process: asyncio.subprocess.Process) -> None:
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+class JobManager:
+    """
+    Runs shell commands in the background and reports when they finish.
+
+    Output goes straight from the process to a spool file, so a job costs
+    the event loop nothing while it runs and its output is not held in
+    memory. On exit the job is announced to the main agent through the bus,
+    like a subagent result. A job that writes more than `max_output_bytes`
+    is killed, and its spool file is cut back to that size.
+    """
+
+    def __init__(self, bus: MessageBus, spool_dir: Path, max_output_bytes: int = MAX_SPOOL_BYTES):
+        self.bus = bus
+        self.spool_dir = spool_dir
+        self.max_output_bytes = max_output_bytes
+        self._jobs: dict[str, Job] = {}
+        self._watchers: set[asyncio.Task[None]] = set()
+
+    async def start(self, command: str, cwd: str, origin_channel: str, origin_chat_id: str) -> Job:
+        job_id = uuid.uuid4().hex[:8]
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        job = Job(job_id, command, cwd, self.spool_dir / f"{job_id}.log", origin_channel, origin_chat_id)
+        with open(job.output_path, "wb") as out:
+            job.process = await asyncio.create_subprocess_shell(
+                command,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=out,
+                stderr=asyncio.subprocess.STDOUT,
+                cwd=cwd,
+                start_new_session=True,
+            )
+        self._jobs[job_id] = job
+        watcher = asyncio.create_task(self._watch(job))
+        self._watchers.add(watcher)
+        watcher.add_done_callback(self._watchers.discard)
+        logger.info(f"Job [{job_id}] started: {command}")
+        return job
+
+    async def _watch(self, job: Job) -> None:
+        exited = asyncio.ensure_future(job.process.wait())
+        while not (await asyncio.wait({exited}, timeout=SPOOL_CHECK_INTERVAL_S))[0]:
+            if not job.overflowed and _spool_size(job.output_path) > self.max_output_bytes:
+                logger.warning(f"Job [{job.id}] output passed {self.max_output_bytes} bytes, killing it")
+                job.overflowed = True
+                _killpg(job.process)
+        job.returncode = exited.result()
+        job.finished_at = time.time()
+        if job.overflowed:
+            await run_blocking(os.truncate, job.output_path, self.max_output_bytes)
+        logger.info(f"Job [{job.id}] finished with code {job.returncode}")
+        self._prune()
+        if not job.killed:
+            await self._announce(job)
+
+    async def _announce(self, job: Job) -> None:
+        """Tell the main agent the job is done, with the end of its output."""
+        size, tail = await run_blocking(_read_tail, job.output_path, ANNOUNCE_TAIL_BYTES)
+        if job.overflowed:
+            status_text = f"was stopped: its output passed {self.max_output_bytes:,} bytes"
+        elif job.returncode == 0:
+            status_text = "completed successfully"
+        else:
+            status_text = f"failed (exit code {job.returncode})"
+        content = f"""[Background job {job.id} {status_text}]
+
+Command: {job.command}
+
+Output ({size} bytes, last part shown; use job_output for more):
+{tail or "(no output)"}
+
+Summarize this naturally for the user. Keep it brief (1-2 sentences)."""
+        await self.bus.publish_inbound(InboundMessage(
+            channel="system",
+            sender_id="job",
+            chat_id=f"{job.origin_channel}:{job.origin_chat_id}",
+            content=content,
+        ))
+
+    def get(self, job_id: str) -> Job | None:
+        return self._jobs.get(job_id)
+
+    def list_jobs(self) -> list[Job]:
+        return list(self._jobs.values())
+
+    def kill(self, job_id: str) -> bool:
+        """Kill a running job and everything it started. Returns False if it was not running."""
+        job = self._jobs.get(job_id)
+        if not job or not job.running:
+            return False
+        job.killed = True
+        _killpg(job.process)
+        return True
+
+    def _prune(self) -> None:
+        finished = sorted((j for j in self._jobs.values() if not j.running), key=lambda j: j.finished_at)
+        for job in finished[:-MAX_FINISHED_JOBS]:
+            del self._jobs[job.id]
+            job.output_path.unlink(missing_ok=True)
+
+    async def close(self) -> None:
+        """Kill running jobs, wait for them to be reaped and delete their spool files."""
+        for job in self._jobs.values():
+            self.kill(job.id)
+        if self._watchers:
+            await asyncio.gather(*self._watchers, return_exceptions=True)
+        for job in self._jobs.values():
+            job.output_path.unlink(missing_ok=True)
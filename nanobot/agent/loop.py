@@ -4,27 +4,44 @@ import asyncio
 from contextlib import AsyncExitStack
 import json
 import json_repair
+import uuid
+from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from loguru import logger
 
-from nanobot.bus.events import InboundMessage, OutboundMessage
+from nanobot.bus.events import InboundMessage, MessagePriority, OutboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.providers.base import LLMProvider
 from nanobot.agent.context import ContextBuilder
 from nanobot.agent.tools.registry import ToolRegistry
-from nanobot.agent.tools.filesystem import ReadFileTool, WriteFileTool, EditFileTool, ListDirTool
+from nanobot.agent.tools.filesystem import ReadFileTool, ReadFilesTool, WriteFileTool, EditFileTool, ListDirTool
+from nanobot.agent.tools.search import SearchFilesTool
 from nanobot.agent.tools.shell import ExecTool
+from nanobot.agent.tools.jobs import JobKillTool, JobOutputTool, JobStatusTool
 from nanobot.agent.tools.web import WebSearchTool, WebFetchTool
 from nanobot.agent.tools.message import MessageTool
 from nanobot.agent.tools.spawn import SpawnTool
 from nanobot.agent.tools.cron import CronTool
 from nanobot.agent.tools.agent_zero_tool import AgentZeroTool
 from nanobot.agent.tools.n8n import N8nTool
+from nanobot.agent.tools.selection import DEFAULT_CORE_TOOLS, LoadToolsTool, ToolSelector
 from nanobot.agent.memory import MemoryStore
+from nanobot.agent.jobs import JobManager
 from nanobot.agent.subagent import SubagentManager
+from nanobot.agent.usage import BudgetExceededError, UsageLedger
 from nanobot.session.manager import Session, SessionManager
+from nanobot.utils.helpers import get_data_path
+from nanobot.utils.http_cache import WebCache
+from nanobot.utils.offload import run_blocking
+from nanobot.metrics import metrics
+from nanobot.profiling import profiler
+from nanobot.tracing import tracer
+
+if TYPE_CHECKING:
+    from nanobot.config.schema import ExecToolConfig, ToolSelectionConfig
+    from nanobot.cron.service import CronService
 
 
 class AgentLoop:
@@ -55,8 +72,12 @@ class AgentLoop:
         restrict_to_workspace: bool = False,
         session_manager: SessionManager | None = None,
         mcp_servers: dict | None = None,
+        usage_ledger: UsageLedger | None = None,
+        admins: list[str] | None = None,
+        web_cache: WebCache | None = None,
+        tool_selection: "ToolSelectionConfig | None" = None,
     ):
-        from nanobot.config.schema import ExecToolConfig
+        from nanobot.config.schema import ExecToolConfig, ToolSelectionConfig
         from nanobot.cron.service import CronService
         self.bus = bus
         self.provider = provider
@@ -67,13 +88,19 @@ class AgentLoop:
         self.max_tokens = max_tokens
         self.memory_window = memory_window
         self.brave_api_key = brave_api_key
+        self.web_cache = web_cache
         self.exec_config = exec_config or ExecToolConfig()
+        self.tool_selection = tool_selection or ToolSelectionConfig()
         self.cron_service = cron_service
         self.restrict_to_workspace = restrict_to_workspace
+        self.admins = set(admins or [])
 
         self.context = ContextBuilder(workspace)
         self.sessions = session_manager or SessionManager(workspace)
+        self.usage = usage_ledger or UsageLedger(get_data_path() / "usage")
         self.tools = ToolRegistry()
+        self.tool_selector: ToolSelector | None = None
+        self.jobs = JobManager(bus, get_data_path() / "jobs") if self.exec_config.background_jobs else None
         self.subagents = SubagentManager(
             provider=provider,
             workspace=workspace,
@@ -82,14 +109,20 @@ class AgentLoop:
             temperature=self.temperature,
             max_tokens=self.max_tokens,
             brave_api_key=brave_api_key,
+            web_cache=web_cache,
             exec_config=self.exec_config,
             restrict_to_workspace=restrict_to_workspace,
+            usage_ledger=self.usage,
         )
         
         self._running = False
         self._mcp_servers = mcp_servers or {}
         self._mcp_stack: AsyncExitStack | None = None
         self._mcp_connected = False
+        self._pending_replies: dict[str, asyncio.Future[OutboundMessage | None]] = {}
+        self._consume: asyncio.Future[InboundMessage] | None = None
+        self._stopped = asyncio.Event()
+        self._stopped.set()
         self._register_default_tools()
     
     def _register_default_tools(self) -> None:
@@ -97,20 +130,32 @@ class AgentLoop:
         # File tools (restrict to workspace if configured)
         allowed_dir = self.workspace if self.restrict_to_workspace else None
         self.tools.register(ReadFileTool(allowed_dir=allowed_dir))
+        self.tools.register(ReadFilesTool(allowed_dir=allowed_dir))
         self.tools.register(WriteFileTool(allowed_dir=allowed_dir))
         self.tools.register(EditFileTool(allowed_dir=allowed_dir))
         self.tools.register(ListDirTool(allowed_dir=allowed_dir))
+        self.tools.register(SearchFilesTool(self.workspace, allowed_dir=allowed_dir))
         
         # Shell tool
         self.tools.register(ExecTool(
             working_dir=str(self.workspace),
             timeout=self.exec_config.timeout,
             restrict_to_workspace=self.restrict_to_workspace,
+            persistent=self.exec_config.persistent,
+            idle_timeout=self.exec_config.idle_timeout,
+            max_sessions=self.exec_config.max_sessions,
+            progress_interval=self.exec_config.progress_interval,
+            send_callback=self.bus.publish_outbound,
+            jobs=self.jobs,
         ))
+        if self.jobs:
+            self.tools.register(JobStatusTool(self.jobs))
+            self.tools.register(JobOutputTool(self.jobs))
+            self.tools.register(JobKillTool(self.jobs))
         
         # Web tools
-        self.tools.register(WebSearchTool(api_key=self.brave_api_key))
-        self.tools.register(WebFetchTool())
+        self.tools.register(WebSearchTool(api_key=self.brave_api_key, cache=self.web_cache))
+        self.tools.register(WebFetchTool(cache=self.web_cache))
         
         # Message tool
         message_tool = MessageTool(send_callback=self.bus.publish_outbound)
@@ -127,8 +172,20 @@ class AgentLoop:
         # Agent Zero tool (for advanced AI capabilities)
         self.tools.register(AgentZeroTool(workspace=self.workspace))
 
-        # n8n tool (for workflow management)
-        self.tools.register(N8nTool())
+        # n8n tool (for workflow management; only when its config file exists)
+        try:
+            self.tools.register(N8nTool())
+        except (FileNotFoundError, ValueError) as e:
+            logger.debug(f"n8n tool not available: {e}")
+
+        # Tool subsetting: offer a relevant subset per turn, load_tools for the rest
+        if self.tool_selection.enabled:
+            self.tool_selector = ToolSelector(
+                self.tools,
+                core=self.tool_selection.core or DEFAULT_CORE_TOOLS,
+                max_tools=self.tool_selection.max_tools,
+            )
+            self.tools.register(LoadToolsTool(self.tool_selector))
 
     async def _connect_mcp(self) -> None:
         """Connect to configured MCP servers (one-time, lazy)."""
@@ -140,6 +197,18 @@ class AgentLoop:
         await self._mcp_stack.__aenter__()
         await connect_mcp_servers(self._mcp_servers, self.tools, self._mcp_stack)
 
+    def _select_tools(self, query: str) -> set[str] | None:
+        """Tools to offer for a turn, or None to offer them all."""
+        if not self.tool_selector:
+            return None
+        if isinstance(load_tool := self.tools.get("load_tools"), LoadToolsTool):
+            load_tool.begin_turn()
+        return self.tool_selector.select(query)
+
+    def _loaded_tools(self) -> set[str]:
+        load_tool = self.tools.get("load_tools")
+        return load_tool.loaded if isinstance(load_tool, LoadToolsTool) else set()
+
     def _set_tool_context(self, channel: str, chat_id: str) -> None:
         """Update context for all tools that need routing info."""
         if message_tool := self.tools.get("message"):
@@ -154,12 +223,25 @@ class AgentLoop:
             if isinstance(cron_tool, CronTool):
                 cron_tool.set_context(channel, chat_id)
 
-    async def _run_agent_loop(self, initial_messages: list[dict]) -> tuple[str | None, list[str]]:
+        if exec_tool := self.tools.get("exec"):
+            if isinstance(exec_tool, ExecTool):
+                exec_tool.set_context(channel, chat_id)
+
+    async def _run_agent_loop(
+        self,
+        initial_messages: list[dict],
+        session_key: str | None = None,
+        channel: str | None = None,
+        query: str | None = None,
+    ) -> tuple[str | None, list[str]]:
         """
         Run the agent iteration loop.
 
         Args:
             initial_messages: Starting messages for the LLM conversation.
+            session_key: Session the tokens are charged to.
+            channel: Channel the turn came from (for the usage ledger).
+            query: The message that started the turn, for tool selection.
 
         Returns:
             Tuple of (final_content, list_of_tools_used).
@@ -168,16 +250,36 @@ class AgentLoop:
         iteration = 0
         final_content = None
         tools_used: list[str] = []
+        offered = self._select_tools(query or "")
 
         while iteration < self.max_iterations:
             iteration += 1
 
-            response = await self.provider.chat(
-                messages=messages,
-                tools=self.tools.get_definitions(),
-                model=self.model,
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
+            try:
+                self.usage.check(session_key)
+            except BudgetExceededError as e:
+                logger.warning(f"Session {session_key}: {e}")
+                final_content = str(e)
+                break
+
+            # Tools the model loaded or called this turn stay offered
+            names = None if offered is None else offered | self._loaded_tools() | set(tools_used)
+            with (
+                metrics.timer("nanobot_llm_request_seconds", model=self.model),
+                tracer.span("llm.request", model=self.model, iteration=iteration) as span,
+            ):
+                response = await self.provider.chat(
+                    messages=messages,
+                    tools=self.tools.get_definitions(names),
+                    model=self.model,
+                    temperature=self.temperature,
+                    max_tokens=self.max_tokens,
+                )
+                if span:
+                    span.attrs.update(response.usage, tool_calls=len(response.tool_calls))
+            self.usage.record(
+                response.usage, model=self.model, site="turn",
+                session_key=session_key, channel=channel,
             )
 
             if response.has_tool_calls:
@@ -201,7 +303,14 @@ class AgentLoop:
                     tools_used.append(tool_call.name)
                     args_str = json.dumps(tool_call.arguments, ensure_ascii=False)
                     logger.info(f"Tool call: {tool_call.name}({args_str[:200]})")
-                    result = await self.tools.execute(tool_call.name, tool_call.arguments)
+                    with (
+                        metrics.timer("nanobot_tool_seconds", tool=tool_call.name),
+                        tracer.span(f"tool.{tool_call.name}"),
+                        profiler.section(),
+                    ):
+                        result = await self.tools.execute(tool_call.name, tool_call.arguments)
+                    if result.startswith("Error"):
+                        metrics.inc("nanobot_tool_errors_total", tool=tool_call.name)
                     messages = self.context.add_tool_result(
                         messages, tool_call.id, tool_call.name, result
                     )
@@ -213,31 +322,104 @@ class AgentLoop:
         return final_content, tools_used
 
     async def run(self) -> None:
-        """Run the agent loop, processing messages from the bus."""
+        """
+        Run the agent loop, processing messages from the bus.
+
+        Blocks on the bus without polling. `stop()` wakes an idle loop at once;
+        a turn already in progress is finished first.
+        """
         self._running = True
+        self._stopped.clear()
         await self._connect_mcp()
         logger.info("Agent loop started")
 
-        while self._running:
-            try:
-                msg = await asyncio.wait_for(
-                    self.bus.consume_inbound(),
-                    timeout=1.0
-                )
+        try:
+            while self._running:
+                self._consume = asyncio.ensure_future(self.bus.consume_inbound())
                 try:
-                    response = await self._process_message(msg)
-                    if response:
-                        await self.bus.publish_outbound(response)
-                except Exception as e:
-                    logger.error(f"Error processing message: {e}")
-                    await self.bus.publish_outbound(OutboundMessage(
-                        channel=msg.channel,
-                        chat_id=msg.chat_id,
-                        content=f"Sorry, I encountered an error: {str(e)}"
-                    ))
-            except asyncio.TimeoutError:
-                continue
+                    msg = await self._consume
+                except asyncio.CancelledError:
+                    if self._running:
+                        raise
+                    break
+                finally:
+                    self._consume = None
+                priority = msg.priority.name.lower()
+                metrics.observe(
+                    "nanobot_queue_wait_seconds",
+                    max(0.0, (datetime.now() - msg.timestamp).total_seconds()),
+                    priority=priority,
+                )
+                tracer.record("bus.queue", msg.timestamp.timestamp(), parent=msg.metadata, priority=priority)
+                with (
+                    metrics.timer("nanobot_turn_seconds", channel=msg.channel),
+                    tracer.span("agent.turn", parent=msg.metadata, session=msg.session_key),
+                ):
+                    await self._handle_inbound(msg)
+        finally:
+            self._stopped.set()
+
+    async def _handle_inbound(self, msg: InboundMessage) -> None:
+        """Run one turn and route its reply."""
+        # Replies to process_queued go back to the waiting caller, never
+        # to a channel; if the caller gave up, the reply is dropped.
+        request_id = msg.metadata.get("_request_id")
+        try:
+            with profiler.section():
+                response = await self._process_message(
+                    msg, session_key=msg.metadata.get("_session_key"),
+                )
+            if request_id:
+                self._resolve_reply(request_id, response=response)
+            elif response:
+                await self.bus.publish_outbound(response)
+        except Exception as e:
+            logger.error(f"Error processing message: {e}")
+            if request_id:
+                self._resolve_reply(request_id, error=e)
+                return
+            await self.bus.publish_outbound(OutboundMessage(
+                channel=msg.channel,
+                chat_id=msg.chat_id,
+                content=f"Sorry, I encountered an error: {str(e)}"
+            ))
+        # Acked only once the reply is queued (and logged), so a crash
+        # or shutdown mid-turn replays the message instead of losing it.
+        self.bus.ack(msg)
     
+    def _is_admin(self, sender_id: str) -> bool:
+        """Whether the sender (or any "|"-separated part of its id) is a configured admin."""
+        return bool(self.admins) and any(part in self.admins for part in str(sender_id).split("|") if part)
+
+    async def _profile_command(self, args: list[str]) -> str:
+        """Handle `/profile [on|off|status]` from an admin."""
+        action = args[0] if args else "status"
+        if action == "on":
+            if profiler.active:
+                return profiler.status()
+            profiler.start(get_data_path() / "profiles")
+            return f"Profiler on. Send /profile off to write the report to {profiler.output_dir}."
+        if action == "off":
+            path = await profiler.stop()
+            return f"Profiler off. Report: {path}" if path else "Profiler is off."
+        return profiler.status()
+
+    def _resolve_reply(
+        self,
+        request_id: str,
+        response: OutboundMessage | None = None,
+        error: Exception | None = None,
+    ) -> None:
+        """Hand a queued turn's outcome to its process_queued caller, if still waiting."""
+        reply = self._pending_replies.get(request_id)
+        if reply is None or reply.done():
+            logger.debug(f"Dropping reply for request {request_id}: caller no longer waiting")
+            return
+        if error is not None:
+            reply.set_exception(error)
+        else:
+            reply.set_result(response)
+
     async def close_mcp(self) -> None:
         """Close MCP connections."""
         if self._mcp_stack:
@@ -247,11 +429,39 @@ class AgentLoop:
                 pass  # MCP SDK cancel scope cleanup is noisy but harmless
             self._mcp_stack = None
 
+    async def close_tools(self) -> None:
+        """Close persistent exec shells, kill background jobs and flush the usage ledger."""
+        exec_tool = self.tools.get("exec")
+        if isinstance(exec_tool, ExecTool) and exec_tool.shells is not None:
+            await exec_tool.shells.close()
+        if self.jobs:
+            await self.jobs.close()
+        await self.usage.flush()
+
     def stop(self) -> None:
-        """Stop the agent loop."""
+        """Stop the agent loop once the current turn, if any, has finished."""
         self._running = False
+        if self._consume:
+            self._consume.cancel()
         logger.info("Agent loop stopping")
     
+    async def shutdown(self, timeout: float = 30.0) -> bool:
+        """
+        Stop the loop and wait for the in-flight turn to finish.
+
+        Returns False if the turn was still running after `timeout` seconds;
+        the caller may then cancel the `run()` task.
+        """
+        self.stop()
+        if self._stopped.is_set():
+            return True
+        try:
+            await asyncio.wait_for(self._stopped.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            logger.warning(f"Agent loop still busy after {timeout:.0f}s")
+            return False
+
     async def _process_message(self, msg: InboundMessage, session_key: str | None = None) -> OutboundMessage | None:
         """
         Process a single inbound message.
@@ -271,7 +481,7 @@ class AgentLoop:
         logger.info(f"Processing message from {msg.channel}:{msg.sender_id}: {preview}")
         
         key = session_key or msg.session_key
-        session = self.sessions.get_or_create(key)
+        session = await self.sessions.get_or_create_async(key)
         
         # Handle slash commands
         cmd = msg.content.strip().lower()
@@ -279,7 +489,7 @@ class AgentLoop:
             # Capture messages before clearing (avoid race condition with background task)
             messages_to_archive = session.messages.copy()
             session.clear()
-            self.sessions.save(session)
+            await self.sessions.save_async(session)
             self.sessions.invalidate(session.key)
 
             async def _consolidate_and_cleanup():
@@ -290,6 +500,9 @@ class AgentLoop:
             asyncio.create_task(_consolidate_and_cleanup())
             return OutboundMessage(channel=msg.channel, chat_id=msg.chat_id,
                                   content="New session started. Memory consolidation in progress.")
+        if (cmd == "/profile" or cmd.startswith("/profile ")) and self._is_admin(msg.sender_id):
+            return OutboundMessage(channel=msg.channel, chat_id=msg.chat_id,
+                                  content=await self._profile_command(cmd.split()[1:]))
         if cmd == "/help":
             return OutboundMessage(channel=msg.channel, chat_id=msg.chat_id,
                                   content="🐈 nanobot commands:\n/new — Start a new conversation\n/help — Show available commands")
@@ -298,14 +511,19 @@ class AgentLoop:
             asyncio.create_task(self._consolidate_memory(session))
 
         self._set_tool_context(msg.channel, msg.chat_id)
-        initial_messages = self.context.build_messages(
-            history=session.get_history(max_messages=self.memory_window),
-            current_message=msg.content,
-            media=msg.media if msg.media else None,
-            channel=msg.channel,
-            chat_id=msg.chat_id,
+        with metrics.timer("nanobot_context_build_seconds"), tracer.span("context.build"):
+            # Reads bootstrap/memory files and base64-encodes media: off the loop.
+            initial_messages = await run_blocking(
+                self.context.build_messages,
+                history=session.get_history(max_messages=self.memory_window),
+                current_message=msg.content,
+                media=msg.media if msg.media else None,
+                channel=msg.channel,
+                chat_id=msg.chat_id,
+            )
+        final_content, tools_used = await self._run_agent_loop(
+            initial_messages, session_key=key, channel=msg.channel, query=msg.content,
         )
-        final_content, tools_used = await self._run_agent_loop(initial_messages)
 
         if final_content is None:
             final_content = "I've completed processing but have no response to give."
@@ -316,7 +534,8 @@ class AgentLoop:
         session.add_message("user", msg.content)
         session.add_message("assistant", final_content,
                             tools_used=tools_used if tools_used else None)
-        self.sessions.save(session)
+        with metrics.timer("nanobot_session_save_seconds"), tracer.span("session.save"):
+            await self.sessions.save_async(session)
         
         return OutboundMessage(
             channel=msg.channel,
@@ -345,22 +564,25 @@ class AgentLoop:
             origin_chat_id = msg.chat_id
         
         session_key = f"{origin_channel}:{origin_chat_id}"
-        session = self.sessions.get_or_create(session_key)
+        session = await self.sessions.get_or_create_async(session_key)
         self._set_tool_context(origin_channel, origin_chat_id)
-        initial_messages = self.context.build_messages(
+        initial_messages = await run_blocking(
+            self.context.build_messages,
             history=session.get_history(max_messages=self.memory_window),
             current_message=msg.content,
             channel=origin_channel,
             chat_id=origin_chat_id,
         )
-        final_content, _ = await self._run_agent_loop(initial_messages)
+        final_content, _ = await self._run_agent_loop(
+            initial_messages, session_key=session_key, channel=origin_channel, query=msg.content,
+        )
 
         if final_content is None:
             final_content = "Background task completed."
         
         session.add_message("user", f"[System: {msg.sender_id}] {msg.content}")
         session.add_message("assistant", final_content)
-        self.sessions.save(session)
+        await self.sessions.save_async(session)
         
         return OutboundMessage(
             channel=origin_channel,
@@ -421,6 +643,7 @@ class AgentLoop:
 Respond with ONLY valid JSON, no markdown fences."""
 
         try:
+            self.usage.check(session.key)
             response = await self.provider.chat(
                 messages=[
                     {"role": "system", "content": "You are a memory consolidation agent. Respond only with valid JSON."},
@@ -428,6 +651,9 @@ Respond with ONLY valid JSON, no markdown fences."""
                 ],
                 model=self.model,
             )
+            self.usage.record(
+                response.usage, model=self.model, site="consolidation", session_key=session.key,
+            )
             text = (response.content or "").strip()
             if not text:
                 logger.warning("Memory consolidation: LLM returned empty response, skipping")
@@ -480,5 +706,48 @@ Respond with ONLY valid JSON, no markdown fences."""
             content=content
         )
         
-        response = await self._process_message(msg, session_key=session_key)
+        with profiler.section():
+            response = await self._process_message(msg, session_key=session_key)
+        return response.content if response else ""
+
+    async def process_queued(
+        self,
+        content: str,
+        session_key: str,
+        channel: str = "cli",
+        chat_id: str = "direct",
+        priority: MessagePriority = MessagePriority.BACKGROUND,
+    ) -> str:
+        """
+        Schedule a message through the bus and wait for the agent's response.
+
+        Unlike process_direct, the turn is queued behind higher-priority
+        traffic, so cron and heartbeat runs never delay interactive replies.
+        Requires run() to be consuming the bus.
+
+        Args:
+            content: The message content.
+            session_key: Session identifier (overrides channel:chat_id for session lookup).
+            channel: Source channel (for tool context routing).
+            chat_id: Source chat ID (for tool context routing).
+            priority: Scheduling lane for the turn.
+
+        Returns:
+            The agent's response.
+        """
+        request_id = uuid.uuid4().hex[:12]
+        reply: asyncio.Future[OutboundMessage | None] = asyncio.get_running_loop().create_future()
+        self._pending_replies[request_id] = reply
+        try:
+            await self.bus.publish_inbound(InboundMessage(
+                channel=channel,
+                sender_id="user",
+                chat_id=chat_id,
+                content=content,
+                priority=priority,
+                metadata={"_request_id": request_id, "_session_key": session_key},
+            ))
+            response = await reply
+        finally:
+            self._pending_replies.pop(request_id, None)
         return response.content if response else ""
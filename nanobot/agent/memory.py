@@ -2,6 +2,7 @@
 
 from pathlib import Path
 
+from nanobot.utils.atomic import atomic_write
 from nanobot.utils.helpers import ensure_dir
 
 
@@ -19,7 +20,7 @@ class MemoryStore:
         return ""
 
     def write_long_term(self, content: str) -> None:
-        self.memory_file.write_text(content, encoding="utf-8")
+        atomic_write(self.memory_file, content)
 
     def append_history(self, entry: str) -> None:
         with open(self.history_file, "a", encoding="utf-8") as f:
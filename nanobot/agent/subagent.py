@@ -12,9 +12,13 @@ from nanobot.bus.events import InboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.providers.base import LLMProvider
 from nanobot.agent.tools.registry import ToolRegistry
-from nanobot.agent.tools.filesystem import ReadFileTool, WriteFileTool, EditFileTool, ListDirTool
+from nanobot.agent.tools.filesystem import ReadFileTool, ReadFilesTool, WriteFileTool, EditFileTool, ListDirTool
+from nanobot.agent.tools.search import SearchFilesTool
 from nanobot.agent.tools.shell import ExecTool
 from nanobot.agent.tools.web import WebSearchTool, WebFetchTool
+from nanobot.agent.usage import UsageLedger
+from nanobot.utils.http_cache import WebCache
+from nanobot.profiling import profiler
 
 
 class SubagentManager:
@@ -35,8 +39,10 @@ class SubagentManager:
         temperature: float = 0.7,
         max_tokens: int = 4096,
         brave_api_key: str | None = None,
+        web_cache: WebCache | None = None,
         exec_config: "ExecToolConfig | None" = None,
         restrict_to_workspace: bool = False,
+        usage_ledger: UsageLedger | None = None,
     ):
         from nanobot.config.schema import ExecToolConfig
         self.provider = provider
@@ -46,8 +52,10 @@ class SubagentManager:
         self.temperature = temperature
         self.max_tokens = max_tokens
         self.brave_api_key = brave_api_key
+        self.web_cache = web_cache
         self.exec_config = exec_config or ExecToolConfig()
         self.restrict_to_workspace = restrict_to_workspace
+        self.usage = usage_ledger
         self._running_tasks: dict[str, asyncio.Task[None]] = {}
     
     async def spawn(
@@ -104,16 +112,18 @@ class SubagentManager:
             tools = ToolRegistry()
             allowed_dir = self.workspace if self.restrict_to_workspace else None
             tools.register(ReadFileTool(allowed_dir=allowed_dir))
+            tools.register(ReadFilesTool(allowed_dir=allowed_dir))
             tools.register(WriteFileTool(allowed_dir=allowed_dir))
             tools.register(EditFileTool(allowed_dir=allowed_dir))
             tools.register(ListDirTool(allowed_dir=allowed_dir))
+            tools.register(SearchFilesTool(self.workspace, allowed_dir=allowed_dir))
             tools.register(ExecTool(
                 working_dir=str(self.workspace),
                 timeout=self.exec_config.timeout,
                 restrict_to_workspace=self.restrict_to_workspace,
             ))
-            tools.register(WebSearchTool(api_key=self.brave_api_key))
-            tools.register(WebFetchTool())
+            tools.register(WebSearchTool(api_key=self.brave_api_key, cache=self.web_cache))
+            tools.register(WebFetchTool(cache=self.web_cache))
             
             # Build messages with subagent-specific prompt
             system_prompt = self._build_subagent_prompt(task)
@@ -127,9 +137,13 @@ class SubagentManager:
             iteration = 0
             final_result: str | None = None
             
+            # Subagent tokens are charged to the chat that spawned it
+            session_key = f"{origin['channel']}:{origin['chat_id']}"
             while iteration < max_iterations:
                 iteration += 1
                 
+                if self.usage:
+                    self.usage.check(session_key)
                 response = await self.provider.chat(
                     messages=messages,
                     tools=tools.get_definitions(),
@@ -137,6 +151,11 @@ class SubagentManager:
                     temperature=self.temperature,
                     max_tokens=self.max_tokens,
                 )
+                if self.usage:
+                    self.usage.record(
+                        response.usage, model=self.model, site="subagent",
+                        session_key=session_key, channel=origin["channel"],
+                    )
                 
                 if response.has_tool_calls:
                     # Add assistant message with tool calls
@@ -161,7 +180,8 @@ class SubagentManager:
                     for tool_call in response.tool_calls:
                         args_str = json.dumps(tool_call.arguments)
                         logger.debug(f"Subagent [{task_id}] executing: {tool_call.name} with arguments: {args_str}")
-                        result = await tools.execute(tool_call.name, tool_call.arguments)
+                        with profiler.section():
+                            result = await tools.execute(tool_call.name, tool_call.arguments)
                         messages.append({
                             "role": "tool",
                             "tool_call_id": tool_call.id,
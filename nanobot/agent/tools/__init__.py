@@ -1,8 +1,10 @@
 """Agent tools package."""
 
 from nanobot.agent.tools.base import Tool
-from nanobot.agent.tools.filesystem import ReadFileTool, WriteFileTool, EditFileTool, ListDirTool
+from nanobot.agent.tools.filesystem import ReadFileTool, ReadFilesTool, WriteFileTool, EditFileTool, ListDirTool
+from nanobot.agent.tools.search import SearchFilesTool
 from nanobot.agent.tools.shell import ExecTool
+from nanobot.agent.tools.jobs import JobStatusTool, JobOutputTool, JobKillTool
 from nanobot.agent.tools.web import WebSearchTool, WebFetchTool
 from nanobot.agent.tools.message import MessageTool
 from nanobot.agent.tools.spawn import SpawnTool
@@ -12,12 +14,13 @@ from nanobot.agent.tools.local import LocalTool
 from nanobot.agent.tools.http_request import HttpRequestTool
 from nanobot.agent.tools.agent_zero_tool import AgentZeroTool
 from nanobot.agent.tools.n8n import N8nTool
+from nanobot.agent.tools.selection import LoadToolsTool, ToolSelector
 
 __all__ = [
     'Tool',
-    'ReadFileTool', 'WriteFileTool', 'EditFileTool', 'ListDirTool',
-    'ExecTool', 'WebSearchTool', 'WebFetchTool', 'MessageTool',
+    'ReadFileTool', 'ReadFilesTool', 'WriteFileTool', 'EditFileTool', 'ListDirTool', 'SearchFilesTool',
+    'ExecTool', 'JobStatusTool', 'JobOutputTool', 'JobKillTool', 'WebSearchTool', 'WebFetchTool', 'MessageTool',
     'SpawnTool', 'CronTool',
     'ModeTool', 'LocalTool', 'HttpRequestTool', 'AgentZeroTool',
-    'N8nTool'
+    'N8nTool', 'LoadToolsTool', 'ToolSelector'
 ]
@@ -77,27 +77,29 @@ Parameters:
     ) -> str:
         """Execute command in Agent Zero."""
         try:
-            import httpx
+            from nanobot.utils.http import get_http_client
+
+            client = get_http_client()
 
             # Step 1: Get CSRF token
             csrf_url = f"{self.api_url}/csrf_token"
-            async with httpx.AsyncClient(timeout=10) as client:
-                csrf_response = await client.get(
-                    csrf_url,
-                    headers={"Origin": self.api_url}
-                )
+            csrf_response = await client.get(
+                csrf_url,
+                headers={"Origin": self.api_url},
+                timeout=10,
+            )
 
-                if csrf_response.status_code != 200:
-                    return f"Error: Failed to get CSRF token (status {csrf_response.status_code})"
+            if csrf_response.status_code != 200:
+                return f"Error: Failed to get CSRF token (status {csrf_response.status_code})"
 
-                csrf_data = csrf_response.json()
-                if not csrf_data.get("ok"):
-                    return f"Error: {csrf_data.get('error', 'Unknown CSRF error')}"
+            csrf_data = csrf_response.json()
+            if not csrf_data.get("ok"):
+                return f"Error: {csrf_data.get('error', 'Unknown CSRF error')}"
 
-                self._csrf_token = csrf_data["token"]
+            self._csrf_token = csrf_data["token"]
 
-                # Extract cookies from response
-                self._cookies = dict(csrf_response.cookies)
+            # Extract cookies from response (the shared client does not keep them)
+            self._cookies = dict(csrf_response.cookies)
 
             # Step 2: Send message to Agent Zero
             message_url = f"{self.api_url}/message"
@@ -113,31 +115,32 @@ Parameters:
                 "X-CSRF-Token": self._csrf_token,
                 "Origin": self.api_url
             }
+            if self._cookies:
+                headers["Cookie"] = "; ".join(f"{k}={v}" for k, v in self._cookies.items())
 
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                message_response = await client.post(
-                    message_url,
-                    json=payload,
-                    headers=headers,
-                    cookies=self._cookies
-                )
+            message_response = await client.post(
+                message_url,
+                json=payload,
+                headers=headers,
+                timeout=timeout,
+            )
 
-                if message_response.status_code != 200:
-                    return f"Error: Failed to send message (status {message_response.status_code})"
+            if message_response.status_code != 200:
+                return f"Error: Failed to send message (status {message_response.status_code})"
 
-                result = message_response.json()
+            result = message_response.json()
 
-                # Format response
-                response_message = result.get("message", "")
-                context_id = result.get("context", "")
+            # Format response
+            response_message = result.get("message", "")
+            context_id = result.get("context", "")
 
-                output = [
-                    f"🔌 Agent Zero Response (Context: {context_id})",
-                    "",
-                    response_message
-                ]
+            output = [
+                f"🔌 Agent Zero Response (Context: {context_id})",
+                "",
+                response_message
+            ]
 
-                return "\n".join(output)
+            return "\n".join(output)
 
         except asyncio.TimeoutError:
             return f"Error: Request timed out after {timeout} seconds"
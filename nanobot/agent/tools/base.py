@@ -1,7 +1,11 @@
 """Base class for agent tools."""
 
+import functools
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Callable
+
+# (value, path) -> errors
+Validator = Callable[[Any, str], list[str]]
 
 
 class Tool(ABC):
@@ -54,42 +58,70 @@ class Tool(ABC):
 
     def validate_params(self, params: dict[str, Any]) -> list[str]:
         """Validate tool parameters against JSON schema. Returns error list (empty if valid)."""
+        return self.validator(params, "")
+
+    @functools.cached_property
+    def validator(self) -> "Validator":
+        """The parameter schema compiled once into a validating function."""
         schema = self.parameters or {}
         if schema.get("type", "object") != "object":
             raise ValueError(f"Schema must be object type, got {schema.get('type')!r}")
-        return self._validate(params, {**schema, "type": "object"}, "")
+        return self._compile({**schema, "type": "object"})
 
-    def _validate(self, val: Any, schema: dict[str, Any], path: str) -> list[str]:
-        t, label = schema.get("type"), path or "parameter"
-        if t in self._TYPE_MAP and not isinstance(val, self._TYPE_MAP[t]):
-            return [f"{label} should be {t}"]
-        
-        errors = []
-        if "enum" in schema and val not in schema["enum"]:
-            errors.append(f"{label} must be one of {schema['enum']}")
+    @classmethod
+    def _compile(cls, schema: dict[str, Any]) -> "Validator":
+        """
+        Turn a schema into a function of (value, path) returning errors.
+
+        Everything that depends only on the schema (type, bounds, nested
+        validators) is worked out here; the returned closure only checks values.
+        """
+        t = schema.get("type")
+        expected = cls._TYPE_MAP.get(t)
+        checks: list[Validator] = []
+
+        if "enum" in schema:
+            enum = schema["enum"]
+            checks.append(lambda v, label: [f"{label} must be one of {enum}"] if v not in enum else [])
         if t in ("integer", "number"):
-            if "minimum" in schema and val < schema["minimum"]:
-                errors.append(f"{label} must be >= {schema['minimum']}")
-            if "maximum" in schema and val > schema["maximum"]:
-                errors.append(f"{label} must be <= {schema['maximum']}")
+            if "minimum" in schema:
+                lo = schema["minimum"]
+                checks.append(lambda v, label: [f"{label} must be >= {lo}"] if v < lo else [])
+            if "maximum" in schema:
+                hi = schema["maximum"]
+                checks.append(lambda v, label: [f"{label} must be <= {hi}"] if v > hi else [])
         if t == "string":
-            if "minLength" in schema and len(val) < schema["minLength"]:
-                errors.append(f"{label} must be at least {schema['minLength']} chars")
-            if "maxLength" in schema and len(val) > schema["maxLength"]:
-                errors.append(f"{label} must be at most {schema['maxLength']} chars")
-        if t == "object":
-            props = schema.get("properties", {})
-            for k in schema.get("required", []):
-                if k not in val:
-                    errors.append(f"missing required {path + '.' + k if path else k}")
-            for k, v in val.items():
-                if k in props:
-                    errors.extend(self._validate(v, props[k], path + '.' + k if path else k))
-        if t == "array" and "items" in schema:
-            for i, item in enumerate(val):
-                errors.extend(self._validate(item, schema["items"], f"{path}[{i}]" if path else f"[{i}]"))
-        return errors
-    
+            if "minLength" in schema:
+                min_len = schema["minLength"]
+                checks.append(lambda v, label: [f"{label} must be at least {min_len} chars"] if len(v) < min_len else [])
+            if "maxLength" in schema:
+                max_len = schema["maxLength"]
+                checks.append(lambda v, label: [f"{label} must be at most {max_len} chars"] if len(v) > max_len else [])
+
+        def validate(val: Any, path: str) -> list[str]:
+            label = path or "parameter"
+            if expected is not None and not isinstance(val, expected):
+                return [f"{label} should be {t}"]
+            errors = []
+            for check in checks:
+                errors.extend(check(val, label))
+            if t == "object":
+                for k in required:
+                    if k not in val:
+                        errors.append(f"missing required {path + '.' + k if path else k}")
+                for k, v in val.items():
+                    if k in props:
+                        errors.extend(props[k](v, path + '.' + k if path else k))
+            if items is not None:
+                for i, item in enumerate(val):
+                    errors.extend(items(item, f"{path}[{i}]" if path else f"[{i}]"))
+            return errors
+
+        required = schema.get("required", []) if t == "object" else []
+        props = {k: cls._compile(v) for k, v in schema.get("properties", {}).items()} if t == "object" else {}
+        items = cls._compile(schema["items"]) if t == "array" and "items" in schema else None
+        return validate
+
     def to_schema(self) -> dict[str, Any]:
         """Convert tool to OpenAI function schema format."""
         return {
@@ -1,9 +1,24 @@
 """File system tools: read, write, edit."""
 
+import asyncio
+import fnmatch
+import mmap
+import os
 from pathlib import Path
 from typing import Any
 
 from nanobot.agent.tools.base import Tool
+from nanobot.utils.atomic import atomic_write, file_lock
+from nanobot.utils.offload import run_blocking
+
+# What read_file returns at most per call, so a huge file cannot flood the
+# context window; the agent pages through the rest with offset/byte_offset.
+MAX_READ_BYTES = 100_000
+# Larger files are memory-mapped rather than read whole.
+MMAP_THRESHOLD = 1_000_000
+# Total output of one read_files call, shared between its files.
+MAX_BATCH_READ_BYTES = 200_000
+MAX_LIST_ENTRIES = 1000
 
 
 def _resolve_path(path: str, allowed_dir: Path | None = None) -> Path:
@@ -15,10 +30,11 @@ def _resolve_path(path: str, allowed_dir: Path | None = None) -> Path:
 
 
 class ReadFileTool(Tool):
-    """Tool to read file contents."""
+    """Tool to read file contents, or a window of them."""
     
-    def __init__(self, allowed_dir: Path | None = None):
+    def __init__(self, allowed_dir: Path | None = None, max_bytes: int = MAX_READ_BYTES):
         self._allowed_dir = allowed_dir
+        self.max_bytes = max_bytes
 
     @property
     def name(self) -> str:
@@ -26,7 +42,10 @@ class ReadFileTool(Tool):
     
     @property
     def description(self) -> str:
-        return "Read the contents of a file at the given path."
+        return (
+            "Read the contents of a file at the given path. Large files are cut off with a notice; "
+            "use offset/limit (lines), tail, or byte_offset to read other parts."
+        )
     
     @property
     def parameters(self) -> dict[str, Any]:
@@ -36,12 +55,46 @@ class ReadFileTool(Tool):
                 "path": {
                     "type": "string",
                     "description": "The file path to read"
+                },
+                "offset": {
+                    "type": "integer",
+                    "description": "Line number to start reading from (1-based)",
+                    "minimum": 1
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of lines to read",
+                    "minimum": 1
+                },
+                "tail": {
+                    "type": "integer",
+                    "description": "Read the last N lines instead",
+                    "minimum": 1
+                },
+                "byte_offset": {
+                    "type": "integer",
+                    "description": "Byte position to start reading from",
+                    "minimum": 0
+                },
+                "max_bytes": {
+                    "type": "integer",
+                    "description": "Maximum number of bytes to return",
+                    "minimum": 1
                 }
             },
             "required": ["path"]
         }
     
-    async def execute(self, path: str, **kwargs: Any) -> str:
+    async def execute(
+        self,
+        path: str,
+        offset: int | None = None,
+        limit: int | None = None,
+        tail: int | None = None,
+        byte_offset: int | None = None,
+        max_bytes: int | None = None,
+        **kwargs: Any,
+    ) -> str:
         try:
             file_path = _resolve_path(path, self._allowed_dir)
             if not file_path.exists():
@@ -49,14 +102,136 @@ class ReadFileTool(Tool):
             if not file_path.is_file():
                 return f"Error: Not a file: {path}"
             
-            content = file_path.read_text(encoding="utf-8")
-            return content
+            cap = min(max_bytes or self.max_bytes, self.max_bytes)
+            return await run_blocking(_read_window, file_path, offset, limit, tail, byte_offset, cap)
         except PermissionError as e:
             return f"Error: {e}"
         except Exception as e:
             return f"Error reading file: {str(e)}"
 
 
+def _read_window(
+    path: Path,
+    offset: int | None,
+    limit: int | None,
+    tail: int | None,
+    byte_offset: int | None,
+    max_bytes: int,
+) -> str:
+    """
+    Read part of a file: from a line or byte position, or the last lines.
+
+    Files over MMAP_THRESHOLD are memory-mapped, so only the pages around
+    the requested window are read from disk. A notice is appended whenever
+    the result is not the whole file, saying where to continue.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size > MMAP_THRESHOLD:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            data = f.read()
+            size = len(data)  # st_size is 0 for some special files
+    try:
+        if tail:
+            start = _tail_start(data, size, tail)
+        elif byte_offset is not None:
+            start = min(byte_offset, size)
+        elif offset and offset > 1:
+            start = _skip_lines(data, 0, size, offset - 1)
+        else:
+            start = 0
+        end = min(size, start + max_bytes)
+        if limit:
+            end = _skip_lines(data, start, end, limit)
+        text = data[start:end].decode("utf-8", errors="replace")
+    finally:
+        if isinstance(data, mmap.mmap):
+            data.close()
+
+    if start == 0 and end == size:
+        return text
+    notice = f"[Showing bytes {start}-{end} of {size}]"
+    if end < size:
+        hint = f"byte_offset={end}"
+        if offset or limit:
+            next_line = (offset or 1) + text.count("\n")
+            hint = f"offset={next_line} or {hint}"
+        notice = f"[Showing bytes {start}-{end} of {size}. Continue with {hint}]"
+    return text + ("\n" if text.endswith("\n") else "\n\n") + notice
+
+
+def _skip_lines(data: bytes | mmap.mmap, pos: int, end: int, lines: int) -> int:
+    """Position just after the `lines`-th newline from `pos`, or `end` if there are fewer."""
+    for _ in range(lines):
+        nl = data.find(b"\n", pos, end)
+        if nl == -1:
+            return end
+        pos = nl + 1
+    return pos
+
+
+def _tail_start(data: bytes | mmap.mmap, size: int, lines: int) -> int:
+    """Start of the last `lines` lines (a trailing newline does not count as a line)."""
+    pos = size - 1 if size and data[size - 1:size] == b"\n" else size
+    for _ in range(lines):
+        nl = data.rfind(b"\n", 0, pos)
+        if nl == -1:
+            return 0
+        pos = nl
+    return pos + 1
+
+
+class ReadFilesTool(Tool):
+    """Tool to read several files, or windows of them, in one call."""
+
+    def __init__(self, allowed_dir: Path | None = None, max_bytes: int = MAX_BATCH_READ_BYTES):
+        self._allowed_dir = allowed_dir
+        self.max_bytes = max_bytes
+
+    @property
+    def name(self) -> str:
+        return "read_files"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Read several files at once instead of calling read_file for each. Every entry takes "
+            "the same options as read_file. The output budget is split between the files."
+        )
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "files": {
+                    "type": "array",
+                    "description": "Files to read",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "path": {"type": "string", "description": "The file path to read"},
+                            "offset": {"type": "integer", "minimum": 1},
+                            "limit": {"type": "integer", "minimum": 1},
+                            "tail": {"type": "integer", "minimum": 1},
+                            "byte_offset": {"type": "integer", "minimum": 0}
+                        },
+                        "required": ["path"]
+                    }
+                }
+            },
+            "required": ["files"]
+        }
+
+    async def execute(self, files: list[dict[str, Any]], **kwargs: Any) -> str:
+        if not files:
+            return "Error: No files given"
+        reader = ReadFileTool(self._allowed_dir, max_bytes=max(1, self.max_bytes // len(files)))
+        results = await asyncio.gather(*(reader.execute(**spec) for spec in files))
+        return "\n\n".join(f"=== {spec['path']} ===\n{text}" for spec, text in zip(files, results))
+
+
 class WriteFileTool(Tool):
     """Tool to write content to a file."""
     
@@ -92,7 +267,7 @@ class WriteFileTool(Tool):
         try:
             file_path = _resolve_path(path, self._allowed_dir)
             file_path.parent.mkdir(parents=True, exist_ok=True)
-            file_path.write_text(content, encoding="utf-8")
+            await run_blocking(atomic_write, file_path, content)
             return f"Successfully wrote {len(content)} bytes to {path}"
         except PermissionError as e:
             return f"Error: {e}"
@@ -112,7 +287,10 @@ class EditFileTool(Tool):
     
     @property
     def description(self) -> str:
-        return "Edit a file by replacing old_text with new_text. The old_text must exist exactly in the file."
+        return (
+            "Edit a file by replacing old_text with new_text. The old_text must exist exactly in the file. "
+            "Pass several replacements in edits to apply them together: all succeed or none are written."
+        )
     
     @property
     def parameters(self) -> dict[str, Any]:
@@ -130,30 +308,49 @@ class EditFileTool(Tool):
                 "new_text": {
                     "type": "string",
                     "description": "The text to replace with"
+                },
+                "edits": {
+                    "type": "array",
+                    "description": "Several replacements, applied in order",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "old_text": {"type": "string"},
+                            "new_text": {"type": "string"}
+                        },
+                        "required": ["old_text", "new_text"]
+                    }
                 }
             },
-            "required": ["path", "old_text", "new_text"]
+            "required": ["path"]
         }
     
-    async def execute(self, path: str, old_text: str, new_text: str, **kwargs: Any) -> str:
+    async def execute(
+        self,
+        path: str,
+        old_text: str | None = None,
+        new_text: str | None = None,
+        edits: list[dict[str, str]] | None = None,
+        **kwargs: Any,
+    ) -> str:
+        edits = list(edits or [])
+        if old_text is not None:
+            if new_text is None:
+                return "Error: new_text is required with old_text"
+            edits.insert(0, {"old_text": old_text, "new_text": new_text})
+        if not edits:
+            return "Error: Provide old_text and new_text, or edits"
+
         try:
             file_path = _resolve_path(path, self._allowed_dir)
             if not file_path.exists():
                 return f"Error: File not found: {path}"
             
-            content = file_path.read_text(encoding="utf-8")
-            
-            if old_text not in content:
-                return f"Error: old_text not found in file. Make sure it matches exactly."
-            
-            # Count occurrences
-            count = content.count(old_text)
-            if count > 1:
-                return f"Warning: old_text appears {count} times. Please provide more context to make it unique."
-            
-            new_content = content.replace(old_text, new_text, 1)
-            file_path.write_text(new_content, encoding="utf-8")
+            if error := await run_blocking(_apply_edits, file_path, edits):
+                return error
             
+            if len(edits) > 1:
+                return f"Successfully edited {path} ({len(edits)} replacements)"
             return f"Successfully edited {path}"
         except PermissionError as e:
             return f"Error: {e}"
@@ -161,6 +358,36 @@ class EditFileTool(Tool):
             return f"Error editing file: {str(e)}"
 
 
+def _apply_edits(file_path: Path, edits: list[dict[str, str]]) -> str | None:
+    """
+    Apply replacements to a file, returning an error message if one fails.
+
+    Every edit is applied in memory first, so a failing one leaves the file
+    untouched. The file is locked from read to write, so concurrent edits
+    cannot lose each other's changes.
+    """
+    with file_lock(file_path):
+        content = file_path.read_text(encoding="utf-8")
+
+        for i, edit in enumerate(edits, 1):
+            label = f"edit {i}: " if len(edits) > 1 else ""
+            if edit["old_text"] not in content:
+                return f"Error: {label}old_text not found in file. Make sure it matches exactly."
+
+            # Count occurrences
+            count = content.count(edit["old_text"])
+            if count > 1:
+                return (
+                    f"Warning: {label}old_text appears {count} times. "
+                    "Please provide more context to make it unique."
+                )
+
+            content = content.replace(edit["old_text"], edit["new_text"], 1)
+
+        atomic_write(file_path, content)
+    return None
+
+
 class ListDirTool(Tool):
     """Tool to list directory contents."""
     
@@ -173,7 +400,7 @@ class ListDirTool(Tool):
     
     @property
     def description(self) -> str:
-        return "List the contents of a directory."
+        return "List the contents of a directory, optionally recursively and filtered by a glob pattern."
     
     @property
     def parameters(self) -> dict[str, Any]:
@@ -183,12 +410,22 @@ class ListDirTool(Tool):
                 "path": {
                     "type": "string",
                     "description": "The directory path to list"
+                },
+                "depth": {
+                    "type": "integer",
+                    "description": "How many levels to descend (default 1: just this directory)",
+                    "minimum": 1,
+                    "maximum": 10
+                },
+                "glob": {
+                    "type": "string",
+                    "description": "Only list files whose name matches this pattern, e.g. *.py"
                 }
             },
             "required": ["path"]
         }
     
-    async def execute(self, path: str, **kwargs: Any) -> str:
+    async def execute(self, path: str, depth: int = 1, glob: str | None = None, **kwargs: Any) -> str:
         try:
             dir_path = _resolve_path(path, self._allowed_dir)
             if not dir_path.exists():
@@ -196,16 +433,37 @@ class ListDirTool(Tool):
             if not dir_path.is_dir():
                 return f"Error: Not a directory: {path}"
             
-            items = []
-            for item in sorted(dir_path.iterdir()):
-                prefix = "📁 " if item.is_dir() else "📄 "
-                items.append(f"{prefix}{item.name}")
+            items = await run_blocking(_list_tree, dir_path, depth, glob)
             
             if not items:
-                return f"Directory {path} is empty"
+                return f"No files matching {glob} in {path}" if glob else f"Directory {path} is empty"
+            if len(items) > MAX_LIST_ENTRIES:
+                items[MAX_LIST_ENTRIES:] = [f"[Stopped after {MAX_LIST_ENTRIES} entries]"]
             
             return "\n".join(items)
         except PermissionError as e:
             return f"Error: {e}"
         except Exception as e:
             return f"Error listing directory: {str(e)}"
+
+
+def _list_tree(root: Path, depth: int, glob: str | None) -> list[str]:
+    """
+    Entries under `root` as paths relative to it, down to `depth` levels.
+
+    With `glob`, only matching files are listed. Stops one past
+    MAX_LIST_ENTRIES so the caller can tell the listing was cut.
+    """
+    items: list[str] = []
+    pending = [(root, 1)]
+    while pending and len(items) <= MAX_LIST_ENTRIES:
+        directory, level = pending.pop()
+        children = sorted(directory.iterdir())
+        for item in children:
+            is_dir = item.is_dir()
+            if not glob or (not is_dir and fnmatch.fnmatch(item.name, glob)):
+                prefix = "📁 " if is_dir else "📄 "
+                items.append(f"{prefix}{item.relative_to(root)}")
+        # A subdirectory's entries follow its parent's, depth-first in name order
+        pending.extend((c, level + 1) for c in reversed(children) if level < depth and c.is_dir())
+    return items
@@ -70,7 +70,7 @@ Parameters:
     ) -> str:
         """Execute HTTP request."""
         try:
-            import httpx
+            from nanobot.utils.http import get_http_client
 
             timeout_val = timeout or self.timeout
 
@@ -82,47 +82,47 @@ Parameters:
                 request_headers.update(headers)
 
             # Make request
-            async with httpx.AsyncClient(timeout=timeout_val) as client:
-                if method.upper() == "GET":
-                    response = await client.get(url, headers=request_headers)
-                elif method.upper() == "POST":
-                    if body:
-                        response = await client.post(url, headers=request_headers, content=body)
-                    else:
-                        response = await client.post(url, headers=request_headers)
-                elif method.upper() == "PUT":
-                    if body:
-                        response = await client.put(url, headers=request_headers, content=body)
-                    else:
-                        response = await client.put(url, headers=request_headers)
-                elif method.upper() == "DELETE":
-                    response = await client.delete(url, headers=request_headers)
+            client = get_http_client()
+            if method.upper() == "GET":
+                response = await client.get(url, headers=request_headers, timeout=timeout_val)
+            elif method.upper() == "POST":
+                if body:
+                    response = await client.post(url, headers=request_headers, content=body, timeout=timeout_val)
                 else:
-                    return f"Error: Unsupported HTTP method: {method}"
-
-                # Format response
-                result_parts = [
-                    f"Status: {response.status_code}",
-                    f"Headers: {dict(response.headers)}",
-                    ""
-                ]
-
-                # Try to parse as JSON
-                try:
-                    json_response = response.json()
-                    result_parts.append("Response (JSON):")
-                    result_parts.append(str(json_response))
-                except:
-                    # Not JSON, return text
-                    text_response = response.text
-                    # Truncate if too long
-                    max_len = 5000
-                    if len(text_response) > max_len:
-                        text_response = text_response[:max_len] + f"\n... (truncated, {len(text_response) - max_len} more chars)"
-                    result_parts.append("Response (Text):")
-                    result_parts.append(text_response)
-
-                return "\n".join(result_parts)
+                    response = await client.post(url, headers=request_headers, timeout=timeout_val)
+            elif method.upper() == "PUT":
+                if body:
+                    response = await client.put(url, headers=request_headers, content=body, timeout=timeout_val)
+                else:
+                    response = await client.put(url, headers=request_headers, timeout=timeout_val)
+            elif method.upper() == "DELETE":
+                response = await client.delete(url, headers=request_headers, timeout=timeout_val)
+            else:
+                return f"Error: Unsupported HTTP method: {method}"
+
+            # Format response
+            result_parts = [
+                f"Status: {response.status_code}",
+                f"Headers: {dict(response.headers)}",
+                ""
+            ]
+
+            # Try to parse as JSON
+            try:
+                json_response = response.json()
+                result_parts.append("Response (JSON):")
+                result_parts.append(str(json_response))
+            except:
+                # Not JSON, return text
+                text_response = response.text
+                # Truncate if too long
+                max_len = 5000
+                if len(text_response) > max_len:
+                    text_response = text_response[:max_len] + f"\n... (truncated, {len(text_response) - max_len} more chars)"
+                result_parts.append("Response (Text):")
+                result_parts.append(text_response)
+
+            return "\n".join(result_parts)
 
         except asyncio.TimeoutError:
             return f"Error: Request timed out after {timeout_val} seconds"
@@ -0,0 +1,115 @@
+"""Tools for background shell jobs: job_status, job_output, job_kill."""
+
+from typing import TYPE_CHECKING, Any
+
+from nanobot.agent.tools.base import Tool
+from nanobot.agent.tools.filesystem import _read_window
+from nanobot.utils.offload import run_blocking
+
+if TYPE_CHECKING:
+    from nanobot.agent.jobs import JobManager
+
+MAX_JOB_OUTPUT_BYTES = 20_000
+
+
+class JobStatusTool(Tool):
+    """Tool to check on background jobs."""
+
+    def __init__(self, manager: "JobManager"):
+        self._manager = manager
+
+    @property
+    def name(self) -> str:
+        return "job_status"
+
+    @property
+    def description(self) -> str:
+        return "Show the state of a background job started with exec(background=true), or of all jobs."
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "job_id": {"type": "string", "description": "Job ID (omit to list all jobs)"}
+            },
+        }
+
+    async def execute(self, job_id: str | None = None, **kwargs: Any) -> str:
+        if job_id:
+            job = self._manager.get(job_id)
+            return job.describe() if job else f"Error: No job {job_id}"
+        jobs = self._manager.list_jobs()
+        return "\n".join(j.describe() for j in jobs) if jobs else "No background jobs"
+
+
+class JobOutputTool(Tool):
+    """Tool to read a background job's output."""
+
+    def __init__(self, manager: "JobManager"):
+        self._manager = manager
+
+    @property
+    def name(self) -> str:
+        return "job_output"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Read a background job's combined stdout/stderr so far. "
+            "Defaults to the last 50 lines; use byte_offset to page from the start."
+        )
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "job_id": {"type": "string", "description": "Job ID"},
+                "tail": {"type": "integer", "description": "Read the last N lines", "minimum": 1},
+                "byte_offset": {"type": "integer", "description": "Read from this byte instead", "minimum": 0}
+            },
+            "required": ["job_id"]
+        }
+
+    async def execute(self, job_id: str, tail: int | None = None, byte_offset: int | None = None, **kwargs: Any) -> str:
+        job = self._manager.get(job_id)
+        if not job:
+            return f"Error: No job {job_id}"
+        if byte_offset is None and tail is None:
+            tail = 50
+        text = await run_blocking(
+            _read_window, job.output_path, None, None, tail, byte_offset, MAX_JOB_OUTPUT_BYTES
+        )
+        return f"[{job.describe()}]\n{text or '(no output yet)'}"
+
+
+class JobKillTool(Tool):
+    """Tool to stop a background job."""
+
+    def __init__(self, manager: "JobManager"):
+        self._manager = manager
+
+    @property
+    def name(self) -> str:
+        return "job_kill"
+
+    @property
+    def description(self) -> str:
+        return "Kill a running background job and the processes it started."
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "job_id": {"type": "string", "description": "Job ID"}
+            },
+            "required": ["job_id"]
+        }
+
+    async def execute(self, job_id: str, **kwargs: Any) -> str:
+        if self._manager.kill(job_id):
+            return f"Killed job {job_id}"
+        job = self._manager.get(job_id)
+        return f"Job {job_id} is not running ({job.describe()})" if job else f"Error: No job {job_id}"
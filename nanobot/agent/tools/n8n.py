@@ -1,10 +1,13 @@
 """n8n workflow management tool for MetalClaw."""
 
 import json
-import asyncio
 from typing import Any, Optional
 from pathlib import Path
+
+import httpx
+
 from nanobot.agent.tools.base import Tool
+from nanobot.utils.http import get_http_client
 
 
 class N8nTool(Tool):
@@ -92,11 +95,8 @@ Examples:
         data: Optional[dict] = None,
     ) -> str:
         """Make an HTTP request to n8n API."""
-        try:
-            import aiohttp
-        except ImportError:
-            # Fallback to synchronous requests if aiohttp not available
-            return await self._make_request_sync(method, endpoint, data)
+        if method not in ("GET", "POST", "PATCH", "DELETE"):
+            return f"Error: Unknown method '{method}'"
 
         url = f"{self.api_url}{endpoint}"
         headers = {
@@ -106,58 +106,15 @@ Examples:
         }
 
         try:
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout)) as session:
-                if method == "GET":
-                    async with session.get(url, headers=headers) as response:
-                        response_text = await response.text()
-                        return self._format_response(response.status, response_text)
-                elif method == "POST":
-                    async with session.post(url, headers=headers, json=data) as response:
-                        response_text = await response.text()
-                        return self._format_response(response.status, response_text)
-                elif method == "PATCH":
-                    async with session.patch(url, headers=headers, json=data) as response:
-                        response_text = await response.text()
-                        return self._format_response(response.status, response_text)
-                elif method == "DELETE":
-                    async with session.delete(url, headers=headers) as response:
-                        response_text = await response.text()
-                        return self._format_response(response.status, response_text)
-        except asyncio.TimeoutError:
-            return f"Error: Request timed out after {self.timeout} seconds"
-        except Exception as e:
-            return f"Error making request: {str(e)}"
-
-    async def _make_request_sync(
-        self,
-        method: str,
-        endpoint: str,
-        data: Optional[dict] = None,
-    ) -> str:
-        """Synchronous fallback using requests library."""
-        import requests
-
-        url = f"{self.api_url}{endpoint}"
-        headers = {
-            "accept": "application/json",
-            "X-N8N-API-KEY": self.api_key,
-            "Content-Type": "application/json"
-        }
-
-        try:
-            if method == "GET":
-                response = requests.get(url, headers=headers, timeout=self.timeout)
-            elif method == "POST":
-                response = requests.post(url, headers=headers, json=data, timeout=self.timeout)
-            elif method == "PATCH":
-                response = requests.patch(url, headers=headers, json=data, timeout=self.timeout)
-            elif method == "DELETE":
-                response = requests.delete(url, headers=headers, timeout=self.timeout)
-            else:
-                return f"Error: Unknown method '{method}'"
-
+            response = await get_http_client().request(
+                method,
+                url,
+                headers=headers,
+                json=data if method in ("POST", "PATCH") else None,
+                timeout=self.timeout,
+            )
             return self._format_response(response.status_code, response.text)
-        except requests.Timeout:
+        except httpx.TimeoutException:
             return f"Error: Request timed out after {self.timeout} seconds"
         except Exception as e:
             return f"Error making request: {str(e)}"
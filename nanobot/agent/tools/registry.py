@@ -1,5 +1,6 @@
 """Tool registry for dynamic tool management."""
 
+import json
 from typing import Any
 
 from nanobot.agent.tools.base import Tool
@@ -9,19 +10,34 @@ class ToolRegistry:
     """
     Registry for agent tools.
     
-    Allows dynamic registration and execution of tools.
+    Allows dynamic registration and execution of tools. Definitions are
+    built once and reused on every LLM call until the tool set changes.
     """
     
     def __init__(self):
         self._tools: dict[str, Tool] = {}
+        self._definitions: list[dict[str, Any]] | None = None
+        self._definitions_json: str | None = None
+        self.version = 0  # bumped whenever the tool set changes
     
     def register(self, tool: Tool) -> None:
         """Register a tool."""
         self._tools[tool.name] = tool
+        self._invalidate()
+        try:
+            tool.validator  # compile now rather than on the first call
+        except ValueError:
+            pass  # reported when the tool is called, as before
     
     def unregister(self, name: str) -> None:
         """Unregister a tool by name."""
-        self._tools.pop(name, None)
+        if self._tools.pop(name, None) is not None:
+            self._invalidate()
+
+    def _invalidate(self) -> None:
+        self.version += 1
+        self._definitions = None
+        self._definitions_json = None
     
     def get(self, name: str) -> Tool | None:
         """Get a tool by name."""
@@ -31,9 +47,24 @@ class ToolRegistry:
         """Check if a tool is registered."""
         return name in self._tools
     
-    def get_definitions(self) -> list[dict[str, Any]]:
-        """Get all tool definitions in OpenAI format."""
-        return [tool.to_schema() for tool in self._tools.values()]
+    def get_definitions(self, names: set[str] | None = None) -> list[dict[str, Any]]:
+        """
+        Get tool definitions in OpenAI format. Shared between calls: do not mutate.
+
+        Args:
+            names: Only return these tools (default: all).
+        """
+        if self._definitions is None:
+            self._definitions = [tool.to_schema() for tool in self._tools.values()]
+        if names is None:
+            return self._definitions
+        return [d for d in self._definitions if d["function"]["name"] in names]
+
+    def get_definitions_json(self) -> str:
+        """The tool definitions serialized once, for providers that send raw JSON."""
+        if self._definitions_json is None:
+            self._definitions_json = json.dumps(self.get_definitions(), ensure_ascii=False)
+        return self._definitions_json
     
     async def execute(self, name: str, params: dict[str, Any]) -> str:
         """
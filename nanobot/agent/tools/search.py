@@ -0,0 +1,311 @@
+"""Workspace search tool: search_files, backed by an incremental trigram index."""
+
+import fnmatch
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Iterator
+
+from nanobot.agent.tools.base import Tool
+from nanobot.agent.tools.filesystem import _resolve_path
+from nanobot.utils.offload import run_blocking
+
+SKIP_DIRS = {".git", ".hg", ".svn", "node_modules", "__pycache__", ".venv", "venv", ".mypy_cache", ".pytest_cache"}
+MAX_FILE_BYTES = 1_000_000  # Larger files are usually data or build output, not worth searching
+MAX_LINE_CHARS = 300
+DEFAULT_MAX_RESULTS = 50
+
+
+def _walk(root: Path) -> Iterator[tuple[str, os.stat_result]]:
+    """Searchable files under `root` as (path, stat), skipping VCS/dependency dirs and big files."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS and not d.startswith(".")]
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            if st.st_size <= MAX_FILE_BYTES:
+                yield path, st
+
+
+def _read_text(path: str) -> str | None:
+    """File contents, or None for binary or unreadable files."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read(MAX_FILE_BYTES)
+    except OSError:
+        return None
+    if b"\0" in data[:8192]:
+        return None
+    return data.decode("utf-8", errors="replace")
+
+
+def _trigrams(text: str) -> set[str]:
+    text = text.lower()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+_INLINE_FLAGS_RE = re.compile(r"\(\?[aiLmsux-]+[:)]")
+_QUANTIFIER_RE = re.compile(r"\{\d*(?:,\d*)?\}")
+
+
+def required_literals(pattern: str, flags: int = 0) -> list[str]:
+    """
+    Literal strings every match of a regex must contain, for index lookups.
+
+    Conservative: only top-level runs of plain characters count, and any
+    alternation, inline flag group or verbose mode disables filtering
+    (returns []).
+    """
+    if "|" in pattern or flags & re.VERBOSE or _INLINE_FLAGS_RE.search(pattern):
+        return []
+    runs, run, depth, i = [], "", 0, 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "\\" and i + 1 < len(pattern):
+            nxt = pattern[i + 1]
+            if nxt.isalnum():  # \d, \w, \b, backreferences: not literals
+                runs.append(run)
+                run = ""
+            elif depth == 0:
+                run += nxt
+            i += 2
+            continue
+        if c == "[":
+            end = pattern.find("]", i + 2)
+            runs.append(run)
+            run = ""
+            i = len(pattern) if end == -1 else end + 1
+            continue
+        if c == "{" and (m := _QUANTIFIER_RE.match(pattern, i)):
+            runs.append(run[:-1])  # the repeated character may be optional; {m,n} is not text
+            run = ""
+            i = m.end()
+            continue
+        if c in "*?":
+            run = run[:-1]  # the previous character is optional
+        if c == "(":
+            depth += 1
+        elif c == ")":
+            depth = max(0, depth - 1)
+        if c in ".^$*+?{}()":
+            runs.append(run)
+            run = ""
+        elif depth == 0:
+            run += c
+        i += 1
+    runs.append(run)
+    return [r for r in runs if len(r) >= 3]
+
+
+class TrigramIndex:
+    """
+    Maps trigrams to the files containing them, for one directory tree.
+
+    `refresh` re-stats the tree and re-reads only files whose mtime or
+    size changed, so keeping the index current costs a directory walk
+    rather than reading every file. `candidates` narrows a search to the
+    files that contain every trigram of the given literals. Blocking;
+    call it via run_blocking.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        self._files: dict[str, tuple[float, int, set[str]]] = {}
+        self._postings: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+
+    def refresh(self) -> int:
+        """Bring the index up to date with the tree. Returns the number of files re-read."""
+        with self._lock:
+            seen, updated = set(), 0
+            for path, st in _walk(self.root):
+                seen.add(path)
+                old = self._files.get(path)
+                if old and old[0] == st.st_mtime and old[1] == st.st_size:
+                    continue
+                text = _read_text(path)
+                self._set(path, st.st_mtime, st.st_size, _trigrams(text) if text is not None else set())
+                updated += 1
+            for path in self._files.keys() - seen:
+                self._set(path, 0, 0, None)
+            return updated
+
+    def _set(self, path: str, mtime: float, size: int, grams: set[str] | None) -> None:
+        if old := self._files.pop(path, None):
+            for g in old[2]:
+                if (files := self._postings.get(g)) is not None:
+                    files.discard(path)
+                    if not files:
+                        del self._postings[g]
+        if grams is None:
+            return
+        self._files[path] = (mtime, size, grams)
+        for g in grams:
+            self._postings.setdefault(g, set()).add(path)
+
+    def candidates(self, literals: list[str]) -> list[str]:
+        """Indexed files that may contain all `literals` (every file if there are none)."""
+        with self._lock:
+            grams = set().union(*(_trigrams(lit) for lit in literals)) if literals else set()
+            if not grams:
+                return sorted(self._files)
+            result: set[str] | None = None
+            for g in sorted(grams, key=lambda g: len(self._postings.get(g, ()))):
+                files = self._postings.get(g, set())
+                result = files.copy() if result is None else result & files
+                if not result:
+                    break
+            return sorted(result or ())
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+
+# One index per tree, shared by the agent's and subagents' tools.
+_indexes: dict[Path, TrigramIndex] = {}
+
+
+def get_index(root: Path) -> TrigramIndex:
+    """The shared index for `root`, created empty on first use."""
+    root = root.resolve()
+    if root not in _indexes:
+        _indexes[root] = TrigramIndex(root)
+    return _indexes[root]
+
+
+class SearchFilesTool(Tool):
+    """Tool to search file contents without going through the shell."""
+
+    def __init__(self, workspace: Path, allowed_dir: Path | None = None, use_index: bool = True):
+        self.workspace = workspace.resolve()
+        self._allowed_dir = allowed_dir
+        self.index = get_index(workspace) if use_index else None
+
+    @property
+    def name(self) -> str:
+        return "search_files"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Search file contents for a regex or literal string, like grep -rn. "
+            "Returns path:line matches, optionally with context lines."
+        )
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "pattern": {
+                    "type": "string",
+                    "description": "Regular expression (or literal text with literal=true)"
+                },
+                "path": {
+                    "type": "string",
+                    "description": "Directory to search, relative to the workspace (default: workspace)"
+                },
+                "glob": {
+                    "type": "string",
+                    "description": "Only search files matching this pattern, e.g. *.py"
+                },
+                "literal": {
+                    "type": "boolean",
+                    "description": "Treat pattern as plain text"
+                },
+                "ignore_case": {
+                    "type": "boolean",
+                    "description": "Case-insensitive search"
+                },
+                "context": {
+                    "type": "integer",
+                    "description": "Lines of context around each match",
+                    "minimum": 0,
+                    "maximum": 10
+                },
+                "max_results": {
+                    "type": "integer",
+                    "description": "Maximum number of matches to return",
+                    "minimum": 1,
+                    "maximum": 500
+                }
+            },
+            "required": ["pattern"]
+        }
+
+    async def execute(
+        self,
+        pattern: str,
+        path: str | None = None,
+        glob: str | None = None,
+        literal: bool = False,
+        ignore_case: bool = False,
+        context: int = 0,
+        max_results: int = DEFAULT_MAX_RESULTS,
+        **kwargs: Any,
+    ) -> str:
+        try:
+            root = _resolve_path(str(self.workspace / (path or ".")), self._allowed_dir)
+            if not root.is_dir():
+                return f"Error: Not a directory: {path}"
+            try:
+                regex = re.compile(re.escape(pattern) if literal else pattern, re.IGNORECASE if ignore_case else 0)
+            except re.error as e:
+                return f"Error: Invalid regex: {e}"
+
+            return await run_blocking(
+                self._search, root, regex, [pattern] if literal else required_literals(pattern, regex.flags),
+                glob, context, max_results,
+            )
+        except PermissionError as e:
+            return f"Error: {e}"
+        except Exception as e:
+            return f"Error searching files: {str(e)}"
+
+    def _files(self, root: Path, literals: list[str]) -> list[str]:
+        """Files to scan: index candidates when `root` is inside the indexed tree, else a walk."""
+        if self.index is not None and root.is_relative_to(self.index.root):
+            self.index.refresh()
+            prefix = str(root) + os.sep
+            return [p for p in self.index.candidates(literals) if root == self.index.root or p.startswith(prefix)]
+        return sorted(p for p, _ in _walk(root))
+
+    def _search(
+        self,
+        root: Path,
+        regex: re.Pattern[str],
+        literals: list[str],
+        glob: str | None,
+        context: int,
+        max_results: int,
+    ) -> str:
+        out: list[str] = []
+        matches = 0
+        for path in self._files(root, literals):
+            rel = os.path.relpath(path, self.workspace)
+            if glob and not (fnmatch.fnmatch(rel, glob) or fnmatch.fnmatch(os.path.basename(path), glob)):
+                continue
+            text = _read_text(path)
+            if text is None or not regex.search(text):
+                continue
+            lines = text.splitlines()
+            shown = -1  # last line already printed, so context blocks do not repeat
+            for i, line in enumerate(lines):
+                if not regex.search(line):
+                    continue
+                if context and out and shown < i - context - 1:
+                    out.append("--")
+                for j in range(max(i - context, shown + 1), min(i + context + 1, len(lines))):
+                    sep = ":" if j == i else "-"
+                    out.append(f"{rel}{sep}{j + 1}{sep} {lines[j][:MAX_LINE_CHARS]}")
+                    shown = j
+                matches += 1
+                if matches >= max_results:
+                    out.append(f"[Stopped after {max_results} matches]")
+                    return "\n".join(out)
+
+        return "\n".join(out) if out else f"No matches for: {regex.pattern}"
@@ -0,0 +1,142 @@
+"""Per-turn tool subsetting: send the model only the tools a turn is likely to need."""
+
+import re
+from typing import Any, Iterable
+
+from nanobot.agent.tools.base import Tool
+from nanobot.agent.tools.registry import ToolRegistry
+
+# Offered on every turn regardless of the message.
+DEFAULT_CORE_TOOLS = (
+    "read_file", "write_file", "edit_file", "list_dir", "exec", "message", "load_tools",
+)
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "the and for with that this from into your you are can what when where which "
+    "how please about have has was were will would could should there their them "
+    "then than all any some use using not but its it's".split()
+)
+
+
+def keywords(text: str) -> set[str]:
+    """Lowercased content words of `text`, with a crude plural strip."""
+    words = set()
+    for w in _WORD_RE.findall(text.lower().replace("_", " ")):
+        if len(w) < 3 or w in _STOPWORDS:
+            continue
+        words.add(w[:-1] if len(w) > 3 and w.endswith("s") and not w.endswith("ss") else w)
+    return words
+
+
+def _summary(tool: Tool) -> str:
+    """First sentence of a tool's description."""
+    return tool.description.split(". ")[0].rstrip(".")
+
+
+class ToolSelector:
+    """
+    Picks which registered tools to offer the model for a turn.
+
+    Tools are scored by keyword overlap between the message and each tool's
+    name (weighted double) and description. The core set is always offered;
+    the best `max_tools` scoring tools are added on top. The keyword index is
+    rebuilt only when the registry changes (e.g. MCP servers connect).
+    """
+
+    def __init__(self, registry: ToolRegistry, core: Iterable[str] = DEFAULT_CORE_TOOLS, max_tools: int = 8):
+        self.registry = registry
+        self.core = set(core)
+        self.max_tools = max_tools
+        self._index: dict[str, tuple[set[str], set[str]]] = {}
+        self._version = -1
+
+    def _refresh(self) -> None:
+        if self._version == self.registry.version:
+            return
+        self._index = {}
+        for name in self.registry.tool_names:
+            tool = self.registry.get(name)
+            self._index[name] = (keywords(name), keywords(tool.description))
+        self._version = self.registry.version
+
+    def match(self, text: str, limit: int | None = None) -> list[str]:
+        """Tools whose name or description shares words with `text`, best first."""
+        self._refresh()
+        words = keywords(text)
+        if not words:
+            return []
+        scored = []
+        for order, (name, (name_words, desc_words)) in enumerate(self._index.items()):
+            score = 2 * len(words & name_words) + len(words & desc_words)
+            if score:
+                scored.append((-score, order, name))
+        scored.sort()
+        return [name for _, _, name in scored[:limit]]
+
+    def select(self, text: str) -> set[str]:
+        """Tool names to offer for a turn that starts with `text`."""
+        self._refresh()
+        core = {name for name in self.core if name in self._index}
+        extra = [name for name in self.match(text) if name not in core]
+        return core | set(extra[:self.max_tools])
+
+
+class LoadToolsTool(Tool):
+    """Meta-tool that lets the model pull in tools it was not offered."""
+
+    def __init__(self, selector: ToolSelector):
+        self._selector = selector
+        self.loaded: set[str] = set()
+
+    def begin_turn(self) -> None:
+        """Forget tools loaded during the previous turn."""
+        self.loaded = set()
+
+    @property
+    def name(self) -> str:
+        return "load_tools"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Load more tools for this conversation turn. Only a subset of tools is shown to you; "
+            "call with no arguments to list every available tool, with names to load them, "
+            "or with a query to load the tools that best match it. Loaded tools can be called "
+            "from your next step."
+        )
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "names": {"type": "array", "items": {"type": "string"}, "description": "Tool names to load"},
+                "query": {"type": "string", "description": "What you need to do; loads the best matching tools"}
+            },
+        }
+
+    async def execute(self, names: list[str] | None = None, query: str | None = None, **kwargs: Any) -> str:
+        registry = self._selector.registry
+        if not names and not query:
+            lines = [
+                f"- {name}: {_summary(registry.get(name))}"
+                for name in registry.tool_names if name != self.name
+            ]
+            return "Available tools:\n" + "\n".join(lines)
+
+        wanted = list(names or [])
+        if query:
+            wanted += self._selector.match(query, limit=self._selector.max_tools)
+        unknown = [n for n in wanted if n not in registry]
+        found = [n for n in dict.fromkeys(wanted) if n in registry and n != self.name]
+        self.loaded.update(found)
+
+        parts = []
+        if found:
+            parts.append(f"Loaded: {', '.join(found)}")
+        elif query and not names:
+            parts.append(f"No tools match {query!r}; call load_tools with no arguments to list them all")
+        if unknown:
+            parts.append(f"Error: Unknown tool(s): {', '.join(unknown)}")
+        return ". ".join(parts)
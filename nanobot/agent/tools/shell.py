@@ -1,12 +1,259 @@
 """Shell execution tool."""
 
 import asyncio
+import functools
 import os
 import re
+import shlex
+import signal
+import time
+import uuid
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
+
+from loguru import logger
 
 from nanobot.agent.tools.base import Tool
+from nanobot.bus.events import OutboundMessage
+
+if TYPE_CHECKING:
+    from nanobot.agent.jobs import JobManager
+
+# Output kept per stream: the first and last half of this many bytes.
+MAX_OUTPUT_BYTES = 10_000
+# A command that prints more than this is killed as a runaway.
+KILL_OUTPUT_BYTES = 50_000_000
+# How long to wait for a killed process to be reaped.
+REAP_TIMEOUT_S = 5
+
+
+class OutputOverflowError(Exception):
+    """A command printed more than its capture's kill limit."""
+
+
+class OutputCapture:
+    """
+    Bounded capture of one output stream.
+
+    Keeps the first and the last `max_bytes / 2` bytes and only counts
+    what lies between, so memory stays flat however much a command prints.
+    Raises OutputOverflowError once the total passes `kill_bytes`.
+    """
+
+    def __init__(self, max_bytes: int = MAX_OUTPUT_BYTES, kill_bytes: int = KILL_OUTPUT_BYTES):
+        self.head = bytearray()
+        self.tail = bytearray()
+        self.total = 0
+        self.kill_bytes = kill_bytes
+        self._half = max_bytes // 2
+
+    def feed(self, data: bytes) -> None:
+        self.total += len(data)
+        if (room := self._half - len(self.head)) > 0:
+            self.head += data[:room]
+            data = data[room:]
+        if data:
+            self.tail += data
+            if len(self.tail) > self._half:
+                del self.tail[:len(self.tail) - self._half]
+        if self.total > self.kill_bytes:
+            raise OutputOverflowError(f"output passed {self.kill_bytes} bytes")
+
+    @property
+    def last_line(self) -> str:
+        """The most recent non-empty output line, for progress updates."""
+        lines = bytes(self.tail or self.head).decode("utf-8", errors="replace").strip().splitlines()
+        return lines[-1].strip() if lines else ""
+
+    def text(self) -> str:
+        head = self.head.decode("utf-8", errors="replace")
+        tail = self.tail.decode("utf-8", errors="replace")
+        omitted = self.total - len(self.head) - len(self.tail)
+        if omitted > 0:
+            return f"{head}\n... ({omitted} bytes omitted) ...\n{tail}"
+        return head + tail
+
+
+_WIN_PATH_RE = re.compile(r"[A-Za-z]:\\[^\\\"']+")
+# Only match absolute paths — avoid false positives on relative
+# paths like ".venv/bin/python" where "/bin/python" would be
+# incorrectly extracted by the old pattern.
+_POSIX_PATH_RE = re.compile(r"(?:^|[\s|>])(/[^\s\"'>]+)")
+
+
+def _compile_any(patterns: list[str]) -> re.Pattern[str] | None:
+    """A single regex matching wherever any of `patterns` would."""
+    return re.compile("|".join(f"(?:{p})" for p in patterns)) if patterns else None
+
+
+@functools.lru_cache(maxsize=1024)
+def _resolve(raw: str) -> Path | None:
+    """Path.resolve() (a filesystem walk) memoized; commands repeat the same paths."""
+    try:
+        return Path(raw).resolve()
+    except Exception:
+        return None
+
+
+def _kill_group(process: asyncio.subprocess.Process) -> None:
+    """Kill a process started with start_new_session, and everything it spawned."""
+    if process.returncode is not None:
+        return
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        process.kill()
+
+
+async def _terminate(process: asyncio.subprocess.Process) -> None:
+    """Kill the process group and reap the process, so no zombie or open transport is left."""
+    _kill_group(process)
+    try:
+        await asyncio.wait_for(process.wait(), REAP_TIMEOUT_S)
+    except asyncio.TimeoutError:
+        logger.warning(f"Process {process.pid} not reaped {REAP_TIMEOUT_S}s after kill")
+
+
+async def _pump(stream: asyncio.StreamReader, capture: OutputCapture) -> None:
+    while chunk := await stream.read(65536):
+        capture.feed(chunk)
+
+
+async def _read_until(stream: asyncio.StreamReader, marker: bytes, capture: OutputCapture) -> bytes | None:
+    """
+    Capture output up to a line starting with `marker`.
+
+    Returns the rest of the marker line, or None if the stream ended first.
+    Only a marker's length of output is held back from the capture.
+    """
+    buf = bytearray()
+    needle = b"\n" + marker
+    while True:
+        idx = buf.find(needle)
+        if idx != -1:
+            if (end := buf.find(b"\n", idx + len(needle))) != -1:
+                capture.feed(bytes(buf[:idx]))
+                return bytes(buf[idx + len(needle):end]).strip()
+            keep = idx
+        else:
+            keep = max(0, len(buf) - len(needle))
+        capture.feed(bytes(buf[:keep]))
+        del buf[:keep]
+        chunk = await stream.read(65536)
+        if not chunk:
+            capture.feed(bytes(buf))
+            return None
+        buf += chunk
+
+
+class ShellSession:
+    """
+    A long-lived bash process that runs commands one at a time.
+
+    Each command is eval'd in the shell itself, so `cd`, exported variables
+    and activated virtualenvs carry over to the next one. The end of a
+    command's output is found by a random marker printed after it on both
+    stdout and stderr, together with its exit code.
+    """
+
+    def __init__(self, process: asyncio.subprocess.Process):
+        self.process = process
+        self.lock = asyncio.Lock()
+        self.last_used = time.monotonic()
+
+    @classmethod
+    async def start(cls, cwd: str) -> "ShellSession":
+        process = await asyncio.create_subprocess_exec(
+            "bash", "--noprofile", "--norc",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=cwd,
+            start_new_session=True,  # own process group, so close() also kills its children
+        )
+        return cls(process)
+
+    @property
+    def alive(self) -> bool:
+        return self.process.returncode is None
+
+    async def run(
+        self,
+        command: str,
+        stdout: OutputCapture,
+        stderr: OutputCapture,
+        cwd: str | None = None,
+    ) -> int | None:
+        """Run `command`, capturing its output; returns the exit code, or None if the shell exited."""
+        marker = f"__nanobot_{uuid.uuid4().hex}__"
+        script = f"eval {shlex.quote(command)} < /dev/null\n"
+        if cwd:
+            script = f"cd -- {shlex.quote(cwd)} && {script}"
+        script += f"printf '\\n%s %s\\n' {marker} $?\nprintf '\\n%s\\n' {marker} >&2\n"
+
+        self.last_used = time.monotonic()
+        self.process.stdin.write(script.encode())
+        await self.process.stdin.drain()
+        status, _ = await asyncio.gather(
+            _read_until(self.process.stdout, marker.encode(), stdout),
+            _read_until(self.process.stderr, marker.encode(), stderr),
+        )
+        self.last_used = time.monotonic()
+        return int(status) if status is not None else None
+
+    async def close(self) -> None:
+        await _terminate(self.process)
+
+
+class ShellPool:
+    """
+    Persistent shells keyed by agent session.
+
+    Shells idle for longer than `idle_timeout` seconds are closed on the
+    next use of the pool, and past `max_sessions` the least recently used
+    idle shell is closed to make room. A shell running a command is never
+    evicted.
+    """
+
+    def __init__(self, idle_timeout: float = 600, max_sessions: int = 8):
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self._sessions: dict[str, ShellSession] = {}  # least recently used first
+
+    async def get(self, key: str, cwd: str) -> ShellSession | None:
+        """
+        The shell for `key`, started in `cwd` if there is none.
+
+        Returns None when a new shell is needed but every slot is held by a
+        shell that is busy; the caller should fall back to a one-shot process.
+        """
+        now = time.monotonic()
+        for k, s in list(self._sessions.items()):
+            if k != key and not s.lock.locked() and now - s.last_used > self.idle_timeout:
+                await self.discard(k)
+
+        session = self._sessions.pop(key, None)
+        if session is None or not session.alive:
+            while len(self._sessions) >= self.max_sessions:
+                idle = next((k for k, s in self._sessions.items() if not s.lock.locked()), None)
+                if idle is None:
+                    return None
+                await self.discard(idle)
+            session = await ShellSession.start(cwd)
+            logger.debug(f"Started persistent shell for {key} (pid {session.process.pid})")
+        self._sessions[key] = session
+        return session
+
+    async def discard(self, key: str) -> None:
+        if session := self._sessions.pop(key, None):
+            await session.close()
+
+    async def close(self) -> None:
+        for key in list(self._sessions):
+            await self.discard(key)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
 
 
 class ExecTool(Tool):
@@ -19,6 +266,14 @@ class ExecTool(Tool):
         deny_patterns: list[str] | None = None,
         allow_patterns: list[str] | None = None,
         restrict_to_workspace: bool = False,
+        persistent: bool = False,
+        idle_timeout: int = 600,
+        max_sessions: int = 8,
+        max_output_bytes: int = MAX_OUTPUT_BYTES,
+        kill_output_bytes: int = KILL_OUTPUT_BYTES,
+        progress_interval: float = 0,
+        send_callback: Callable[[OutboundMessage], Awaitable[None]] | None = None,
+        jobs: "JobManager | None" = None,
     ):
         self.timeout = timeout
         self.working_dir = working_dir
@@ -33,7 +288,25 @@ class ExecTool(Tool):
             r":\(\)\s*\{.*\};\s*:",          # fork bomb
         ]
         self.allow_patterns = allow_patterns or []
+        # One alternation per list, compiled once: the guard runs on every command
+        self._deny_re = _compile_any(self.deny_patterns)
+        self._allow_re = _compile_any(self.allow_patterns)
         self.restrict_to_workspace = restrict_to_workspace
+        self.shells = ShellPool(idle_timeout, max_sessions) if persistent else None
+        self.max_output_bytes = max_output_bytes
+        self.kill_output_bytes = kill_output_bytes
+        self.progress_interval = progress_interval
+        self._send_callback = send_callback
+        self.jobs = jobs
+        self._channel = ""
+        self._chat_id = ""
+        self._session_key = "default"
+
+    def set_context(self, channel: str, chat_id: str) -> None:
+        """Set the chat that gets progress updates, and whose persistent shell runs commands."""
+        self._channel = channel
+        self._chat_id = chat_id
+        self._session_key = f"{channel}:{chat_id}"
     
     @property
     def name(self) -> str:
@@ -55,90 +328,174 @@ class ExecTool(Tool):
                 "working_dir": {
                     "type": "string",
                     "description": "Optional working directory for the command"
-                }
+                },
+                **({"background": {
+                    "type": "boolean",
+                    "description": (
+                        f"Run as a background job and return its ID at once, for commands that may take "
+                        f"longer than {self.timeout}s. You are told when it finishes; use job_status, "
+                        "job_output and job_kill meanwhile."
+                    )
+                }} if self.jobs else {})
             },
             "required": ["command"]
         }
     
-    async def execute(self, command: str, working_dir: str | None = None, **kwargs: Any) -> str:
+    async def execute(
+        self,
+        command: str,
+        working_dir: str | None = None,
+        background: bool = False,
+        **kwargs: Any,
+    ) -> str:
         cwd = working_dir or self.working_dir or os.getcwd()
         guard_error = self._guard_command(command, cwd)
         if guard_error:
             return guard_error
         
+        if background and self.jobs:
+            try:
+                job = await self.jobs.start(command, cwd, self._channel or "cli", self._chat_id or "direct")
+            except Exception as e:
+                return f"Error starting job: {str(e)}"
+            return f"Started background job {job.id}. You will be notified when it finishes."
+
+        stdout = OutputCapture(self.max_output_bytes, self.kill_output_bytes)
+        stderr = OutputCapture(self.max_output_bytes, self.kill_output_bytes)
+        progress = None
+        if self.progress_interval > 0 and self._send_callback and self._chat_id:
+            progress = asyncio.create_task(self._report_progress(command, stdout, stderr))
+        try:
+            if self.shells is not None:
+                return await self._execute_persistent(command, working_dir, cwd, stdout, stderr)
+            return await self._execute_once(command, cwd, stdout, stderr)
+        finally:
+            if progress:
+                progress.cancel()
+
+    async def _execute_once(self, command: str, cwd: str, stdout: OutputCapture, stderr: OutputCapture) -> str:
+        """Run the command in a fresh shell process."""
         try:
             process = await asyncio.create_subprocess_shell(
                 command,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
                 cwd=cwd,
+                start_new_session=True,  # own process group, so a kill reaches its children too
             )
             
             try:
-                stdout, stderr = await asyncio.wait_for(
-                    process.communicate(),
-                    timeout=self.timeout
-                )
+                await asyncio.wait_for(self._collect(process, stdout, stderr), timeout=self.timeout)
             except asyncio.TimeoutError:
-                process.kill()
+                await _terminate(process)
                 return f"Error: Command timed out after {self.timeout} seconds"
+            except OutputOverflowError as e:
+                await _terminate(process)
+                return self._format_output(stdout, stderr, process.returncode) + f"\n(Killed: {e})"
             
-            output_parts = []
-            
-            if stdout:
-                output_parts.append(stdout.decode("utf-8", errors="replace"))
-            
-            if stderr:
-                stderr_text = stderr.decode("utf-8", errors="replace")
-                if stderr_text.strip():
-                    output_parts.append(f"STDERR:\n{stderr_text}")
+            return self._format_output(stdout, stderr, process.returncode)
             
-            if process.returncode != 0:
-                output_parts.append(f"\nExit code: {process.returncode}")
-            
-            result = "\n".join(output_parts) if output_parts else "(no output)"
-            
-            # Truncate very long output
-            max_len = 10000
-            if len(result) > max_len:
-                result = result[:max_len] + f"\n... (truncated, {len(result) - max_len} more chars)"
-            
-            return result
+        except Exception as e:
+            return f"Error executing command: {str(e)}"
+
+    @staticmethod
+    async def _collect(process: asyncio.subprocess.Process, stdout: OutputCapture, stderr: OutputCapture) -> None:
+        """Read both pipes as output arrives, then wait for the process to exit."""
+        readers = [asyncio.ensure_future(_pump(process.stdout, stdout)),
+                   asyncio.ensure_future(_pump(process.stderr, stderr))]
+        try:
+            await asyncio.gather(*readers)
+        finally:
+            for reader in readers:
+                reader.cancel()
+        await process.wait()
+
+    async def _execute_persistent(
+        self,
+        command: str,
+        working_dir: str | None,
+        cwd: str,
+        stdout: OutputCapture,
+        stderr: OutputCapture,
+    ) -> str:
+        """Run the command in the session's long-lived shell."""
+        key = self._session_key
+        try:
+            shell = await self.shells.get(key, self.working_dir or os.getcwd())
+            if shell is None:
+                logger.debug(f"All persistent shells busy; running one-shot for {key}")
+                return await self._execute_once(command, cwd, stdout, stderr)
+            async with shell.lock:
+                try:
+                    code = await asyncio.wait_for(shell.run(command, stdout, stderr, working_dir), self.timeout)
+                except asyncio.TimeoutError:
+                    await self.shells.discard(key)
+                    return f"Error: Command timed out after {self.timeout} seconds (shell session was reset)"
+                except OutputOverflowError as e:
+                    await self.shells.discard(key)
+                    return self._format_output(stdout, stderr, None) + f"\n(Killed: {e}; shell session was reset)"
             
+            if code is None:  # the command exited the shell
+                await self.shells.discard(key)
+                result = self._format_output(stdout, stderr, shell.process.returncode)
+                return f"{result}\n(Shell exited; the next command starts a new one)"
+            return self._format_output(stdout, stderr, code)
         except Exception as e:
+            await self.shells.discard(key)
             return f"Error executing command: {str(e)}"
 
+    async def _report_progress(self, command: str, stdout: OutputCapture, stderr: OutputCapture) -> None:
+        """Post the latest output line to the chat while a long command runs."""
+        label = command if len(command) <= 60 else command[:57] + "..."
+        last = ""
+        while True:
+            await asyncio.sleep(self.progress_interval)
+            line = stdout.last_line or stderr.last_line
+            if line and line != last:
+                last = line
+                await self._send_callback(OutboundMessage(
+                    channel=self._channel,
+                    chat_id=self._chat_id,
+                    content=f"⏳ {label}\n{line[:200]}",
+                ))
+
+    @staticmethod
+    def _format_output(stdout: OutputCapture, stderr: OutputCapture, returncode: int | None) -> str:
+        output_parts = []
+
+        if stdout.total:
+            output_parts.append(stdout.text())
+
+        if stderr.total:
+            stderr_text = stderr.text()
+            if stderr_text.strip():
+                output_parts.append(f"STDERR:\n{stderr_text}")
+
+        if returncode:
+            output_parts.append(f"\nExit code: {returncode}")
+
+        return "\n".join(output_parts) if output_parts else "(no output)"
+
     def _guard_command(self, command: str, cwd: str) -> str | None:
         """Best-effort safety guard for potentially destructive commands."""
         cmd = command.strip()
         lower = cmd.lower()
 
-        for pattern in self.deny_patterns:
-            if re.search(pattern, lower):
-                return "Error: Command blocked by safety guard (dangerous pattern detected)"
+        if self._deny_re and self._deny_re.search(lower):
+            return "Error: Command blocked by safety guard (dangerous pattern detected)"
 
-        if self.allow_patterns:
-            if not any(re.search(p, lower) for p in self.allow_patterns):
-                return "Error: Command blocked by safety guard (not in allowlist)"
+        if self._allow_re and not self._allow_re.search(lower):
+            return "Error: Command blocked by safety guard (not in allowlist)"
 
         if self.restrict_to_workspace:
             if "..\\" in cmd or "../" in cmd:
                 return "Error: Command blocked by safety guard (path traversal detected)"
 
-            cwd_path = Path(cwd).resolve()
+            cwd_path = _resolve(cwd)
 
-            win_paths = re.findall(r"[A-Za-z]:\\[^\\\"']+", cmd)
-            # Only match absolute paths — avoid false positives on relative
-            # paths like ".venv/bin/python" where "/bin/python" would be
-            # incorrectly extracted by the old pattern.
-            posix_paths = re.findall(r"(?:^|[\s|>])(/[^\s\"'>]+)", cmd)
-
-            for raw in win_paths + posix_paths:
-                try:
-                    p = Path(raw.strip()).resolve()
-                except Exception:
-                    continue
-                if p.is_absolute() and cwd_path not in p.parents and p != cwd_path:
+            for raw in _WIN_PATH_RE.findall(cmd) + _POSIX_PATH_RE.findall(cmd):
+                p = _resolve(raw.strip())
+                if p and p.is_absolute() and cwd_path not in p.parents and p != cwd_path:
                     return "Error: Command blocked by safety guard (path outside working dir)"
 
         return None
@@ -1,33 +1,37 @@
 """Web tools: web_search and web_fetch."""
 
-import html
+import asyncio
 import json
 import os
-import re
+import time
 from typing import Any
 from urllib.parse import urlparse
 
 import httpx
 
 from nanobot.agent.tools.base import Tool
+from nanobot.utils.html import extract_readable
+from nanobot.utils.http import get_http_client
+from nanobot.utils.http_cache import CacheEntry, WebCache, freshness, normalize_query, normalize_url
+from nanobot.utils.offload import run_blocking, run_in_process
 
 # Shared constants
 USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_7_2) AppleWebKit/537.36"
 MAX_REDIRECTS = 5  # Limit redirects to prevent DoS attacks
+MAX_FETCH_BYTES = 5_000_000  # Stop downloading past this; pages are truncated anyway
+EXTRACT_TIMEOUT_S = 20.0  # Readability on pathological pages can run for minutes
+SEARCH_CACHE_TTL_S = 900  # Search results go stale quickly; reuse them briefly
 
 
-def _strip_tags(text: str) -> str:
-    """Remove HTML tags and decode entities."""
-    text = re.sub(r'<script[\s\S]*?</script>', '', text, flags=re.I)
-    text = re.sub(r'<style[\s\S]*?</style>', '', text, flags=re.I)
-    text = re.sub(r'<[^>]+>', '', text)
-    return html.unescape(text).strip()
-
-
-def _normalize(text: str) -> str:
-    """Normalize whitespace."""
-    text = re.sub(r'[ \t]+', ' ', text)
-    return re.sub(r'\n{3,}', '\n\n', text).strip()
+async def _read_capped(response: httpx.Response, max_bytes: int) -> tuple[bytes, bool]:
+    """Read a streamed body up to `max_bytes`. Returns (body, whether it was cut)."""
+    chunks, size = [], 0
+    async for chunk in response.aiter_bytes():
+        chunks.append(chunk)
+        size += len(chunk)
+        if size > max_bytes:
+            return b"".join(chunks)[:max_bytes], True
+    return b"".join(chunks), False
 
 
 def _validate_url(url: str) -> tuple[bool, str]:
@@ -57,9 +61,17 @@ class WebSearchTool(Tool):
         "required": ["query"]
     }
     
-    def __init__(self, api_key: str | None = None, max_results: int = 5):
+    def __init__(
+        self,
+        api_key: str | None = None,
+        max_results: int = 5,
+        cache: WebCache | None = None,
+        cache_ttl_s: float = SEARCH_CACHE_TTL_S,
+    ):
         self.api_key = api_key or os.environ.get("BRAVE_API_KEY", "")
         self.max_results = max_results
+        self.cache = cache
+        self.cache_ttl_s = cache_ttl_s
     
     async def execute(self, query: str, count: int | None = None, **kwargs: Any) -> str:
         if not self.api_key:
@@ -67,14 +79,17 @@ class WebSearchTool(Tool):
         
         try:
             n = min(max(count or self.max_results, 1), 10)
-            async with httpx.AsyncClient() as client:
-                r = await client.get(
-                    "https://api.search.brave.com/res/v1/web/search",
-                    params={"q": query, "count": n},
-                    headers={"Accept": "application/json", "X-Subscription-Token": self.api_key},
-                    timeout=10.0
-                )
-                r.raise_for_status()
+            key = f"search:{n}:{normalize_query(query)}"
+            if self.cache and (hit := await run_blocking(self.cache.get, key)) and hit.fresh:
+                return hit.value
+
+            r = await get_http_client().get(
+                "https://api.search.brave.com/res/v1/web/search",
+                params={"q": query, "count": n},
+                headers={"Accept": "application/json", "X-Subscription-Token": self.api_key},
+                timeout=10.0
+            )
+            r.raise_for_status()
             
             results = r.json().get("web", {}).get("results", [])
             if not results:
@@ -85,7 +100,10 @@ class WebSearchTool(Tool):
                 lines.append(f"{i}. {item.get('title', '')}\n   {item.get('url', '')}")
                 if desc := item.get("description"):
                     lines.append(f"   {desc}")
-            return "\n".join(lines)
+            text = "\n".join(lines)
+            if self.cache and self.cache_ttl_s > 0:
+                await run_blocking(self.cache.put, key, CacheEntry(text, time.time() + self.cache_ttl_s))
+            return text
         except Exception as e:
             return f"Error: {e}"
 
@@ -105,12 +123,12 @@ class WebFetchTool(Tool):
         "required": ["url"]
     }
     
-    def __init__(self, max_chars: int = 50000):
+    def __init__(self, max_chars: int = 50000, max_bytes: int = MAX_FETCH_BYTES, cache: WebCache | None = None):
         self.max_chars = max_chars
+        self.max_bytes = max_bytes
+        self.cache = cache
     
     async def execute(self, url: str, extractMode: str = "markdown", maxChars: int | None = None, **kwargs: Any) -> str:
-        from readability import Document
-
         max_chars = maxChars or self.max_chars
 
         # Validate URL before fetching
@@ -118,46 +136,68 @@ class WebFetchTool(Tool):
         if not is_valid:
             return json.dumps({"error": f"URL validation failed: {error_msg}", "url": url})
 
+        # Pages are cached after extraction, so a hit skips both steps
+        key = f"fetch:{extractMode}:{normalize_url(url)}"
+        cached = await run_blocking(self.cache.get, key) if self.cache else None
+        if cached and cached.fresh:
+            return self._result(url, json.loads(cached.value), max_chars, cached=True)
+
         try:
-            async with httpx.AsyncClient(
-                follow_redirects=True,
-                max_redirects=MAX_REDIRECTS,
-                timeout=30.0
-            ) as client:
-                r = await client.get(url, headers={"User-Agent": USER_AGENT})
+            headers = {"User-Agent": USER_AGENT}
+            if cached and cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached and cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+            client = get_http_client("web_fetch", follow_redirects=True, max_redirects=MAX_REDIRECTS)
+            async with client.stream("GET", url, headers=headers, timeout=30.0) as r:
+                if r.status_code == 304 and cached:
+                    if (ttl := freshness(r.headers)) is not None:
+                        await run_blocking(self.cache.touch, key, time.time() + ttl)
+                    return self._result(url, json.loads(cached.value), max_chars, cached=True)
                 r.raise_for_status()
+                body, cut = await _read_capped(r, self.max_bytes)
             
             ctype = r.headers.get("content-type", "")
+            page = body.decode(r.charset_encoding or "utf-8", errors="replace")
             
-            # JSON
-            if "application/json" in ctype:
-                text, extractor = json.dumps(r.json(), indent=2), "json"
+            # JSON (a cut-off document cannot be parsed; fall through to raw)
+            if "application/json" in ctype and not cut:
+                text, extractor = json.dumps(json.loads(page), indent=2), "json"
             # HTML
-            elif "text/html" in ctype or r.text[:256].lower().startswith(("<!doctype", "<html")):
-                doc = Document(r.text)
-                content = self._to_markdown(doc.summary()) if extractMode == "markdown" else _strip_tags(doc.summary())
-                text = f"# {doc.title()}\n\n{content}" if doc.title() else content
+            elif "text/html" in ctype or page[:256].lower().startswith(("<!doctype", "<html")):
+                # Readability is pure-Python CPU work: keep it off the loop and the GIL.
+                text = await run_in_process(extract_readable, page, extractMode, timeout=EXTRACT_TIMEOUT_S)
                 extractor = "readability"
             else:
-                text, extractor = r.text, "raw"
-            
-            truncated = len(text) > max_chars
-            if truncated:
-                text = text[:max_chars]
+                text, extractor = page, "raw"
             
-            return json.dumps({"url": url, "finalUrl": str(r.url), "status": r.status_code,
-                              "extractor": extractor, "truncated": truncated, "length": len(text), "text": text})
+            result = {"finalUrl": str(r.url), "status": r.status_code, "extractor": extractor, "cut": cut, "text": text}
+            if self.cache:
+                await self._store(key, result, r.headers)
+            return self._result(url, result, max_chars, cached=False)
+        except asyncio.TimeoutError:
+            return json.dumps({"error": f"Content extraction timed out after {EXTRACT_TIMEOUT_S:g}s", "url": url})
         except Exception as e:
             return json.dumps({"error": str(e), "url": url})
-    
-    def _to_markdown(self, html: str) -> str:
-        """Convert HTML to markdown."""
-        # Convert links, headings, lists before stripping tags
-        text = re.sub(r'<a\s+[^>]*href=["\']([^"\']+)["\'][^>]*>([\s\S]*?)</a>',
-                      lambda m: f'[{_strip_tags(m[2])}]({m[1]})', html, flags=re.I)
-        text = re.sub(r'<h([1-6])[^>]*>([\s\S]*?)</h\1>',
-                      lambda m: f'\n{"#" * int(m[1])} {_strip_tags(m[2])}\n', text, flags=re.I)
-        text = re.sub(r'<li[^>]*>([\s\S]*?)</li>', lambda m: f'\n- {_strip_tags(m[1])}', text, flags=re.I)
-        text = re.sub(r'</(p|div|section|article)>', '\n\n', text, flags=re.I)
-        text = re.sub(r'<(br|hr)\s*/?>', '\n', text, flags=re.I)
-        return _normalize(_strip_tags(text))
+
+    async def _store(self, key: str, result: dict[str, Any], headers: httpx.Headers) -> None:
+        """Cache an extracted page for as long as its Cache-Control/Expires headers allow."""
+        ttl = freshness(headers)
+        etag, last_modified = headers.get("etag"), headers.get("last-modified")
+        # no-store, or no-cache without validators to revalidate against
+        if ttl is None or (ttl <= 0 and not (etag or last_modified)):
+            return
+        entry = CacheEntry(json.dumps(result), time.time() + ttl, etag, last_modified)
+        await run_blocking(self.cache.put, key, entry)
+
+    @staticmethod
+    def _result(url: str, result: dict[str, Any], max_chars: int, cached: bool) -> str:
+        text = result["text"]
+        truncated = result["cut"] or len(text) > max_chars
+        if len(text) > max_chars:
+            text = text[:max_chars]
+
+        return json.dumps({"url": url, "finalUrl": result["finalUrl"], "status": result["status"],
+                          "extractor": result["extractor"], "truncated": truncated, "cached": cached,
+                          "length": len(text), "text": text})
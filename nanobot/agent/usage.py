@@ -0,0 +1,166 @@
+"""Token usage ledger and budgets."""
+
+import asyncio
+import json
+import time
+from collections import defaultdict
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from nanobot.metrics import metrics
+from nanobot.utils.helpers import ensure_dir
+from nanobot.utils.offload import run_blocking
+
+
+class BudgetExceededError(Exception):
+    """Raised before an LLM call that would run over a token budget."""
+
+
+class UsageLedger:
+    """
+    Record the tokens of every LLM call and enforce daily budgets.
+
+    Each call is appended as one JSON line to `usage_dir/YYYY-MM-DD.jsonl`,
+    tagged with session, channel, model and call site ("turn",
+    "consolidation", "subagent"). Today's totals are kept in memory, rebuilt
+    from today's file on startup, so budget checks never touch the disk.
+    Inside an event loop, entries are buffered and appended in batches on
+    the offload pool; call `flush()` before exiting.
+
+    A budget of 0 means unlimited. Budgets are checked before a call, so the
+    call that crosses the line still completes; the next one is refused.
+    """
+
+    def __init__(self, usage_dir: Path, session_daily_tokens: int = 0, daily_tokens: int = 0):
+        self.usage_dir = ensure_dir(usage_dir)
+        self.session_daily_tokens = session_daily_tokens
+        self.daily_tokens = daily_tokens
+        self._day = ""
+        self._day_total = 0
+        self._session_totals: dict[str, int] = defaultdict(int)
+        self._pending: list[tuple[Path, str]] = []
+        self._flush_task: asyncio.Task[None] | None = None
+        self._roll_day()
+
+    def _path(self, day: str) -> Path:
+        return self.usage_dir / f"{day}.jsonl"
+
+    def _roll_day(self) -> None:
+        """Reset in-memory totals when the date changes, reloading the day's file."""
+        today = date.today().isoformat()
+        if today == self._day:
+            return
+        self._day = today
+        self._day_total = 0
+        self._session_totals = defaultdict(int)
+        for entry in read_usage(self._path(today)):
+            tokens = entry.get("prompt_tokens", 0) + entry.get("completion_tokens", 0)
+            self._day_total += tokens
+            self._session_totals[entry.get("session") or ""] += tokens
+
+    def check(self, session_key: str | None) -> None:
+        """Raise BudgetExceededError if today's budget for the session or overall is spent."""
+        self._roll_day()
+        if self.daily_tokens and self._day_total >= self.daily_tokens:
+            raise BudgetExceededError(
+                f"Daily token budget reached ({self._day_total:,}/{self.daily_tokens:,} tokens). "
+                "Try again tomorrow or raise usage.dailyTokens."
+            )
+        spent = self._session_totals.get(session_key or "", 0)
+        if self.session_daily_tokens and spent >= self.session_daily_tokens:
+            raise BudgetExceededError(
+                f"Token budget for this chat reached today ({spent:,}/{self.session_daily_tokens:,} tokens). "
+                "Try again tomorrow or raise usage.sessionDailyTokens."
+            )
+
+    def record(
+        self,
+        usage: dict[str, int],
+        *,
+        model: str,
+        site: str,
+        session_key: str | None = None,
+        channel: str | None = None,
+    ) -> None:
+        """Account for one LLM call. Calls without reported usage are still counted."""
+        self._roll_day()
+        prompt = int(usage.get("prompt_tokens") or 0)
+        completion = int(usage.get("completion_tokens") or 0)
+        metrics.inc("nanobot_llm_requests_total", model=model, site=site)
+        for kind, tokens in (("prompt", prompt), ("completion", completion)):
+            if tokens:
+                metrics.inc("nanobot_llm_tokens_total", tokens, model=model, kind=kind, site=site)
+
+        self._day_total += prompt + completion
+        self._session_totals[session_key or ""] += prompt + completion
+        entry = {
+            "ts": time.time(),
+            "session": session_key,
+            "channel": channel,
+            "model": model,
+            "site": site,
+            "prompt_tokens": prompt,
+            "completion_tokens": completion,
+        }
+        self._pending.append((self._path(self._day), json.dumps(entry, ensure_ascii=False) + "\n"))
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:  # no event loop (scripts, sync tests): write now
+            self._write(self._take_pending())
+            return
+        if self._flush_task is None:
+            self._flush_task = loop.create_task(self._flush_pending())
+
+    def _take_pending(self) -> list[tuple[Path, str]]:
+        batch, self._pending = self._pending, []
+        return batch
+
+    @staticmethod
+    def _write(batch: list[tuple[Path, str]]) -> None:
+        """Append buffered lines, one open per day file."""
+        by_path: dict[Path, list[str]] = defaultdict(list)
+        for path, line in batch:
+            by_path[path].append(line)
+        for path, lines in by_path.items():
+            try:
+                with open(path, "a", encoding="utf-8") as f:
+                    f.write("".join(lines))
+            except OSError as e:
+                logger.warning(f"Usage ledger: failed to write {len(lines)} entries: {e}")
+
+    async def _flush_pending(self) -> None:
+        try:
+            while self._pending:
+                await run_blocking(self._write, self._take_pending())
+        finally:
+            self._flush_task = None
+
+    async def flush(self) -> None:
+        """Wait until every recorded entry is on disk."""
+        if self._flush_task is not None:
+            await self._flush_task
+        if self._pending:
+            await run_blocking(self._write, self._take_pending())
+
+    @property
+    def today_total(self) -> int:
+        """Tokens used today across all sessions."""
+        self._roll_day()
+        return self._day_total
+
+
+def read_usage(path: Path) -> list[dict[str, Any]]:
+    """Read one day's ledger file, skipping unreadable lines."""
+    if not path.exists():
+        return []
+    entries = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return entries
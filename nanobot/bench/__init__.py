@@ -0,0 +1,8 @@
+"""Offline benchmark harness for nanobot's own overhead."""
+
+from nanobot.bench.guard import GuardBenchResult, bench_guard
+from nanobot.bench.replay import RecordedProvider, ReplayResult, replay_sessions
+from nanobot.bench.runner import BenchResult, run_bench
+
+__all__ = ["run_bench", "BenchResult", "replay_sessions", "ReplayResult", "RecordedProvider",
+           "bench_guard", "GuardBenchResult"]
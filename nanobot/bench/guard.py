@@ -0,0 +1,56 @@
+"""Micro-benchmark for ExecTool's command safety guard."""
+
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from nanobot.agent.tools.shell import ExecTool
+
+# A mix of what the guard sees in practice: plain commands, absolute paths
+# inside and outside the workspace, and commands the deny list rejects.
+GUARD_COMMANDS = [
+    "ls -la",
+    "git status && git diff --stat",
+    "python -m pytest -q tests/",
+    "cat {cwd}/README.md | grep -n install",
+    "grep -rn TODO {cwd}/src > {cwd}/todo.txt",
+    "cat /etc/passwd",
+    "rm -rf /",
+    "shutdown -h now",
+]
+
+
+@dataclass
+class GuardBenchResult:
+    """Outcome of a guard benchmark. Times are in microseconds per command."""
+    commands: int
+    iterations: int
+    restrict_to_workspace: bool
+    avg_us: float
+    blocked: int
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def bench_guard(iterations: int = 10_000, restrict_to_workspace: bool = True) -> GuardBenchResult:
+    """Time `ExecTool._guard_command` over a fixed command mix."""
+    with tempfile.TemporaryDirectory(prefix="nanobot-bench-") as cwd:
+        tool = ExecTool(working_dir=cwd, restrict_to_workspace=restrict_to_workspace)
+        commands = [c.format(cwd=cwd) for c in GUARD_COMMANDS]
+        blocked = sum(tool._guard_command(c, cwd) is not None for c in commands)
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            for command in commands:
+                tool._guard_command(command, cwd)
+        elapsed = time.perf_counter() - start
+
+    return GuardBenchResult(
+        commands=len(commands),
+        iterations=iterations,
+        restrict_to_workspace=restrict_to_workspace,
+        avg_us=elapsed / (iterations * len(commands)) * 1e6,
+        blocked=blocked,
+    )
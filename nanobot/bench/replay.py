@@ -0,0 +1,190 @@
+"""Re-drive recorded sessions through AgentLoop and measure per-turn costs."""
+
+import json
+import tempfile
+import time
+from collections import defaultdict, deque
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from nanobot.agent.loop import AgentLoop
+from nanobot.agent.usage import UsageLedger
+from nanobot.bus.queue import MessageBus
+from nanobot.metrics import metrics
+from nanobot.providers.base import LLMProvider, LLMResponse
+from nanobot.session.manager import SessionManager
+
+
+def load_turns(path: Path) -> list[tuple[str, str]]:
+    """
+    Read (user, assistant) pairs from a session JSONL file.
+
+    Only final texts are stored in sessions, so tool calls and attached
+    media cannot be replayed; unmatched messages are skipped.
+    """
+    turns: list[tuple[str, str]] = []
+    pending_user: str | None = None
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if data.get("_type") == "metadata":
+                continue
+            role, content = data.get("role"), data.get("content")
+            if not isinstance(content, str):
+                continue
+            if role == "user":
+                pending_user = content
+            elif role == "assistant" and pending_user is not None:
+                turns.append((pending_user, content))
+                pending_user = None
+    return turns
+
+
+class RecordedProvider(LLMProvider):
+    """
+    Answers each user message with the reply recorded for it.
+
+    Replies are looked up by the text of the latest user message, in
+    recording order, so repeated messages get their own replies. Anything
+    unrecorded (e.g. memory consolidation prompts) gets `fallback`.
+    """
+
+    def __init__(self, turns: list[tuple[str, str]] | None = None, fallback: str = "OK."):
+        super().__init__()
+        self.fallback = fallback
+        self._replies: dict[str, deque[str]] = defaultdict(deque)
+        for user, assistant in turns or []:
+            self.add(user, assistant)
+
+    def add(self, user: str, assistant: str) -> None:
+        self._replies[user].append(assistant)
+
+    async def chat(self, messages: list[dict[str, Any]], **kwargs: Any) -> LLMResponse:
+        user = next((m.get("content") for m in reversed(messages) if m.get("role") == "user"), None)
+        queue = self._replies.get(user) if isinstance(user, str) else None
+        reply = queue.popleft() if queue else self.fallback
+        return LLMResponse(
+            content=reply,
+            usage={
+                "prompt_tokens": len(json.dumps(messages, default=str)) // 4,
+                "completion_tokens": len(reply) // 4 + 1,
+            },
+        )
+
+    def get_default_model(self) -> str:
+        return "recorded"
+
+
+class _PromptRecorder(LLMProvider):
+    """Wraps a provider to record the size of the first prompt of each turn."""
+
+    def __init__(self, inner: LLMProvider):
+        super().__init__()
+        self.inner = inner
+        self.prompt_chars: int | None = None
+        self.calls = 0
+
+    async def chat(self, messages: list[dict[str, Any]], **kwargs: Any) -> LLMResponse:
+        self.calls += 1
+        if self.prompt_chars is None:
+            self.prompt_chars = len(json.dumps(messages, ensure_ascii=False, default=str))
+        return await self.inner.chat(messages, **kwargs)
+
+    def get_default_model(self) -> str:
+        return self.inner.get_default_model()
+
+
+@dataclass
+class ReplayTurn:
+    """Costs of one replayed turn. Times are in milliseconds."""
+    session: str
+    turn: int
+    turn_ms: float
+    context_build_ms: float
+    save_ms: float
+    prompt_chars: int
+    prompt_tokens: int  # estimated as chars / 4
+    history_messages: int
+
+
+@dataclass
+class ReplayResult:
+    sessions: int
+    turns: list[ReplayTurn] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"sessions": self.sessions, "turns": [asdict(t) for t in self.turns]}
+
+
+def _histogram_total(name: str) -> float:
+    return sum(h.total for h in metrics.histograms.get(name, {}).values())
+
+
+async def replay_sessions(
+    paths: list[Path],
+    provider: LLMProvider | None = None,
+    max_turns: int | None = None,
+    memory_window: int = 50,
+    workspace: Path | None = None,
+) -> ReplayResult:
+    """
+    Replay each session file turn by turn, in a scratch workspace.
+
+    With no `provider`, a RecordedProvider answers with the recorded
+    replies, so history grows exactly as it did in production. Sessions are
+    replayed one after another; per-turn timings come from the metrics
+    registry (reset first) and are attributed by difference.
+    """
+    metrics.reset()
+    result = ReplayResult(sessions=len(paths))
+    with tempfile.TemporaryDirectory(prefix="nanobot-replay-") as tmp:
+        root = workspace or Path(tmp)
+        recorded = provider is None
+        inner = provider or RecordedProvider()
+        recorder = _PromptRecorder(inner)
+        sessions = SessionManager(root / "workspace", sessions_dir=root / "sessions")
+        agent = AgentLoop(
+            bus=MessageBus(),
+            provider=recorder,
+            workspace=root / "workspace",
+            max_iterations=max(2, getattr(inner, "tool_rounds", 0) + 1),
+            memory_window=memory_window,
+            session_manager=sessions,
+            usage_ledger=UsageLedger(root / "usage"),
+        )
+        try:
+            for path in paths:
+                turns = load_turns(path)[:max_turns]
+                if recorded:
+                    for user, assistant in turns:
+                        inner.add(user, assistant)
+                key = f"replay:{path.stem}"
+                for index, (user, _) in enumerate(turns):
+                    build_before = _histogram_total("nanobot_context_build_seconds")
+                    save_before = _histogram_total("nanobot_session_save_seconds")
+                    recorder.prompt_chars = None
+                    start = time.perf_counter()
+                    await agent.process_direct(user, session_key=key)
+                    turn_ms = (time.perf_counter() - start) * 1000
+                    chars = recorder.prompt_chars or 0
+                    result.turns.append(ReplayTurn(
+                        session=path.stem,
+                        turn=index,
+                        turn_ms=turn_ms,
+                        context_build_ms=(_histogram_total("nanobot_context_build_seconds") - build_before) * 1000,
+                        save_ms=(_histogram_total("nanobot_session_save_seconds") - save_before) * 1000,
+                        prompt_chars=chars,
+                        prompt_tokens=chars // 4,
+                        history_messages=len(sessions.get_or_create(key).messages),
+                    ))
+        finally:
+            await agent.close_mcp()
+            await agent.close_tools()
+    return result
@@ -0,0 +1,148 @@
+"""Drive AgentLoop through the MessageBus with synthetic sessions."""
+
+import asyncio
+import statistics
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from nanobot.agent.loop import AgentLoop
+from nanobot.agent.usage import UsageLedger
+from nanobot.bus.events import InboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.metrics import metrics
+from nanobot.providers.mock import MockProvider
+from nanobot.session.manager import SessionManager
+
+BENCH_CHANNEL = "bench"
+
+
+@dataclass
+class BenchResult:
+    """Outcome of one benchmark run. Latencies are in milliseconds."""
+    sessions: int
+    turns: int
+    messages: int
+    wall_s: float
+    throughput: float  # messages per second
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    llm_calls: int
+    peak_rss_mb: float | None
+    stages: list[dict[str, Any]] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def _peak_rss_mb() -> float | None:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    import sys
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+async def run_bench(
+    sessions: int = 10,
+    turns: int = 5,
+    provider: MockProvider | None = None,
+    workspace: Path | None = None,
+) -> BenchResult:
+    """
+    Run `sessions` concurrent synthetic chats of `turns` messages each.
+
+    Every session waits for its reply before sending the next message, like
+    a person would. Latency is measured from publish to the reply appearing
+    on the outbound queue. Per-stage timings come from the metrics registry,
+    which is reset first. Sessions, memory and the usage ledger live in a
+    temporary directory unless `workspace` is given.
+    """
+    provider = provider or MockProvider()
+    metrics.reset()
+    with tempfile.TemporaryDirectory(prefix="nanobot-bench-") as tmp:
+        root = workspace or Path(tmp)
+        bus = MessageBus()
+        agent = AgentLoop(
+            bus=bus,
+            provider=provider,
+            workspace=root / "workspace",
+            max_iterations=max(2, provider.tool_rounds + 1),
+            session_manager=SessionManager(root / "workspace", sessions_dir=root / "sessions"),
+            usage_ledger=UsageLedger(root / "usage"),
+        )
+        waiting: dict[str, asyncio.Future] = {}
+
+        async def collect_replies() -> None:
+            while True:
+                msg = await bus.consume_outbound()
+                future = waiting.pop(msg.chat_id, None)
+                if future and not future.done():
+                    future.set_result(msg)
+
+        async def session(index: int) -> list[float]:
+            chat_id = f"s{index}"
+            latencies = []
+            for turn in range(turns):
+                future = asyncio.get_running_loop().create_future()
+                waiting[chat_id] = future
+                start = time.perf_counter()
+                await bus.publish_inbound(InboundMessage(
+                    channel=BENCH_CHANNEL, sender_id=f"user{index}", chat_id=chat_id,
+                    content=f"Benchmark message {turn} from session {index}.",
+                ))
+                await future
+                latencies.append((time.perf_counter() - start) * 1000)
+            return latencies
+
+        agent_task = asyncio.create_task(agent.run())
+        collector = asyncio.create_task(collect_replies())
+        try:
+            start = time.perf_counter()
+            per_session = await asyncio.gather(*(session(i) for i in range(sessions)))
+            wall = time.perf_counter() - start
+        finally:
+            await agent.shutdown(timeout=5)
+            agent_task.cancel()
+            collector.cancel()
+            await asyncio.gather(agent_task, collector, return_exceptions=True)
+            await agent.usage.flush()
+
+    latencies = sorted(ms for lat in per_session for ms in lat)
+    stages = [
+        {
+            "stage": h["name"].removeprefix("nanobot_").removesuffix("_seconds"),
+            "labels": h["labels"],
+            "count": h["count"],
+            "avg_ms": h["avg"] * 1000,
+            "p95_ms": h["p95"] * 1000,
+        }
+        for h in metrics.snapshot()["histograms"]
+    ]
+    return BenchResult(
+        sessions=sessions,
+        turns=turns,
+        messages=len(latencies),
+        wall_s=wall,
+        throughput=len(latencies) / wall if wall else 0.0,
+        p50_ms=statistics.median(latencies) if latencies else 0.0,
+        p95_ms=_percentile(latencies, 0.95),
+        p99_ms=_percentile(latencies, 0.99),
+        max_ms=latencies[-1] if latencies else 0.0,
+        llm_calls=provider.calls,
+        peak_rss_mb=_peak_rss_mb(),
+        stages=stages,
+    )
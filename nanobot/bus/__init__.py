@@ -1,6 +1,7 @@
 """Message bus module for decoupled channel-agent communication."""
 
-from nanobot.bus.events import InboundMessage, OutboundMessage
+from nanobot.bus.events import InboundMessage, MessagePriority, OutboundMessage
 from nanobot.bus.queue import MessageBus
+from nanobot.bus.wal import MessageLog
 
-__all__ = ["MessageBus", "InboundMessage", "OutboundMessage"]
+__all__ = ["MessageBus", "MessageLog", "InboundMessage", "OutboundMessage", "MessagePriority"]
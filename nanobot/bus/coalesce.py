@@ -0,0 +1,85 @@
+"""Merging of rapid-fire inbound messages into a single agent turn.
+
+Shared by the bus-level coalescing window and by channels that buffer
+messages themselves (e.g. Mochat's reply delay).
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any
+
+from nanobot.bus.events import InboundMessage, MessagePriority
+from nanobot.bus.wal import WAL_IDS_KEY
+
+
+@dataclass
+class CoalesceBuffer:
+    """Per-target messages held back until they are released as one turn."""
+    entries: list[Any] = field(default_factory=list)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    timer: asyncio.TimerHandle | asyncio.Task | None = None
+    opened_at: float = 0.0
+
+    def cancel_timer(self) -> None:
+        """Cancel the pending flush, if any."""
+        if self.timer:
+            self.timer.cancel()
+            self.timer = None
+
+
+def is_coalescible(msg: InboundMessage) -> bool:
+    """Only plain interactive chat text may be merged with its neighbours."""
+    return (
+        msg.priority == MessagePriority.INTERACTIVE
+        and not msg.content.lstrip().startswith("/")
+        and "_request_id" not in msg.metadata
+    )
+
+
+def build_coalesced_body(parts: list[tuple[str, str]], label: bool) -> str:
+    """
+    Build a text body from (speaker, text) pairs.
+
+    A single part is returned verbatim. Otherwise non-empty texts are joined
+    one per line, prefixed with the speaker when `label` is set.
+    """
+    if not parts:
+        return ""
+    if len(parts) == 1:
+        return parts[0][1]
+    lines: list[str] = []
+    for speaker, text in parts:
+        if not text:
+            continue
+        lines.append(f"{speaker}: {text}" if label and speaker else text)
+    return "\n".join(lines).strip()
+
+
+def merge_inbound(entries: list[InboundMessage]) -> InboundMessage:
+    """
+    Merge consecutive messages from one session into a single message.
+
+    The first message keeps its timestamp (so queue wait is measured from the
+    oldest entry); sender and metadata come from the last one, so replies
+    thread against the most recent message. Lines are labelled with the
+    sender only when more than one person spoke. The merged message acks
+    the log entries of all its parts.
+    """
+    if len(entries) == 1:
+        return entries[0]
+    first, last = entries[0], entries[-1]
+    label = len({e.sender_id for e in entries}) > 1
+    metadata = {**last.metadata, "coalesced_count": len(entries)}
+    wal_ids = [i for e in entries for i in e.metadata.get(WAL_IDS_KEY, [])]
+    if wal_ids:
+        metadata[WAL_IDS_KEY] = wal_ids
+    return InboundMessage(
+        channel=last.channel,
+        sender_id=last.sender_id,
+        chat_id=last.chat_id,
+        content=build_coalesced_body([(e.sender_id, e.content) for e in entries], label),
+        timestamp=first.timestamp,
+        media=[m for e in entries for m in e.media],
+        metadata=metadata,
+        priority=last.priority,
+    )
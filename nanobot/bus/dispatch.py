@@ -0,0 +1,102 @@
+"""Concurrent outbound delivery with one ordered worker per channel or chat."""
+
+import asyncio
+from typing import Awaitable, Callable
+
+from loguru import logger
+
+from nanobot.bus.events import OutboundMessage
+from nanobot.metrics import metrics
+from nanobot.tracing import tracer
+
+# A worker with nothing to send for this long exits; the next message for
+# its key starts a fresh one.
+DEFAULT_IDLE_TIMEOUT = 60.0
+
+
+class OutboundDispatcher:
+    """
+    Deliver outbound messages concurrently across channels.
+
+    Every delivery key (the channel, or channel and chat with `per_chat`)
+    gets its own FIFO queue drained by its own task, so a slow send on one
+    channel no longer delays replies on another, while messages for the same
+    chat are still delivered in the order they were published.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[OutboundMessage], Awaitable[None]],
+        per_chat: bool = False,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+    ):
+        self.send = send
+        self.per_chat = per_chat
+        self.idle_timeout = idle_timeout
+        self._queues: dict[str, asyncio.Queue[OutboundMessage]] = {}
+        self._workers: dict[str, asyncio.Task] = {}
+
+    def key_for(self, msg: OutboundMessage) -> str:
+        """Delivery key: messages sharing a key are sent one at a time, in order."""
+        return f"{msg.channel}:{msg.chat_id}" if self.per_chat else msg.channel
+
+    def submit(self, msg: OutboundMessage) -> None:
+        """Queue a message on its key's worker, starting the worker if needed."""
+        key = self.key_for(msg)
+        queue = self._queues.get(key)
+        if queue is None:
+            queue = self._queues[key] = asyncio.Queue()
+        queue.put_nowait(msg)
+        if key not in self._workers:
+            self._workers[key] = asyncio.create_task(self._work(key, queue))
+
+    async def _work(self, key: str, queue: asyncio.Queue[OutboundMessage]) -> None:
+        """Send a key's messages sequentially until it has been idle for a while."""
+        try:
+            while True:
+                try:
+                    msg = await asyncio.wait_for(queue.get(), timeout=self.idle_timeout)
+                except asyncio.TimeoutError:
+                    if queue.empty():
+                        return
+                    continue
+                try:
+                    with (
+                        metrics.timer("nanobot_outbound_send_seconds", channel=msg.channel),
+                        tracer.span("channel.send", parent=msg.metadata, channel=msg.channel),
+                    ):
+                        await self.send(msg)
+                except Exception as e:
+                    logger.error(f"Error sending to {msg.channel}: {e}")
+                finally:
+                    queue.task_done()
+        finally:
+            self._workers.pop(key, None)
+            if queue.empty() and self._queues.get(key) is queue:
+                del self._queues[key]
+
+    async def join(self) -> None:
+        """Wait until every queued message has been sent."""
+        for queue in list(self._queues.values()):
+            await queue.join()
+
+    async def drain(self, timeout: float) -> None:
+        """Give queued messages up to `timeout` seconds to be sent, then close."""
+        try:
+            await asyncio.wait_for(self.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Outbound: {self.pending} messages unsent after {timeout:.0f}s")
+        await self.close()
+
+    async def close(self) -> None:
+        """Cancel all workers; messages not yet sent are discarded."""
+        workers = list(self._workers.values())
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self._queues.clear()
+
+    @property
+    def pending(self) -> int:
+        """Number of messages queued but not yet handed to `send`."""
+        return sum(q.qsize() for q in self._queues.values())
@@ -2,9 +2,19 @@
 
 from dataclasses import dataclass, field
 from datetime import datetime
+from enum import IntEnum
 from typing import Any
 
 
+class MessagePriority(IntEnum):
+    """Scheduling class for inbound messages (lower value is served first)."""
+
+    INTERACTIVE = 0  # A human is waiting on the reply
+    SYSTEM = 1  # Subagent announcements and other internal follow-ups
+    BACKGROUND = 2  # Cron jobs, heartbeat runs
+
+
+
 @dataclass
 class InboundMessage:
     """Message received from a chat channel."""
@@ -16,6 +26,16 @@ class InboundMessage:
     timestamp: datetime = field(default_factory=datetime.now)
     media: list[str] = field(default_factory=list)  # Media URLs
     metadata: dict[str, Any] = field(default_factory=dict)  # Channel-specific data
+    priority: MessagePriority | None = None  # SYSTEM for channel "system", else INTERACTIVE
+
+    def __post_init__(self) -> None:
+        # Background work (cron, heartbeat) sets BACKGROUND explicitly via
+        # AgentLoop.process_queued; it keeps its delivery channel.
+        if self.priority is None:
+            if self.channel == "system":
+                self.priority = MessagePriority.SYSTEM
+            else:
+                self.priority = MessagePriority.INTERACTIVE
     
     @property
     def session_key(self) -> str:
@@ -1,11 +1,23 @@
 """Async message queue for decoupled channel-agent communication."""
 
 import asyncio
+from collections import deque
 from typing import Callable, Awaitable
 
 from loguru import logger
 
-from nanobot.bus.events import InboundMessage, OutboundMessage
+from nanobot.bus.coalesce import CoalesceBuffer, is_coalescible, merge_inbound
+from nanobot.bus.dispatch import OutboundDispatcher
+from nanobot.bus.events import InboundMessage, MessagePriority, OutboundMessage
+from nanobot.bus.wal import INBOUND, OUTBOUND, MessageLog
+from nanobot.tracing import tracer
+
+# How many times a non-empty lane may be passed over before it is served
+# ahead of higher-priority traffic.
+DEFAULT_STARVATION_LIMIT = 8
+
+# A coalescing window never holds a burst longer than this many windows.
+COALESCE_MAX_WINDOWS = 4
 
 
 class MessageBus:
@@ -14,24 +26,147 @@ class MessageBus:
     
     Channels push messages to the inbound queue, and the agent processes
     them and pushes responses to the outbound queue.
+
+    Inbound messages are kept in one FIFO lane per MessagePriority. The
+    consumer always takes from the highest-priority non-empty lane, except
+    that a lane skipped `starvation_limit` times in a row is served next.
+
+    Consecutive chat messages for the same session are coalesced into one
+    turn: while an earlier message is still queued (`coalesce_queued`), and
+    optionally for `coalesce_window_ms` after each message.
+
+    Outbound messages are delivered by an OutboundDispatcher: channels send
+    in parallel, in order within each channel (or each chat, with
+    `outbound_per_chat`).
+
+    With a MessageLog, messages are written ahead of queueing and acked by
+    their consumer once handled; `replay()` requeues whatever was left
+    unacked by a previous run.
     """
     
-    def __init__(self):
-        self.inbound: asyncio.Queue[InboundMessage] = asyncio.Queue()
+    def __init__(
+        self,
+        starvation_limit: int = DEFAULT_STARVATION_LIMIT,
+        coalesce_window_ms: int = 0,
+        coalesce_queued: bool = True,
+        outbound_per_chat: bool = False,
+        log: MessageLog | None = None,
+    ):
+        self.starvation_limit = max(1, starvation_limit)
+        self.coalesce_window_s = max(0, coalesce_window_ms) / 1000.0
+        self.coalesce_queued = coalesce_queued
+        self.outbound_per_chat = outbound_per_chat
+        self.log = log
+        self._lanes: dict[MessagePriority, deque[InboundMessage]] = {p: deque() for p in MessagePriority}
+        self._skipped: dict[MessagePriority, int] = {p: 0 for p in MessagePriority}
+        self._inbound_ready = asyncio.Semaphore(0)
+        # session_key -> (last queued interactive message, the messages merged into it)
+        self._queued: dict[str, tuple[InboundMessage, list[InboundMessage]]] = {}
+        self._buffers: dict[str, CoalesceBuffer] = {}
         self.outbound: asyncio.Queue[OutboundMessage] = asyncio.Queue()
         self._outbound_subscribers: dict[str, list[Callable[[OutboundMessage], Awaitable[None]]]] = {}
-        self._running = False
+        self._dispatch_task: asyncio.Task | None = None
     
     async def publish_inbound(self, msg: InboundMessage) -> None:
         """Publish a message from a channel to the agent."""
-        await self.inbound.put(msg)
+        msg.metadata = tracer.inject(msg.metadata)
+        # process_queued turns are not logged: their caller cannot survive a restart.
+        if self.log and "_request_id" not in msg.metadata:
+            if self.log.append(INBOUND, msg) is None:
+                logger.debug(f"Bus: dropping duplicate message {msg.metadata.get('message_id')} from {msg.session_key}")
+                return
+        key = msg.session_key
+        # Messages a channel already buffered itself (e.g. Mochat reply delay)
+        # skip the window so they are not held twice.
+        if self.coalesce_window_s and is_coalescible(msg) and "coalesced_count" not in msg.metadata:
+            self._buffer_inbound(key, msg)
+            return
+        self._flush_buffer(key)
+        self._enqueue_inbound(msg)
     
     async def consume_inbound(self) -> InboundMessage:
         """Consume the next inbound message (blocks until available)."""
-        return await self.inbound.get()
+        await self._inbound_ready.acquire()
+        msg = self._next_inbound()
+        queued = self._queued.get(msg.session_key)
+        if queued and queued[0] is msg:
+            del self._queued[msg.session_key]
+        return msg
+
+    def _enqueue_inbound(self, msg: InboundMessage, parts: list[InboundMessage] | None = None) -> None:
+        """Append to the message's lane, merging into a still-queued message when allowed."""
+        parts = parts or [msg]
+        lane = self._lanes[msg.priority]
+        if msg.priority != MessagePriority.INTERACTIVE:
+            lane.append(msg)
+            self._inbound_ready.release()
+            return
+
+        key = msg.session_key
+        queued = self._queued.get(key)
+        if self.coalesce_queued and queued and is_coalescible(queued[0]) and is_coalescible(msg):
+            head, merged_parts = queued
+            merged_parts.extend(parts)
+            merged = merge_inbound(merged_parts)
+            for i, pending in enumerate(lane):
+                if pending is head:
+                    lane[i] = merged
+                    break
+            self._queued[key] = (merged, merged_parts)
+            logger.debug(f"Bus: coalesced {len(merged_parts)} messages for {key}")
+            return
+
+        lane.append(msg)
+        self._queued[key] = (msg, parts)
+        self._inbound_ready.release()
+
+    def _buffer_inbound(self, key: str, msg: InboundMessage) -> None:
+        """Hold a message in its session's window, restarting the flush timer."""
+        loop = asyncio.get_running_loop()
+        buf = self._buffers.get(key)
+        if buf is None:
+            buf = self._buffers[key] = CoalesceBuffer(opened_at=loop.time())
+        buf.entries.append(msg)
+        buf.cancel_timer()
+        deadline = min(
+            loop.time() + self.coalesce_window_s,
+            buf.opened_at + self.coalesce_window_s * COALESCE_MAX_WINDOWS,
+        )
+        buf.timer = loop.call_at(deadline, self._flush_buffer, key)
+
+    def _flush_buffer(self, key: str) -> None:
+        """Release a session's held messages to the queue as a single message."""
+        buf = self._buffers.pop(key, None)
+        if buf is None:
+            return
+        buf.cancel_timer()
+        if buf.entries:
+            self._enqueue_inbound(merge_inbound(buf.entries), buf.entries)
+
+    def flush_coalesced(self) -> None:
+        """Release every message still held in a coalescing window."""
+        for key in list(self._buffers):
+            self._flush_buffer(key)
+
+    def _next_inbound(self) -> InboundMessage:
+        """Pop from the highest-priority lane, honouring starvation protection."""
+        pending = [p for p in MessagePriority if self._lanes[p]]
+        chosen = pending[0]
+        for p in pending[1:]:
+            if self._skipped[p] >= self.starvation_limit:
+                chosen = p
+                break
+        for p in pending:
+            self._skipped[p] = 0 if p == chosen else self._skipped[p] + 1
+        if chosen != pending[0]:
+            logger.debug(f"Bus: serving starved {chosen.name.lower()} lane")
+        return self._lanes[chosen].popleft()
     
     async def publish_outbound(self, msg: OutboundMessage) -> None:
         """Publish a response from the agent to channels."""
+        msg.metadata = tracer.inject(msg.metadata)
+        if self.log:
+            self.log.append(OUTBOUND, msg)
         await self.outbound.put(msg)
     
     async def consume_outbound(self) -> OutboundMessage:
@@ -48,32 +183,67 @@ class MessageBus:
             self._outbound_subscribers[channel] = []
         self._outbound_subscribers[channel].append(callback)
     
-    async def dispatch_outbound(self) -> None:
+    async def dispatch_outbound(self, drain_timeout: float = 5.0) -> None:
         """
         Dispatch outbound messages to subscribed channels.
-        Run this as a background task.
+        Run this as a background task; `stop()` ends it, giving messages
+        already queued up to `drain_timeout` seconds to be delivered.
         """
-        self._running = True
-        while self._running:
+        self._dispatch_task = asyncio.current_task()
+        dispatcher = OutboundDispatcher(self._deliver_outbound, per_chat=self.outbound_per_chat)
+        try:
+            while True:
+                dispatcher.submit(await self.outbound.get())
+        except asyncio.CancelledError:
+            while not self.outbound.empty():
+                dispatcher.submit(self.outbound.get_nowait())
+            await dispatcher.drain(drain_timeout)
+        finally:
+            self._dispatch_task = None
+            await dispatcher.close()
+
+    async def _deliver_outbound(self, msg: OutboundMessage) -> None:
+        """Hand a message to each subscriber of its channel."""
+        for callback in self._outbound_subscribers.get(msg.channel, []):
             try:
-                msg = await asyncio.wait_for(self.outbound.get(), timeout=1.0)
-                subscribers = self._outbound_subscribers.get(msg.channel, [])
-                for callback in subscribers:
-                    try:
-                        await callback(msg)
-                    except Exception as e:
-                        logger.error(f"Error dispatching to {msg.channel}: {e}")
-            except asyncio.TimeoutError:
-                continue
+                await callback(msg)
+            except Exception as e:
+                logger.error(f"Error dispatching to {msg.channel}: {e}")
+        self.ack(msg)
+
+    def ack(self, msg: InboundMessage | OutboundMessage) -> None:
+        """Mark a consumed message as handled so it is not replayed after a restart."""
+        if self.log:
+            self.log.ack(msg)
+
+    def replay(self) -> int:
+        """Requeue messages a previous run logged but never acked. Returns how many."""
+        if not self.log:
+            return 0
+        inbound = self.log.pending(INBOUND)
+        for msg in inbound:
+            self._enqueue_inbound(msg)
+        outbound = self.log.pending(OUTBOUND)
+        for msg in outbound:
+            self.outbound.put_nowait(msg)
+        if inbound or outbound:
+            logger.info(f"Bus: replayed {len(inbound)} inbound and {len(outbound)} outbound messages")
+        return len(inbound) + len(outbound)
     
     def stop(self) -> None:
-        """Stop the dispatcher loop."""
-        self._running = False
+        """Stop the dispatcher loop and release any held inbound messages."""
+        if self._dispatch_task:
+            self._dispatch_task.cancel()
+        self.flush_coalesced()
     
     @property
     def inbound_size(self) -> int:
         """Number of pending inbound messages."""
-        return self.inbound.qsize()
+        return sum(len(lane) for lane in self._lanes.values())
+
+    def lane_sizes(self) -> dict[str, int]:
+        """Number of pending inbound messages per priority lane."""
+        return {p.name.lower(): len(lane) for p, lane in self._lanes.items()}
     
     @property
     def outbound_size(self) -> int:
@@ -0,0 +1,149 @@
+"""SQLite write-ahead log that lets bus messages survive a gateway restart."""
+
+import json
+import sqlite3
+import time
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from nanobot.bus.events import InboundMessage, MessagePriority, OutboundMessage
+
+INBOUND = "in"
+OUTBOUND = "out"
+
+# Metadata key carrying the log entry ids a message must ack. A list, since
+# a coalesced inbound message stands for several logged messages.
+WAL_IDS_KEY = "_wal_ids"
+
+# Acked entries are kept this long so redelivered channel messages are still
+# recognised as duplicates.
+DEFAULT_RETENTION_S = 24 * 3600
+
+_PRUNE_EVERY = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    direction TEXT NOT NULL,
+    idem_key TEXT UNIQUE,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    acked_at REAL
+);
+CREATE INDEX IF NOT EXISTS messages_pending ON messages (direction, acked_at);
+"""
+
+
+def idempotency_key(msg: InboundMessage) -> str | None:
+    """Key for deduplicating redelivered channel messages, from the channel's message id."""
+    message_id = msg.metadata.get("message_id")
+    if message_id in (None, ""):
+        return None
+    return f"{msg.channel}:{msg.chat_id}:{message_id}"
+
+
+def _encode(msg: InboundMessage | OutboundMessage) -> str:
+    data = asdict(msg)
+    data["metadata"] = {k: v for k, v in data["metadata"].items() if k != WAL_IDS_KEY}
+    if isinstance(msg, InboundMessage):
+        data["timestamp"] = msg.timestamp.isoformat()
+        data["priority"] = int(msg.priority)
+    return json.dumps(data, ensure_ascii=False, default=str)
+
+
+def _decode(direction: str, payload: str) -> InboundMessage | OutboundMessage:
+    data: dict[str, Any] = json.loads(payload)
+    if direction == OUTBOUND:
+        return OutboundMessage(**data)
+    data["timestamp"] = datetime.fromisoformat(data["timestamp"])
+    data["priority"] = MessagePriority(data["priority"])
+    return InboundMessage(**data)
+
+
+class MessageLog:
+    """
+    Append-only log of bus messages with ack-on-completion.
+
+    Every message is written before it is queued and acked once it has been
+    handled (an inbound turn finished, an outbound message was sent).
+    Whatever is still unacked when the process dies is replayed on the next
+    start. Inbound messages carrying a channel message id are deduplicated.
+    """
+
+    def __init__(self, path: Path, retention_s: float = DEFAULT_RETENTION_S):
+        self.path = path
+        self.retention_s = retention_s
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path), isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._acks_since_prune = 0
+        self.prune()
+
+    def append(self, direction: str, msg: InboundMessage | OutboundMessage) -> int | None:
+        """
+        Write a message to the log and tag it with its entry id.
+
+        Returns the entry id, or None if an inbound message with the same
+        idempotency key was already logged.
+        """
+        key = idempotency_key(msg) if isinstance(msg, InboundMessage) else None
+        try:
+            cur = self._db.execute(
+                "INSERT INTO messages (direction, idem_key, payload, created_at) VALUES (?, ?, ?, ?)",
+                (direction, key, _encode(msg), time.time()),
+            )
+        except sqlite3.IntegrityError:
+            return None
+        entry_id = cur.lastrowid
+        msg.metadata = {**msg.metadata, WAL_IDS_KEY: [entry_id]}
+        return entry_id
+
+    def ack(self, msg: InboundMessage | OutboundMessage) -> None:
+        """Mark every entry behind a message as handled."""
+        ids = msg.metadata.get(WAL_IDS_KEY) or []
+        if not ids:
+            return
+        now = time.time()
+        self._db.executemany(
+            "UPDATE messages SET acked_at = ? WHERE id = ? AND acked_at IS NULL",
+            [(now, i) for i in ids],
+        )
+        self._acks_since_prune += 1
+        if self._acks_since_prune >= _PRUNE_EVERY:
+            self.prune()
+
+    def pending(self, direction: str) -> list[InboundMessage | OutboundMessage]:
+        """Unacked messages in the order they were logged, tagged with their entry ids."""
+        rows = self._db.execute(
+            "SELECT id, payload FROM messages WHERE direction = ? AND acked_at IS NULL ORDER BY id",
+            (direction,),
+        ).fetchall()
+        messages = []
+        for entry_id, payload in rows:
+            try:
+                msg = _decode(direction, payload)
+            except (ValueError, TypeError, KeyError) as e:
+                logger.warning(f"Bus log: dropping unreadable entry {entry_id}: {e}")
+                self._db.execute("UPDATE messages SET acked_at = ? WHERE id = ?", (time.time(), entry_id))
+                continue
+            msg.metadata[WAL_IDS_KEY] = [entry_id]
+            messages.append(msg)
+        return messages
+
+    def prune(self) -> None:
+        """Delete acked entries older than the retention period."""
+        self._acks_since_prune = 0
+        self._db.execute(
+            "DELETE FROM messages WHERE acked_at IS NOT NULL AND acked_at < ?",
+            (time.time() - self.retention_s,),
+        )
+
+    def close(self) -> None:
+        """Close the database."""
+        self._db.close()
@@ -7,6 +7,7 @@ from loguru import logger
 
 from nanobot.bus.events import InboundMessage, OutboundMessage
 from nanobot.bus.queue import MessageBus
+from nanobot.tracing import tracer
 
 
 class BaseChannel(ABC):
@@ -119,7 +120,8 @@ class BaseChannel(ABC):
             metadata=metadata or {}
         )
         
-        await self.bus.publish_inbound(msg)
+        with tracer.span("channel.receive", channel=self.name):
+            await self.bus.publish_inbound(msg)
     
     @property
     def is_running(self) -> bool:
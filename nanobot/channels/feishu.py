@@ -13,6 +13,7 @@ from nanobot.bus.events import OutboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.channels.base import BaseChannel
 from nanobot.config.schema import FeishuConfig
+from nanobot.utils.offload import run_blocking
 
 try:
     import lark_oapi as lark
@@ -204,8 +205,7 @@ class FeishuChannel(BaseChannel):
         if not self._client or not Emoji:
             return
         
-        loop = asyncio.get_running_loop()
-        await loop.run_in_executor(None, self._add_reaction_sync, message_id, emoji_type)
+        await run_blocking(self._add_reaction_sync, message_id, emoji_type)
     
     # Regex to match markdown tables (header + separator + data rows)
     _TABLE_RE = re.compile(
@@ -316,7 +316,8 @@ class FeishuChannel(BaseChannel):
                     .build()
                 ).build()
             
-            response = self._client.im.v1.message.create(request)
+            # The lark SDK is synchronous; keep its HTTP round trip off the loop.
+            response = await run_blocking(self._client.im.v1.message.create, request)
             
             if not response.success():
                 logger.error(
@@ -7,6 +7,7 @@ from typing import Any
 
 from loguru import logger
 
+from nanobot.bus.dispatch import OutboundDispatcher
 from nanobot.bus.events import OutboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.channels.base import BaseChannel
@@ -28,6 +29,9 @@ class ChannelManager:
         self.bus = bus
         self.channels: dict[str, BaseChannel] = {}
         self._dispatch_task: asyncio.Task | None = None
+        self._dispatcher = OutboundDispatcher(
+            self._send, per_chat=config.bus.outbound_per_chat,
+        )
         
         self._init_channels()
     
@@ -162,8 +166,13 @@ class ChannelManager:
         # Wait for all to complete (they should run forever)
         await asyncio.gather(*tasks, return_exceptions=True)
     
-    async def stop_all(self) -> None:
-        """Stop all channels and the dispatcher."""
+    async def stop_all(self, drain_timeout: float = 5.0) -> None:
+        """
+        Stop the dispatcher and all channels.
+
+        Replies already published get up to `drain_timeout` seconds to be
+        sent before the channels are shut down.
+        """
         logger.info("Stopping all channels...")
         
         # Stop dispatcher
@@ -173,6 +182,9 @@ class ChannelManager:
                 await self._dispatch_task
             except asyncio.CancelledError:
                 pass
+        while self.bus.outbound_size:
+            self._dispatcher.submit(self.bus.outbound.get_nowait())
+        await self._dispatcher.drain(drain_timeout)
         
         # Stop all channels
         for name, channel in self.channels.items():
@@ -183,29 +195,21 @@ class ChannelManager:
                 logger.error(f"Error stopping {name}: {e}")
     
     async def _dispatch_outbound(self) -> None:
-        """Dispatch outbound messages to the appropriate channel."""
+        """Hand outbound messages to per-channel workers so channels send in parallel."""
         logger.info("Outbound dispatcher started")
-        
         while True:
-            try:
-                msg = await asyncio.wait_for(
-                    self.bus.consume_outbound(),
-                    timeout=1.0
-                )
-                
-                channel = self.channels.get(msg.channel)
-                if channel:
-                    try:
-                        await channel.send(msg)
-                    except Exception as e:
-                        logger.error(f"Error sending to {msg.channel}: {e}")
-                else:
-                    logger.warning(f"Unknown channel: {msg.channel}")
-                    
-            except asyncio.TimeoutError:
-                continue
-            except asyncio.CancelledError:
-                break
+            self._dispatcher.submit(await self.bus.consume_outbound())
+
+    async def _send(self, msg: OutboundMessage) -> None:
+        """Send one message through its channel, then ack it on the bus."""
+        channel = self.channels.get(msg.channel)
+        try:
+            if channel:
+                await channel.send(msg)
+            else:
+                logger.warning(f"Unknown channel: {msg.channel}")
+        finally:
+            self.bus.ack(msg)
     
     def get_channel(self, name: str) -> BaseChannel | None:
         """Get a channel by name."""
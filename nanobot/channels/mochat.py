@@ -5,13 +5,14 @@ from __future__ import annotations
 import asyncio
 import json
 from collections import deque
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
 
 import httpx
 from loguru import logger
 
+from nanobot.bus.coalesce import CoalesceBuffer, build_coalesced_body
 from nanobot.bus.events import OutboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.channels.base import BaseChannel
@@ -51,12 +52,8 @@ class MochatBufferedEntry:
     group_id: str = ""
 
 
-@dataclass
-class DelayState:
-    """Per-target delayed message state."""
-    entries: list[MochatBufferedEntry] = field(default_factory=list)
-    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
-    timer: asyncio.Task | None = None
+# Per-target delayed message state (entries are MochatBufferedEntry)
+DelayState = CoalesceBuffer
 
 
 @dataclass
@@ -181,21 +178,11 @@ def resolve_require_mention(config: MochatConfig, session_id: str, group_id: str
 
 def build_buffered_body(entries: list[MochatBufferedEntry], is_group: bool) -> str:
     """Build text body from one or more buffered entries."""
-    if not entries:
-        return ""
-    if len(entries) == 1:
-        return entries[0].raw_body
-    lines: list[str] = []
-    for entry in entries:
-        if not entry.raw_body:
-            continue
-        if is_group:
-            label = entry.sender_name.strip() or entry.sender_username.strip() or entry.author
-            if label:
-                lines.append(f"{label}: {entry.raw_body}")
-                continue
-        lines.append(entry.raw_body)
-    return "\n".join(lines).strip()
+    parts = [
+        (e.sender_name.strip() or e.sender_username.strip() or e.author, e.raw_body)
+        for e in entries
+    ]
+    return build_coalesced_body(parts, label=is_group)
 
 
 def parse_timestamp(value: Any) -> int | None:
@@ -723,8 +710,7 @@ class MochatChannel(BaseChannel):
         state = self._delay_states.setdefault(key, DelayState())
         async with state.lock:
             state.entries.append(entry)
-            if state.timer:
-                state.timer.cancel()
+            state.cancel_timer()
             state.timer = asyncio.create_task(self._delay_flush_after(key, target_id, target_kind))
 
     async def _delay_flush_after(self, key: str, target_id: str, target_kind: str) -> None:
@@ -758,14 +744,13 @@ class MochatChannel(BaseChannel):
                 "is_group": is_group, "group_id": last.group_id,
                 "sender_name": last.sender_name, "sender_username": last.sender_username,
                 "target_kind": target_kind, "was_mentioned": was_mentioned,
-                "buffered_count": len(entries),
+                "coalesced_count": len(entries),
             },
         )
 
     async def _cancel_delay_timers(self) -> None:
         for state in self._delay_states.values():
-            if state.timer:
-                state.timer.cancel()
+            state.cancel_timer()
         self._delay_states.clear()
 
     # ---- notify handlers ---------------------------------------------------
@@ -308,6 +308,29 @@ def _make_provider(config: Config):
     )
 
 
+def _make_usage_ledger(config: Config):
+    """Create the token usage ledger with the configured budgets."""
+    from nanobot.agent.usage import UsageLedger
+    from nanobot.config.loader import get_data_dir
+
+    return UsageLedger(
+        get_data_dir() / "usage",
+        session_daily_tokens=config.usage.session_daily_tokens,
+        daily_tokens=config.usage.daily_tokens,
+    )
+
+
+def _make_web_cache(config: Config):
+    """Create the web_fetch/web_search cache, or None when disabled."""
+    from nanobot.config.loader import get_data_dir
+    from nanobot.utils.http_cache import WebCache
+
+    cache = config.tools.web.cache
+    if not cache.enabled:
+        return None
+    return WebCache(get_data_dir() / "web_cache.db", max_bytes=cache.max_mb * 1024 * 1024)
+
+
 # ============================================================================
 # Gateway / Server
 # ============================================================================
@@ -317,16 +340,24 @@ def _make_provider(config: Config):
 def gateway(
     port: int = typer.Option(18790, "--port", "-p", help="Gateway port"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output"),
+    profile: bool = typer.Option(False, "--profile", help="Profile turns and event-loop lag; report on exit"),
 ):
     """Start the nanobot gateway."""
     from nanobot.config.loader import load_config, get_data_dir
     from nanobot.bus.queue import MessageBus
+    from nanobot.bus.wal import MessageLog
     from nanobot.agent.loop import AgentLoop
     from nanobot.channels.manager import ChannelManager
     from nanobot.session.manager import SessionManager
     from nanobot.cron.service import CronService
     from nanobot.cron.types import CronJob
     from nanobot.heartbeat.service import HeartbeatService
+    from nanobot.metrics import MetricsServer
+    from nanobot.profiling import LoopWatchdog, profiler
+    from nanobot.tracing import tracer
+    from nanobot.utils.atomic import set_durability
+    from nanobot.utils.http import close_http_clients
+    from nanobot.utils.offload import shutdown_offload
     
     if verbose:
         import logging
@@ -335,7 +366,19 @@ def gateway(
     console.print(f"{__logo__} Starting nanobot gateway on port {port}...")
     
     config = load_config()
-    bus = MessageBus()
+    set_durability(config.storage.durability)
+    tracer.configure(
+        enabled=config.tracing.enabled,
+        buffer_size=config.tracing.buffer_size,
+        export_path=get_data_dir() / "traces.jsonl" if config.tracing.export_jsonl else None,
+    )
+    bus = MessageBus(
+        starvation_limit=config.bus.starvation_limit,
+        coalesce_window_ms=config.bus.coalesce_window_ms,
+        coalesce_queued=config.bus.coalesce_queued,
+        outbound_per_chat=config.bus.outbound_per_chat,
+        log=MessageLog(get_data_dir() / "bus.db") if config.bus.durable else None,
+    )
     provider = _make_provider(config)
     session_manager = SessionManager(config.workspace_path)
     
@@ -359,12 +402,16 @@ def gateway(
         restrict_to_workspace=config.tools.restrict_to_workspace,
         session_manager=session_manager,
         mcp_servers=config.tools.mcp_servers,
+        usage_ledger=_make_usage_ledger(config),
+        admins=config.gateway.admins,
+        web_cache=_make_web_cache(config),
+        tool_selection=config.tools.selection,
     )
     
     # Set cron callback (needs agent)
     async def on_cron_job(job: CronJob) -> str | None:
         """Execute a cron job through the agent."""
-        response = await agent.process_direct(
+        response = await agent.process_queued(
             job.payload.message,
             session_key=f"cron:{job.id}",
             channel=job.payload.channel or "cli",
@@ -383,7 +430,7 @@ def gateway(
     # Create heartbeat service
     async def on_heartbeat(prompt: str) -> str:
         """Execute heartbeat through the agent."""
-        return await agent.process_direct(prompt, session_key="heartbeat")
+        return await agent.process_queued(prompt, session_key="heartbeat")
     
     heartbeat = HeartbeatService(
         workspace=config.workspace_path,
@@ -406,22 +453,62 @@ def gateway(
     
     console.print(f"[green]✓[/green] Heartbeat: every 30m")
     
+    metrics_server = MetricsServer(config.gateway.metrics_host, port) if config.gateway.metrics else None
+    watchdog_ms = config.gateway.watchdog_ms or (200 if verbose else 0)
+    watchdog = LoopWatchdog(watchdog_ms / 1000) if watchdog_ms else None
+
     async def run():
+        # SIGINT/SIGTERM start a graceful shutdown: the in-flight turn finishes
+        # and queued replies are sent before channels close.
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop.set)
+            except NotImplementedError:  # Windows: Ctrl+C cancels run() instead
+                pass
+
+        if profile:
+            profiler.start(get_data_dir() / "profiles")
+        if watchdog:
+            watchdog.start()
+        bus.replay()
+        if metrics_server:
+            try:
+                await metrics_server.start()
+            except OSError as e:
+                console.print(f"[yellow]Warning: metrics endpoint disabled, cannot listen on "
+                              f"{metrics_server.host}:{port}: {e}[/yellow]")
+        await cron.start()
+        await heartbeat.start()
+        agent_task = asyncio.create_task(agent.run())
+        channels_task = asyncio.create_task(channels.start_all())
+        stop_task = asyncio.create_task(stop.wait())
         try:
-            await cron.start()
-            await heartbeat.start()
-            await asyncio.gather(
-                agent.run(),
-                channels.start_all(),
-            )
-        except KeyboardInterrupt:
-            console.print("\nShutting down...")
+            await asyncio.wait([agent_task, stop_task], return_when=asyncio.FIRST_COMPLETED)
         finally:
-            await agent.close_mcp()
+            console.print("\nShutting down...")
+            stop_task.cancel()
             heartbeat.stop()
             cron.stop()
-            agent.stop()
+            bus.stop()
+            if not await agent.shutdown(timeout=30):
+                agent_task.cancel()
+            await asyncio.gather(agent_task, return_exceptions=True)
+            if not agent_task.cancelled() and agent_task.exception():
+                console.print(f"[red]Agent loop failed: {agent_task.exception()}[/red]")
             await channels.stop_all()
+            channels_task.cancel()
+            if metrics_server:
+                await metrics_server.stop()
+            if report := await profiler.stop():
+                console.print(f"Profile written to {report}")
+            if watchdog:
+                await watchdog.stop()
+            await agent.close_mcp()
+            await agent.close_tools()
+            await close_http_clients()
+            shutdown_offload(wait=False)
     
     asyncio.run(run())
 
@@ -445,9 +532,12 @@ def agent(
     from nanobot.bus.queue import MessageBus
     from nanobot.agent.loop import AgentLoop
     from nanobot.cron.service import CronService
+    from nanobot.utils.atomic import set_durability
+    from nanobot.utils.http import close_http_clients
     from loguru import logger
     
     config = load_config()
+    set_durability(config.storage.durability)
     
     bus = MessageBus()
     provider = _make_provider(config)
@@ -475,6 +565,9 @@ def agent(
         cron_service=cron,
         restrict_to_workspace=config.tools.restrict_to_workspace,
         mcp_servers=config.tools.mcp_servers,
+        usage_ledger=_make_usage_ledger(config),
+        web_cache=_make_web_cache(config),
+        tool_selection=config.tools.selection,
     )
     
     # Show spinner when logs are off (no output to miss); skip when logs are on
@@ -492,6 +585,8 @@ def agent(
                 response = await agent_loop.process_direct(message, session_id)
             _print_agent_response(response, render_markdown=markdown)
             await agent_loop.close_mcp()
+            await agent_loop.close_tools()
+            await close_http_clients()
         
         asyncio.run(run_once())
     else:
@@ -534,6 +629,8 @@ def agent(
                         break
             finally:
                 await agent_loop.close_mcp()
+                await agent_loop.close_tools()
+                await close_http_clients()
         
         asyncio.run(run_interactive())
 
@@ -903,6 +1000,282 @@ def status():
                 console.print(f"{spec.label}: {'[green]✓[/green]' if has_key else '[dim]not set[/dim]'}")
 
 
+@app.command()
+def stats(
+    host: str = typer.Option("127.0.0.1", "--host", help="Gateway host"),
+    port: int = typer.Option(18790, "--port", "-p", help="Gateway port"),
+):
+    """Show latency and token metrics from a running gateway."""
+    import httpx
+
+    try:
+        data = httpx.get(f"http://{host}:{port}/stats", timeout=5.0).raise_for_status().json()
+    except httpx.HTTPError as e:
+        console.print(f"[red]Could not read stats from {host}:{port}: {e}[/red]")
+        console.print("Is the gateway running with gateway.metrics enabled?")
+        raise typer.Exit(1)
+
+    def _series(item: dict) -> str:
+        labels = ", ".join(f"{k}={v}" for k, v in item["labels"].items())
+        name = item["name"].removeprefix("nanobot_")
+        return f"{name} [dim]{labels}[/dim]" if labels else name
+
+    console.print(f"{__logo__} nanobot stats (uptime {data['uptime_s'] / 3600:.1f}h)\n")
+
+    table = Table(title="Latency (seconds)")
+    table.add_column("Span", style="cyan")
+    for col in ("Count", "Avg", "p50", "p95", "p99"):
+        table.add_column(col, justify="right")
+    for item in data["histograms"]:
+        table.add_row(
+            _series(item), str(item["count"]),
+            *(f"{item[k]:.3f}" for k in ("avg", "p50", "p95", "p99")),
+        )
+    console.print(table)
+
+    if data["counters"]:
+        table = Table(title="Counters")
+        table.add_column("Counter", style="cyan")
+        table.add_column("Value", justify="right")
+        for item in data["counters"]:
+            table.add_row(_series(item), f"{item['value']:g}")
+        console.print(table)
+
+
+@app.command()
+def bench(
+    sessions: int = typer.Option(10, "--sessions", "-s", help="Concurrent synthetic sessions"),
+    turns: int = typer.Option(5, "--turns", "-t", help="Messages per session"),
+    latency_ms: float = typer.Option(0.0, "--latency-ms", help="Mock LLM latency (median for lognormal)"),
+    jitter_ms: float = typer.Option(0.0, "--jitter-ms", help="Latency spread"),
+    distribution: str = typer.Option("fixed", "--distribution", help="fixed, uniform or lognormal"),
+    tool_rounds: int = typer.Option(1, "--tool-rounds", help="Tool-call rounds per turn"),
+    seed: int = typer.Option(0, "--seed", help="Random seed for latencies"),
+    guard: bool = typer.Option(False, "--guard", help="Time the exec command guard instead"),
+    as_json: bool = typer.Option(False, "--json", help="Print the result as JSON"),
+):
+    """Benchmark nanobot's own overhead with a mock LLM (no network needed)."""
+    import json
+
+    from loguru import logger
+
+    from nanobot.bench import bench_guard, run_bench
+    from nanobot.providers.mock import MockProvider
+
+    if guard:
+        result = bench_guard()
+        if as_json:
+            console.print_json(json.dumps(result.to_dict()))
+        else:
+            console.print(f"{__logo__} exec guard: {result.avg_us:.2f}µs per command "
+                          f"({result.commands} commands x {result.iterations}, {result.blocked} blocked)")
+        return
+
+    try:
+        provider = MockProvider(
+            tool_rounds=tool_rounds, latency_ms=latency_ms, jitter_ms=jitter_ms,
+            distribution=distribution, seed=seed,
+        )
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        raise typer.Exit(1)
+
+    logger.disable("nanobot")
+    result = asyncio.run(run_bench(sessions=sessions, turns=turns, provider=provider))
+
+    if as_json:
+        console.print_json(json.dumps(result.to_dict()))
+        return
+
+    console.print(f"{__logo__} nanobot bench: {sessions} sessions x {turns} turns, "
+                  f"{tool_rounds} tool round(s), mock latency {latency_ms:g}ms ({distribution})\n")
+    console.print(f"Messages:   {result.messages} in {result.wall_s:.2f}s ({result.throughput:.1f} msg/s)")
+    console.print(f"Latency:    p50 {result.p50_ms:.1f}ms  p95 {result.p95_ms:.1f}ms  "
+                  f"p99 {result.p99_ms:.1f}ms  max {result.max_ms:.1f}ms")
+    console.print(f"LLM calls:  {result.llm_calls}")
+    if result.peak_rss_mb is not None:
+        console.print(f"Peak RSS:   {result.peak_rss_mb:.1f} MB")
+
+    table = Table(title="Per-stage timing")
+    table.add_column("Stage", style="cyan")
+    for col in ("Count", "Avg ms", "p95 ms"):
+        table.add_column(col, justify="right")
+    for stage in result.stages:
+        labels = ", ".join(f"{k}={v}" for k, v in stage["labels"].items())
+        name = f"{stage['stage']} [dim]{labels}[/dim]" if labels else stage["stage"]
+        table.add_row(name, str(stage["count"]), f"{stage['avg_ms']:.2f}", f"{stage['p95_ms']:.2f}")
+    console.print(table)
+
+
+@app.command()
+def replay(
+    files: list[Path] = typer.Argument(None, help="Session files to replay (default: all saved sessions)"),
+    provider_name: str = typer.Option("recorded", "--provider", help="recorded (saved replies) or mock"),
+    max_turns: int = typer.Option(None, "--max-turns", help="Replay at most this many turns per session"),
+    as_json: bool = typer.Option(False, "--json", help="Print per-turn results as JSON"),
+):
+    """Replay saved sessions offline and report per-turn costs."""
+    import json
+
+    from loguru import logger
+
+    from nanobot.bench import replay_sessions
+    from nanobot.providers.mock import MockProvider
+
+    if provider_name not in ("recorded", "mock"):
+        console.print(f"[red]Unknown provider: {provider_name}[/red]")
+        raise typer.Exit(1)
+    paths = files or sorted((Path.home() / ".nanobot" / "sessions").glob("*.jsonl"))
+    missing = [p for p in paths if not p.exists()]
+    if missing or not paths:
+        console.print(f"[red]No session file at {missing[0]}[/red]" if missing else "No sessions to replay.")
+        raise typer.Exit(1)
+
+    logger.disable("nanobot")
+    provider = MockProvider() if provider_name == "mock" else None
+    result = asyncio.run(replay_sessions(paths, provider=provider, max_turns=max_turns))
+
+    if as_json:
+        console.print_json(json.dumps(result.to_dict()))
+        return
+
+    table = Table(title=f"Replay of {result.sessions} session(s), {provider_name} provider")
+    table.add_column("Session", style="cyan")
+    for col in ("Turn", "Turn ms", "Context ms", "Save ms", "Prompt tok", "History"):
+        table.add_column(col, justify="right")
+    for t in result.turns:
+        table.add_row(
+            t.session, str(t.turn), f"{t.turn_ms:.1f}", f"{t.context_build_ms:.2f}",
+            f"{t.save_ms:.2f}", f"{t.prompt_tokens:,}", str(t.history_messages),
+        )
+    console.print(table)
+    for session in dict.fromkeys(t.session for t in result.turns):
+        turns = [t for t in result.turns if t.session == session]
+        console.print(f"{session}: prompt {turns[0].prompt_tokens:,} -> {turns[-1].prompt_tokens:,} tokens "
+                      f"over {len(turns)} turn(s)")
+
+
+@app.command()
+def usage(
+    days: int = typer.Option(1, "--days", "-d", help="Number of days to include, ending today"),
+    by: str = typer.Option("session", "--by", "-b", help="Group by: session, channel, model or site"),
+):
+    """Show token usage from the usage ledger."""
+    from datetime import date, timedelta
+
+    from nanobot.agent.usage import read_usage
+    from nanobot.config.loader import get_data_dir, load_config
+
+    if by not in ("session", "channel", "model", "site"):
+        console.print(f"[red]Unknown grouping: {by}[/red]")
+        raise typer.Exit(1)
+
+    usage_dir = get_data_dir() / "usage"
+    totals: dict[str, list[int]] = {}
+    for offset in range(days):
+        day = (date.today() - timedelta(days=offset)).isoformat()
+        for entry in read_usage(usage_dir / f"{day}.jsonl"):
+            row = totals.setdefault(str(entry.get(by) or "-"), [0, 0, 0])
+            row[0] += 1
+            row[1] += entry.get("prompt_tokens", 0)
+            row[2] += entry.get("completion_tokens", 0)
+
+    if not totals:
+        console.print("No usage recorded.")
+        return
+
+    table = Table(title=f"Token usage, last {days} day(s), by {by}")
+    table.add_column(by.capitalize(), style="cyan")
+    for col in ("Calls", "Prompt", "Completion", "Total"):
+        table.add_column(col, justify="right")
+    for key, (calls, prompt, completion) in sorted(totals.items(), key=lambda kv: -(kv[1][1] + kv[1][2])):
+        table.add_row(key, f"{calls:,}", f"{prompt:,}", f"{completion:,}", f"{prompt + completion:,}")
+    console.print(table)
+
+    budgets = load_config().usage
+    if budgets.daily_tokens or budgets.session_daily_tokens:
+        console.print(
+            f"Budgets: {budgets.daily_tokens or 'unlimited'} tokens/day, "
+            f"{budgets.session_daily_tokens or 'unlimited'} tokens/session/day"
+        )
+
+
+@app.command()
+def traces(
+    limit: int = typer.Option(5, "--limit", "-n", help="Number of recent traces to show"),
+    trace_id: str = typer.Option(None, "--trace", "-t", help="Show only this trace (id prefix)"),
+    file: Path = typer.Option(None, "--file", "-f", help="Read spans from a traces.jsonl export instead of the gateway"),
+    host: str = typer.Option("127.0.0.1", "--host", help="Gateway host"),
+    port: int = typer.Option(18790, "--port", "-p", help="Gateway port"),
+):
+    """Show where recent turns spent their time."""
+    import json
+
+    from nanobot.tracing.tracer import group_traces
+
+    if file:
+        if not file.exists():
+            console.print(f"[red]No trace file at {file}[/red]")
+            raise typer.Exit(1)
+        spans = [json.loads(line) for line in file.read_text(encoding="utf-8").splitlines() if line.strip()]
+        if trace_id:
+            spans = [s for s in spans if s["trace_id"].startswith(trace_id)]
+        found = group_traces(spans, limit)
+    else:
+        import httpx
+        try:
+            found = httpx.get(
+                f"http://{host}:{port}/traces",
+                params={"limit": 1000 if trace_id else limit},
+                timeout=5.0,
+            ).raise_for_status().json()
+        except httpx.HTTPError as e:
+            console.print(f"[red]Could not read traces from {host}:{port}: {e}[/red]")
+            console.print("Is the gateway running? Use --file to read a traces.jsonl export.")
+            raise typer.Exit(1)
+        if trace_id:
+            found = [t for t in found if t[0]["trace_id"].startswith(trace_id)][:limit]
+
+    if not found:
+        console.print("No traces recorded yet.")
+        return
+
+    for spans in found:
+        console.print(_render_trace(spans))
+        console.print()
+
+
+def _render_trace(spans: list[dict]) -> Table:
+    """Render one trace as an indented span tree with start offsets and durations."""
+    start = min(s["start"] for s in spans)
+    end = max(s["end"] or s["start"] for s in spans)
+    children: dict[str | None, list[dict]] = {}
+    ids = {s["span_id"] for s in spans}
+    for s in spans:
+        parent = s["parent_id"] if s["parent_id"] in ids else None
+        children.setdefault(parent, []).append(s)
+
+    table = Table(title=f"trace {spans[0]['trace_id'][:16]}  ({(end - start) * 1000:.0f} ms)", title_justify="left")
+    table.add_column("Span", style="cyan")
+    table.add_column("Start ms", justify="right")
+    table.add_column("Duration ms", justify="right")
+    table.add_column("Details", style="dim")
+
+    def _add(span: dict, depth: int) -> None:
+        duration = ((span["end"] or span["start"]) - span["start"]) * 1000
+        name = ("  " * depth) + span["name"]
+        if span["status"] != "ok":
+            name += f" [red]({span['status']})[/red]"
+        details = ", ".join(f"{k}={v}" for k, v in span["attrs"].items())
+        table.add_row(name, f"{(span['start'] - start) * 1000:.0f}", f"{duration:.1f}", details[:80])
+        for child in children.get(span["span_id"], []):
+            _add(child, depth + 1)
+
+    for root in children.get(None, []):
+        _add(root, 0)
+    return table
+
+
 # ============================================================================
 # OAuth Login
 # ============================================================================
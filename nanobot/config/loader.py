@@ -4,6 +4,7 @@ import json
 from pathlib import Path
 
 from nanobot.config.schema import Config
+from nanobot.utils.atomic import atomic_write
 
 
 def get_config_path() -> Path:
@@ -55,8 +56,7 @@ def save_config(config: Config, config_path: Path | None = None) -> None:
 
     data = config.model_dump(by_alias=True)
 
-    with open(path, "w") as f:
-        json.dump(data, f, indent=2)
+    atomic_write(path, json.dumps(data, indent=2))
 
 
 def _migrate_config(data: dict) -> dict:
@@ -226,6 +226,35 @@ class GatewayConfig(Base):
 
     host: str = "0.0.0.0"
     port: int = 18790
+    metrics: bool = True  # Serve /metrics (Prometheus) and /stats on the gateway port
+    metrics_host: str = "127.0.0.1"  # Interface for the unauthenticated metrics endpoint (0.0.0.0 to expose it)
+    admins: list[str] = Field(default_factory=list)  # Sender IDs allowed to use admin commands (/profile)
+    watchdog_ms: int = 0  # Log the stack when the event loop blocks longer than this (0 = off; 200 with --verbose)
+
+
+class BusConfig(Base):
+    """Message bus scheduling configuration."""
+
+    starvation_limit: int = 8  # Max times a lower-priority lane is skipped before it is served
+    coalesce_queued: bool = True  # Merge chat messages into a same-session message still waiting in the queue
+    coalesce_window_ms: int = 0  # Hold chat messages this long to merge rapid-fire bursts (0 = off)
+    outbound_per_chat: bool = False  # One outbound sender per chat instead of per channel
+    durable: bool = False  # Log messages to ~/.nanobot/bus.db and replay unfinished ones on restart
+
+
+class UsageConfig(Base):
+    """Token budgets (0 = unlimited). Usage is logged to ~/.nanobot/usage/ either way."""
+
+    session_daily_tokens: int = 0  # Max tokens per chat session per day
+    daily_tokens: int = 0  # Max tokens per day across all sessions
+
+
+class TracingConfig(Base):
+    """Request tracing configuration."""
+
+    enabled: bool = True  # Keep recent spans in memory (served at /traces on the gateway port)
+    buffer_size: int = 2000  # Spans kept in memory
+    export_jsonl: bool = False  # Also append every span to ~/.nanobot/traces.jsonl
 
 
 class WebSearchConfig(Base):
@@ -235,16 +264,37 @@ class WebSearchConfig(Base):
     max_results: int = 5
 
 
+class WebCacheConfig(Base):
+    """On-disk cache for web_fetch pages and web_search results."""
+
+    enabled: bool = True
+    max_mb: int = 50  # Least recently used entries are evicted past this size
+
+
 class WebToolsConfig(Base):
     """Web tools configuration."""
 
     search: WebSearchConfig = Field(default_factory=WebSearchConfig)
+    cache: WebCacheConfig = Field(default_factory=WebCacheConfig)
 
 
 class ExecToolConfig(Base):
     """Shell exec tool configuration."""
 
     timeout: int = 60
+    persistent: bool = False  # Keep one bash process per chat, so cd/env/virtualenvs carry over
+    idle_timeout: int = 600  # Close a persistent shell after this many idle seconds
+    max_sessions: int = 8  # Most persistent shells at once; the least recently used is closed
+    progress_interval: int = 0  # Post the latest output line of a running command every N seconds (0 = off)
+    background_jobs: bool = True  # Let exec start background jobs (job_status/job_output/job_kill tools)
+
+
+class ToolSelectionConfig(Base):
+    """Per-turn tool subsetting configuration."""
+
+    enabled: bool = False  # Offer only the tools a turn looks like it needs, plus a load_tools meta-tool
+    max_tools: int = 8  # Keyword-matched tools offered on top of the core set
+    core: list[str] | None = None  # Tools always offered (default: file tools, exec, message, load_tools)
 
 
 class MCPServerConfig(Base):
@@ -263,6 +313,13 @@ class ToolsConfig(Base):
     exec: ExecToolConfig = Field(default_factory=ExecToolConfig)
     restrict_to_workspace: bool = False  # If true, restrict all tool access to workspace directory
     mcp_servers: dict[str, MCPServerConfig] = Field(default_factory=dict)
+    selection: ToolSelectionConfig = Field(default_factory=ToolSelectionConfig)
+
+
+class StorageConfig(Base):
+    """Local file storage configuration."""
+
+    durability: str = "file"  # none | file (fsync before rename) | full (also fsync the directory)
 
 
 class Config(BaseSettings):
@@ -272,7 +329,11 @@ class Config(BaseSettings):
     channels: ChannelsConfig = Field(default_factory=ChannelsConfig)
     providers: ProvidersConfig = Field(default_factory=ProvidersConfig)
     gateway: GatewayConfig = Field(default_factory=GatewayConfig)
+    bus: BusConfig = Field(default_factory=BusConfig)
+    tracing: TracingConfig = Field(default_factory=TracingConfig)
+    usage: UsageConfig = Field(default_factory=UsageConfig)
     tools: ToolsConfig = Field(default_factory=ToolsConfig)
+    storage: StorageConfig = Field(default_factory=StorageConfig)
 
     @property
     def workspace_path(self) -> Path:
@@ -11,6 +11,7 @@ from typing import Any, Callable, Coroutine
 from loguru import logger
 
 from nanobot.cron.types import CronJob, CronJobState, CronPayload, CronSchedule, CronStore
+from nanobot.utils.atomic import atomic_write
 
 
 def _now_ms() -> int:
@@ -148,7 +149,7 @@ class CronService:
             ]
         }
         
-        self.store_path.write_text(json.dumps(data, indent=2))
+        atomic_write(self.store_path, json.dumps(data, indent=2))
     
     async def start(self) -> None:
         """Start the cron service."""
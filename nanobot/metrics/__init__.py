@@ -0,0 +1,6 @@
+"""Runtime metrics: per-turn latency histograms and token counters."""
+
+from nanobot.metrics.registry import Histogram, MetricsRegistry, metrics
+from nanobot.metrics.server import MetricsServer
+
+__all__ = ["metrics", "MetricsRegistry", "Histogram", "MetricsServer"]
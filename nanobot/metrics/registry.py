@@ -0,0 +1,172 @@
+"""In-process counters and latency histograms."""
+
+import bisect
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator
+
+# Upper bounds (seconds) for latency histograms; +Inf is implicit.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# name -> (type, help). Metrics not listed here are still recorded, without help text.
+METRICS: dict[str, tuple[str, str]] = {
+    "nanobot_queue_wait_seconds": ("histogram", "Time an inbound message waited on the bus"),
+    "nanobot_turn_seconds": ("histogram", "Total time to handle one inbound message"),
+    "nanobot_context_build_seconds": ("histogram", "Time to build the prompt for a turn"),
+    "nanobot_llm_request_seconds": ("histogram", "LLM request latency"),
+    "nanobot_tool_seconds": ("histogram", "Tool execution time"),
+    "nanobot_session_save_seconds": ("histogram", "Time to persist a session"),
+    "nanobot_outbound_send_seconds": ("histogram", "Time for a channel to send one message"),
+    "nanobot_loop_lag_seconds": ("histogram", "How late the event loop ran a timer (profiling mode only)"),
+    "nanobot_llm_tokens_total": ("counter", "Tokens reported by the LLM provider"),
+    "nanobot_llm_requests_total": ("counter", "LLM requests made"),
+    "nanobot_tool_errors_total": ("counter", "Tool calls that returned an error"),
+    "nanobot_loop_blocked_total": ("counter", "Times the event loop was blocked past the watchdog threshold"),
+}
+
+Labels = tuple[tuple[str, str], ...]
+
+
+def _labels(labels: dict[str, object]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(labels: Labels, extra: tuple[str, str] | None = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+@dataclass
+class Histogram:
+    """Cumulative-bucket histogram, as exported by Prometheus."""
+    buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    counts: list[int] = field(default_factory=list)
+    total: float = 0.0
+    count: int = 0
+
+    def __post_init__(self) -> None:
+        if not self.counts:
+            self.counts = [0] * (len(self.buckets) + 1)
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by linear interpolation within its bucket."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if seen + n >= rank and n:
+                lower = self.buckets[i - 1] if i else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+                return lower + (upper - lower) * (rank - seen) / n
+            seen += n
+        return self.buckets[-1]
+
+
+class MetricsRegistry:
+    """
+    Process-wide metrics, keyed by name and label set.
+
+    Recording is a dict lookup and a few additions, cheap enough to leave on
+    in every turn. Export with `render()` (Prometheus text format) or
+    `snapshot()` (for `nanobot stats`).
+    """
+
+    def __init__(self):
+        self.histograms: dict[str, dict[Labels, Histogram]] = {}
+        self.counters: dict[str, dict[Labels, float]] = {}
+        self.started_at = time.time()
+
+    def observe(self, name: str, value: float, **labels: object) -> None:
+        """Record one observation in a histogram."""
+        series = self.histograms.setdefault(name, {})
+        key = _labels(labels)
+        hist = series.get(key)
+        if hist is None:
+            hist = series[key] = Histogram()
+        hist.observe(value)
+
+    def inc(self, name: str, amount: float = 1, **labels: object) -> None:
+        """Add to a counter."""
+        series = self.counters.setdefault(name, {})
+        key = _labels(labels)
+        series[key] = series.get(key, 0) + amount
+
+    @contextmanager
+    def timer(self, name: str, **labels: object) -> Iterator[None]:
+        """Observe the wall time of the enclosed block, even if it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def reset(self) -> None:
+        """Drop everything recorded so far."""
+        self.histograms.clear()
+        self.counters.clear()
+        self.started_at = time.time()
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines: list[str] = []
+        for name in sorted(self.counters):
+            self._header(lines, name, "counter")
+            for labels, value in sorted(self.counters[name].items()):
+                lines.append(f"{name}{_format_labels(labels)} {value:g}")
+        for name in sorted(self.histograms):
+            self._header(lines, name, "histogram")
+            for labels, hist in sorted(self.histograms[name].items()):
+                cumulative = 0
+                for bound, n in zip(hist.buckets + (float("inf"),), hist.counts):
+                    cumulative += n
+                    le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                    lines.append(f"{name}_bucket{_format_labels(labels, ('le', le))} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {hist.total:.6f}")
+                lines.append(f"{name}_count{_format_labels(labels)} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _header(lines: list[str], name: str, kind: str) -> None:
+        help_text = METRICS.get(name, (kind, ""))[1]
+        if help_text:
+            lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    def snapshot(self) -> dict:
+        """Summarise every series as plain data: counts, averages and p50/p95/p99."""
+        histograms = [
+            {
+                "name": name,
+                "labels": dict(labels),
+                "count": hist.count,
+                "avg": hist.total / hist.count if hist.count else 0.0,
+                "p50": hist.quantile(0.5),
+                "p95": hist.quantile(0.95),
+                "p99": hist.quantile(0.99),
+            }
+            for name in sorted(self.histograms)
+            for labels, hist in sorted(self.histograms[name].items())
+        ]
+        counters = [
+            {"name": name, "labels": dict(labels), "value": value}
+            for name in sorted(self.counters)
+            for labels, value in sorted(self.counters[name].items())
+        ]
+        return {
+            "uptime_s": time.time() - self.started_at,
+            "histograms": histograms,
+            "counters": counters,
+        }
+
+
+metrics = MetricsRegistry()
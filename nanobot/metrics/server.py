@@ -0,0 +1,93 @@
+"""Minimal HTTP endpoint serving metrics from the gateway port."""
+
+import asyncio
+import ipaddress
+import json
+from urllib.parse import parse_qs
+
+from loguru import logger
+
+from nanobot.metrics.registry import MetricsRegistry
+from nanobot.metrics.registry import metrics as default_registry
+from nanobot.tracing import Tracer
+from nanobot.tracing import tracer as default_tracer
+
+_STATUS = {200: "OK", 404: "Not Found", 405: "Method Not Allowed"}
+
+
+def _is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class MetricsServer:
+    """
+    Serve `GET /metrics` (Prometheus text format), `GET /stats` (JSON, read
+    by `nanobot stats`) and `GET /traces?limit=N` (recent spans, read by
+    `nanobot traces`).
+
+    Deliberately tiny: one request per connection, no keep-alive, no
+    dependencies beyond asyncio.
+
+    Spans carry session and chat ids and error text, so /traces is only
+    served while tracing is enabled and the server listens on loopback.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        registry: MetricsRegistry | None = None,
+        tracer: Tracer | None = None,
+    ):
+        self.host = host
+        self.port = port
+        self.registry = registry or default_registry
+        self.tracer = tracer or default_tracer
+        self._server: asyncio.AbstractServer | None = None
+
+    async def start(self) -> None:
+        """Start listening."""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        if not self.port:
+            self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"Metrics endpoint on http://{self.host}:{self.port}/metrics")
+
+    async def stop(self) -> None:
+        """Stop listening."""
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout=5.0)
+            method, path, *_ = request.split(b"\r\n", 1)[0].decode("latin-1").split(" ")
+            path, _, query = path.partition("?")
+            if method != "GET":
+                status, ctype, body = 405, "text/plain", "method not allowed\n"
+            elif path == "/metrics":
+                status, ctype, body = 200, "text/plain; version=0.0.4", self.registry.render()
+            elif path == "/stats":
+                status, ctype, body = 200, "application/json", json.dumps(self.registry.snapshot())
+            elif path == "/traces" and self.tracer.enabled and _is_loopback(self.host):
+                limit = int(parse_qs(query).get("limit", ["20"])[0])
+                status, ctype, body = 200, "application/json", json.dumps(self.tracer.traces(limit), default=str)
+            else:
+                status, ctype, body = 404, "text/plain", "not found\n"
+            payload = body.encode()
+            writer.write(
+                f"HTTP/1.1 {status} {_STATUS[status]}\r\n"
+                f"Content-Type: {ctype}\r\nContent-Length: {len(payload)}\r\n"
+                "Connection: close\r\n\r\n".encode() + payload
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError, ConnectionError):
+            pass
+        finally:
+            writer.close()
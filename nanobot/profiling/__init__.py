@@ -0,0 +1,6 @@
+"""Profiling: cProfile around turns and tools, event-loop lag and blocking."""
+
+from nanobot.profiling.profiler import Profiler, profiler
+from nanobot.profiling.watchdog import LoopWatchdog
+
+__all__ = ["profiler", "Profiler", "LoopWatchdog"]
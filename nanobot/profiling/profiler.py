@@ -0,0 +1,192 @@
+"""Opt-in cProfile sampling and event-loop lag tracking for the gateway."""
+
+import asyncio
+import cProfile
+import io
+import logging
+import pstats
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator
+
+from loguru import logger
+
+from nanobot.metrics import Histogram, metrics
+
+DEFAULT_LAG_INTERVAL_S = 0.1
+DEFAULT_STALL_THRESHOLD_S = 0.1
+MAX_STALLS = 200
+TOP_FUNCTIONS = 40
+
+
+class _SlowCallbackHandler(logging.Handler):
+    """Collects asyncio debug-mode "Executing <Handle ...> took N seconds" warnings."""
+
+    def __init__(self, sink: deque):
+        super().__init__(logging.WARNING)
+        self.sink = sink
+
+    def emit(self, record: logging.LogRecord) -> None:
+        message = record.getMessage()
+        if message.startswith("Executing "):
+            self.sink.append({"ts": record.created, "source": message})
+
+
+class Profiler:
+    """
+    Profiles turns and tool calls while switched on, and watches loop lag.
+
+    cProfile only runs while at least one `section()` is open, so an idle
+    gateway costs nothing; code from other tasks that runs while a turn is
+    awaiting is included, which is how blocking calls in channels show up.
+    A watchdog task measures how late the event loop wakes it, and asyncio
+    debug mode names the callbacks that held the loop longer than
+    `stall_threshold_s`. `stop()` writes a report to the output directory.
+    """
+
+    def __init__(
+        self,
+        lag_interval_s: float = DEFAULT_LAG_INTERVAL_S,
+        stall_threshold_s: float = DEFAULT_STALL_THRESHOLD_S,
+    ):
+        self.lag_interval_s = lag_interval_s
+        self.stall_threshold_s = stall_threshold_s
+        self.output_dir: Path | None = None
+        self.started_at: float | None = None
+        self._profile: cProfile.Profile | None = None
+        self._depth = 0
+        self._lag = Histogram()
+        self._stalls: deque[dict] = deque(maxlen=MAX_STALLS)
+        self._slow_callbacks: deque[dict] = deque(maxlen=MAX_STALLS)
+        self._watchdog: asyncio.Task | None = None
+        self._handler: _SlowCallbackHandler | None = None
+        self._loop_debug: tuple[bool, float] | None = None
+
+    @property
+    def active(self) -> bool:
+        return self._profile is not None
+
+    def start(self, output_dir: Path) -> None:
+        """Start profiling. Must be called from the running event loop."""
+        if self.active:
+            return
+        loop = asyncio.get_running_loop()
+        self.output_dir = output_dir
+        self.started_at = time.time()
+        self._profile = cProfile.Profile()
+        self._depth = 0
+        self._lag = Histogram()
+        self._stalls.clear()
+        self._slow_callbacks.clear()
+
+        self._loop_debug = (loop.get_debug(), loop.slow_callback_duration)
+        loop.set_debug(True)
+        loop.slow_callback_duration = self.stall_threshold_s
+        self._handler = _SlowCallbackHandler(self._slow_callbacks)
+        logging.getLogger("asyncio").addHandler(self._handler)
+        self._watchdog = asyncio.create_task(self._watch_lag())
+        logger.info(f"Profiler started; reports go to {output_dir}")
+
+    async def stop(self) -> Path | None:
+        """Stop profiling and write the report. Returns its path."""
+        if not self.active:
+            return None
+        if self._watchdog:
+            self._watchdog.cancel()
+            await asyncio.gather(self._watchdog, return_exceptions=True)
+            self._watchdog = None
+        if self._handler:
+            logging.getLogger("asyncio").removeHandler(self._handler)
+            self._handler = None
+        if self._loop_debug:
+            loop = asyncio.get_running_loop()
+            loop.set_debug(self._loop_debug[0])
+            loop.slow_callback_duration = self._loop_debug[1]
+            self._loop_debug = None
+        if self._depth:
+            self._profile.disable()
+        profile, self._profile = self._profile, None
+        try:
+            path = self._write_report(profile)
+        except OSError as e:
+            logger.error(f"Profiler: failed to write report: {e}")
+            return None
+        logger.info(f"Profiler report written to {path}")
+        return path
+
+    @contextmanager
+    def section(self) -> Iterator[None]:
+        """Profile the enclosed block (a turn or a tool call) while active."""
+        profile = self._profile
+        if profile is None:
+            yield
+            return
+        self._depth += 1
+        if self._depth == 1:
+            profile.enable()
+        try:
+            yield
+        finally:
+            # stop() may have run meanwhile; the profile is gone then.
+            if self._profile is profile:
+                self._depth -= 1
+                if self._depth == 0:
+                    profile.disable()
+
+    async def _watch_lag(self) -> None:
+        """Sleep a fixed interval and record how late the loop woke us up."""
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.lag_interval_s)
+            lag = max(0.0, time.perf_counter() - start - self.lag_interval_s)
+            self._lag.observe(lag)
+            metrics.observe("nanobot_loop_lag_seconds", lag)
+            if lag >= self.stall_threshold_s:
+                self._stalls.append({"ts": time.time(), "lag_ms": lag * 1000})
+
+    def status(self) -> str:
+        """One-line summary for the /profile command."""
+        if not self.active:
+            return "Profiler is off."
+        elapsed = time.time() - (self.started_at or time.time())
+        return (
+            f"Profiler on for {elapsed:.0f}s: loop lag p99 {self._lag.quantile(0.99) * 1000:.1f}ms, "
+            f"{len(self._stalls)} stall(s) over {self.stall_threshold_s * 1000:.0f}ms."
+        )
+
+    def _write_report(self, profile: cProfile.Profile) -> Path:
+        """Write `<stamp>.prof` (for snakeviz/pstats) and a readable `<stamp>.txt`."""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        profile.dump_stats(self.output_dir / f"profile-{stamp}.prof")
+
+        out = io.StringIO()
+        duration = time.time() - (self.started_at or time.time())
+        out.write(f"nanobot profile, {duration:.1f}s\n\n")
+        out.write("== Event loop lag ==\n")
+        out.write(
+            f"samples {self._lag.count}, avg {self._lag.total / max(self._lag.count, 1) * 1000:.1f}ms, "
+            f"p99 {self._lag.quantile(0.99) * 1000:.1f}ms\n"
+        )
+        for stall in self._stalls:
+            when = datetime.fromtimestamp(stall["ts"]).strftime("%H:%M:%S")
+            out.write(f"  {when}  stalled {stall['lag_ms']:.0f}ms\n")
+        out.write("\n== Slow callbacks ==\n")
+        for cb in self._slow_callbacks:
+            when = datetime.fromtimestamp(cb["ts"]).strftime("%H:%M:%S")
+            out.write(f"  {when}  {cb['source']}\n")
+        out.write(f"\n== Top {TOP_FUNCTIONS} functions by cumulative time ==\n")
+        try:
+            pstats.Stats(profile, stream=out).sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+        except TypeError:  # nothing was profiled
+            out.write("  (no turns or tool calls ran while profiling)\n")
+
+        path = self.output_dir / f"profile-{stamp}.txt"
+        path.write_text(out.getvalue(), encoding="utf-8")
+        return path
+
+
+profiler = Profiler()
@@ -0,0 +1,77 @@
+"""Detect and locate event-loop blocking while it happens."""
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+
+from loguru import logger
+
+from nanobot.metrics import metrics
+
+DEFAULT_THRESHOLD_S = 0.2
+STACK_DEPTH = 12
+
+
+class LoopWatchdog:
+    """
+    Logs where the event loop is stuck whenever it blocks past a threshold.
+
+    A task on the loop stamps a heartbeat; a daemon thread checks it. When
+    the heartbeat is older than `threshold_s`, the thread captures the loop
+    thread's current stack, i.e. the code doing the blocking, and logs it
+    once per stall. Unlike asyncio debug mode it costs next to nothing, so
+    it can stay on in production.
+    """
+
+    def __init__(self, threshold_s: float = DEFAULT_THRESHOLD_S):
+        self.threshold_s = threshold_s
+        self.stalls = 0
+        self.last_stack = ""
+        self._beat = 0.0
+        self._loop_thread: int | None = None
+        self._task: asyncio.Task | None = None
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    def start(self) -> None:
+        """Start watching the running loop."""
+        if self._thread:
+            return
+        self._loop_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._watch, name="nanobot-watchdog", daemon=True)
+        self._thread.start()
+        logger.info(f"Loop watchdog on: reporting blocks over {self.threshold_s * 1000:.0f}ms")
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._thread:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    async def _heartbeat(self) -> None:
+        while True:
+            self._beat = time.monotonic()
+            await asyncio.sleep(self.threshold_s / 2)
+
+    def _watch(self) -> None:
+        reported = None
+        while not self._stop.wait(self.threshold_s / 4):
+            beat = self._beat
+            blocked = time.monotonic() - beat
+            if blocked < self.threshold_s or beat == reported:
+                continue
+            reported = beat
+            frame = sys._current_frames().get(self._loop_thread)
+            self.last_stack = "".join(traceback.format_stack(frame, limit=STACK_DEPTH)) if frame else ""
+            self.stalls += 1
+            metrics.inc("nanobot_loop_blocked_total")
+            logger.warning(f"Event loop blocked for over {blocked * 1000:.0f}ms at:\n{self.last_stack}")
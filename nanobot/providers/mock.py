@@ -0,0 +1,100 @@
+"""Deterministic offline LLM provider for benchmarks and tests."""
+
+import asyncio
+import json
+import random
+from typing import Any
+
+from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+
+
+class MockProvider(LLMProvider):
+    """
+    Scripted LLM stand-in: no network, reproducible for a given seed.
+
+    Each turn makes `tool_rounds` rounds of tool calls (one call to every
+    entry of `tool_calls` per round) and then replies with `reply`. The
+    round is derived from the conversation itself, so one instance can serve
+    many sessions concurrently.
+
+    Latency is drawn per call: "fixed" (`latency_ms`), "uniform"
+    (`latency_ms` ± `jitter_ms`) or "lognormal" (median `latency_ms`,
+    spread `jitter_ms`), which is the closest to real provider tails.
+    """
+
+    def __init__(
+        self,
+        reply: str = "Done.",
+        tool_calls: list[tuple[str, dict[str, Any]]] | None = None,
+        tool_rounds: int = 0,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        distribution: str = "fixed",
+        seed: int = 0,
+    ):
+        super().__init__()
+        if distribution not in ("fixed", "uniform", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {distribution}")
+        self.reply = reply
+        self.tool_calls = tool_calls or [("list_dir", {"path": "."})]
+        self.tool_rounds = tool_rounds
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.distribution = distribution
+        self._rng = random.Random(seed)
+        self.calls = 0
+
+    def _latency(self) -> float:
+        """Seconds to wait for this call."""
+        if self.distribution == "uniform":
+            ms = self._rng.uniform(self.latency_ms - self.jitter_ms, self.latency_ms + self.jitter_ms)
+        elif self.distribution == "lognormal" and self.latency_ms > 0:
+            sigma = self.jitter_ms / self.latency_ms if self.jitter_ms else 0.0
+            ms = self.latency_ms * self._rng.lognormvariate(0.0, sigma)
+        else:
+            ms = self.latency_ms
+        return max(0.0, ms) / 1000
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        self.calls += 1
+        delay = self._latency()
+        if delay:
+            await asyncio.sleep(delay)
+
+        # Rounds already made in this turn: assistant tool-call messages
+        # after the last real user message (the loop's "Reflect..." nudges
+        # are user messages too, so count from the end).
+        done = 0
+        for m in reversed(messages):
+            if m.get("role") == "assistant" and m.get("tool_calls"):
+                done += 1
+            elif m.get("role") == "user" and not str(m.get("content", "")).startswith("Reflect on the results"):
+                break
+
+        usage = {
+            "prompt_tokens": len(json.dumps(messages, default=str)) // 4,
+            "completion_tokens": len(self.reply) // 4 + 1,
+        }
+        available = {t.get("function", {}).get("name") for t in tools or []}
+        calls = [(name, args) for name, args in self.tool_calls if name in available]
+        if done < self.tool_rounds and calls:
+            return LLMResponse(
+                content=None,
+                tool_calls=[
+                    ToolCallRequest(id=f"call_{self.calls}_{i}", name=name, arguments=dict(args))
+                    for i, (name, args) in enumerate(calls)
+                ],
+                finish_reason="tool_calls",
+                usage=usage,
+            )
+        return LLMResponse(content=self.reply, usage=usage)
+
+    def get_default_model(self) -> str:
+        return "mock"
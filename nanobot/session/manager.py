@@ -1,5 +1,6 @@
 """Session management for conversation history."""
 
+import asyncio
 import json
 from pathlib import Path
 from dataclasses import dataclass, field
@@ -8,7 +9,9 @@ from typing import Any
 
 from loguru import logger
 
+from nanobot.utils.atomic import atomic_open
 from nanobot.utils.helpers import ensure_dir, safe_filename
+from nanobot.utils.offload import run_blocking
 
 
 @dataclass
@@ -59,10 +62,11 @@ class SessionManager:
     Sessions are stored as JSONL files in the sessions directory.
     """
 
-    def __init__(self, workspace: Path):
+    def __init__(self, workspace: Path, sessions_dir: Path | None = None):
         self.workspace = workspace
-        self.sessions_dir = ensure_dir(Path.home() / ".nanobot" / "sessions")
+        self.sessions_dir = ensure_dir(sessions_dir or Path.home() / ".nanobot" / "sessions")
         self._cache: dict[str, Session] = {}
+        self._save_locks: dict[str, asyncio.Lock] = {}
     
     def _get_session_path(self, key: str) -> Path:
         """Get the file path for a session."""
@@ -89,6 +93,14 @@ class SessionManager:
         self._cache[key] = session
         return session
     
+    async def get_or_create_async(self, key: str) -> Session:
+        """Like get_or_create, but reads the file in the offload pool."""
+        if key in self._cache:
+            return self._cache[key]
+        session = await run_blocking(self._load, key) or Session(key=key)
+        # Another caller may have loaded the same key meanwhile; keep theirs.
+        return self._cache.setdefault(key, session)
+
     def _load(self, key: str) -> Session | None:
         """Load a session from disk."""
         path = self._get_session_path(key)
@@ -130,21 +142,40 @@ class SessionManager:
     
     def save(self, session: Session) -> None:
         """Save a session to disk."""
-        path = self._get_session_path(session.key)
+        self._write(self._get_session_path(session.key), self._snapshot(session))
+        self._cache[session.key] = session
 
-        with open(path, "w") as f:
-            metadata_line = {
-                "_type": "metadata",
-                "created_at": session.created_at.isoformat(),
-                "updated_at": session.updated_at.isoformat(),
-                "metadata": session.metadata,
-                "last_consolidated": session.last_consolidated
-            }
-            f.write(json.dumps(metadata_line) + "\n")
-            for msg in session.messages:
-                f.write(json.dumps(msg) + "\n")
+    async def save_async(self, session: Session) -> None:
+        """
+        Like save, but serializes and writes in the offload pool.
 
+        The session is snapshotted first, so it can keep changing while the
+        write runs. Saves of the same session are written in call order.
+        """
+        path = self._get_session_path(session.key)
+        lines = self._snapshot(session)
         self._cache[session.key] = session
+        lock = self._save_locks.setdefault(session.key, asyncio.Lock())
+        async with lock:
+            await run_blocking(self._write, path, lines)
+
+    @staticmethod
+    def _snapshot(session: Session) -> list[dict[str, Any]]:
+        """The metadata line and messages to write, decoupled from the live session."""
+        metadata_line = {
+            "_type": "metadata",
+            "created_at": session.created_at.isoformat(),
+            "updated_at": session.updated_at.isoformat(),
+            "metadata": dict(session.metadata),
+            "last_consolidated": session.last_consolidated
+        }
+        return [metadata_line, *session.messages]
+
+    @staticmethod
+    def _write(path: Path, lines: list[dict[str, Any]]) -> None:
+        with atomic_open(path) as f:
+            for line in lines:
+                f.write(json.dumps(line) + "\n")
     
     def invalidate(self, key: str) -> None:
         """Remove a session from the in-memory cache."""
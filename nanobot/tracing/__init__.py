@@ -0,0 +1,5 @@
+"""Request tracing: spans for each hop a message takes through nanobot."""
+
+from nanobot.tracing.tracer import TRACE_KEY, Span, Tracer, tracer
+
+__all__ = ["tracer", "Tracer", "Span", "TRACE_KEY"]
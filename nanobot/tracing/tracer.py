@@ -0,0 +1,172 @@
+"""Lightweight spans with trace context carried in bus message metadata."""
+
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Iterator
+
+from loguru import logger
+
+# Metadata key carrying {"trace_id", "span_id"} from one hop to the next.
+TRACE_KEY = "_trace"
+
+DEFAULT_BUFFER_SIZE = 2000
+
+
+def _new_id(nbytes: int) -> str:
+    return os.urandom(nbytes).hex()
+
+
+@dataclass
+class Span:
+    """One timed hop of a trace. Times are epoch seconds."""
+    name: str
+    trace_id: str
+    span_id: str = field(default_factory=lambda: _new_id(8))
+    parent_id: str | None = None
+    start: float = field(default_factory=time.time)
+    end: float | None = None
+    status: str = "ok"
+    attrs: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end or time.time()) - self.start) * 1000
+
+    def context(self) -> dict[str, str]:
+        """Trace context to propagate to child hops."""
+        return {"trace_id": self.trace_id, "span_id": self.span_id}
+
+
+_current: ContextVar[Span | None] = ContextVar("nanobot_current_span", default=None)
+
+
+class Tracer:
+    """
+    Records spans into an in-process ring buffer and, optionally, a JSONL file.
+
+    The active span lives in a context variable, so spans opened inside it
+    (also across awaits in the same task) become its children. Crossing the
+    bus, the context travels in message metadata under TRACE_KEY: `inject()`
+    stamps it on the way in, `span(..., parent=metadata)` picks it up.
+    """
+
+    def __init__(self, buffer_size: int = DEFAULT_BUFFER_SIZE, enabled: bool = True):
+        self.enabled = enabled
+        self.spans: deque[Span] = deque(maxlen=buffer_size)
+        self.export_path: Path | None = None
+        self._export = None
+
+    def configure(self, enabled: bool = True, buffer_size: int | None = None,
+                  export_path: Path | None = None) -> None:
+        """Apply settings; `export_path` appends every finished span as a JSON line."""
+        self.enabled = enabled
+        if buffer_size and buffer_size != self.spans.maxlen:
+            self.spans = deque(self.spans, maxlen=buffer_size)
+        if self._export:
+            self._export.close()
+            self._export = None
+        self.export_path = export_path
+        if export_path and enabled:
+            export_path.parent.mkdir(parents=True, exist_ok=True)
+            self._export = open(export_path, "a", encoding="utf-8", buffering=1)
+
+    @contextmanager
+    def span(self, name: str, parent: dict[str, Any] | None = None, **attrs: Any) -> Iterator[Span | None]:
+        """
+        Time the enclosed block as a span.
+
+        The parent is the active span, or else the context found in `parent`
+        (message metadata); with neither, a new trace starts.
+        """
+        if not self.enabled:
+            yield None
+            return
+        ctx = self._parent_context(parent)
+        span = Span(
+            name=name,
+            trace_id=ctx["trace_id"] if ctx else _new_id(16),
+            parent_id=ctx["span_id"] if ctx else None,
+            attrs=attrs,
+        )
+        token = _current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = "cancelled" if isinstance(e, asyncio.CancelledError) else "error"
+            span.attrs["error"] = str(e) or type(e).__name__
+            raise
+        finally:
+            _current.reset(token)
+            self.finish(span)
+
+    def record(self, name: str, start: float, end: float | None = None,
+               parent: dict[str, Any] | None = None, **attrs: Any) -> None:
+        """Record a span that has already happened, e.g. time spent queued."""
+        if not self.enabled:
+            return
+        ctx = self._parent_context(parent)
+        self.finish(Span(
+            name=name,
+            trace_id=ctx["trace_id"] if ctx else _new_id(16),
+            parent_id=ctx["span_id"] if ctx else None,
+            start=start,
+            attrs=attrs,
+        ), end=end)
+
+    def inject(self, metadata: dict[str, Any]) -> dict[str, Any]:
+        """
+        Return metadata carrying trace context, for a message about to cross
+        the bus: the active span's, else any context already present (e.g.
+        passed through from the inbound message), else a new trace.
+        """
+        if not self.enabled:
+            return metadata
+        span = _current.get()
+        if span:
+            return {**metadata, TRACE_KEY: span.context()}
+        if TRACE_KEY in metadata:
+            return metadata
+        return {**metadata, TRACE_KEY: {"trace_id": _new_id(16), "span_id": None}}
+
+    def finish(self, span: Span, end: float | None = None) -> None:
+        span.end = end or time.time()
+        self.spans.append(span)
+        if self._export:
+            try:
+                self._export.write(json.dumps(asdict(span), ensure_ascii=False, default=str) + "\n")
+            except (OSError, ValueError) as e:
+                logger.warning(f"Tracing: export to {self.export_path} failed, disabling: {e}")
+                self._export = None
+
+    def traces(self, limit: int = 20) -> list[list[dict[str, Any]]]:
+        """The most recent traces, newest first, each a list of span dicts in start order."""
+        return group_traces([asdict(s) for s in self.spans], limit)
+
+    @staticmethod
+    def _parent_context(parent: dict[str, Any] | None) -> dict[str, Any] | None:
+        span = _current.get()
+        if span:
+            return span.context()
+        ctx = (parent or {}).get(TRACE_KEY)
+        if isinstance(ctx, dict) and ctx.get("trace_id"):
+            return ctx
+        return None
+
+
+def group_traces(spans: list[dict[str, Any]], limit: int = 20) -> list[list[dict[str, Any]]]:
+    """Group span dicts by trace, most recently finished trace first."""
+    by_trace: dict[str, list[dict[str, Any]]] = {}
+    for span in spans:
+        by_trace.setdefault(span["trace_id"], []).append(span)
+    ordered = sorted(by_trace.values(), key=lambda t: max(s["end"] or 0 for s in t), reverse=True)
+    return [sorted(t, key=lambda s: s["start"]) for t in ordered[:limit]]
+
+
+tracer = Tracer()
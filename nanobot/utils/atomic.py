@@ -0,0 +1,144 @@
+"""Crash-safe file writes: temp file, fsync, rename."""
+
+import hashlib
+import os
+import secrets
+import stat
+import tempfile
+import threading
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import IO, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, writes are still atomic
+    fcntl = None
+
+# How hard writes try to survive a crash:
+#   "none" - atomic rename only; a power loss may lose the latest write
+#   "file" - fsync the data before the rename (default)
+#   "full" - also fsync the directory, so the rename itself is durable
+DURABILITY_LEVELS = ("none", "file", "full")
+_durability = "file"
+
+_LOCK_DIR = Path(tempfile.gettempdir()) / "nanobot-locks"
+_thread_locks: dict[str, threading.Lock] = {}
+_thread_locks_guard = threading.Lock()
+
+
+def set_durability(level: str) -> None:
+    """Set the process-wide default durability level."""
+    global _durability
+    if level not in DURABILITY_LEVELS:
+        raise ValueError(f"Unknown durability level {level!r}; expected one of {', '.join(DURABILITY_LEVELS)}")
+    _durability = level
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """
+    Exclusive advisory lock for `path`, across threads and processes.
+
+    Held on a separate lock file in the temp directory, so the target can
+    be replaced while locked and no lock files are left next to it. Only
+    other users of file_lock are excluded.
+    """
+    path = Path(os.path.realpath(path))
+    with _thread_locks_guard:
+        thread_lock = _thread_locks.setdefault(str(path), threading.Lock())
+    with thread_lock:
+        if fcntl is None:
+            yield
+            return
+        _LOCK_DIR.mkdir(parents=True, exist_ok=True)
+        lock_name = hashlib.sha1(str(path).encode()).hexdigest() + ".lock"
+        with open(_LOCK_DIR / lock_name, "a") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _create_temp(directory: Path, name: str) -> tuple[int, str]:
+    """
+    Create a new temp file next to `name`, like mkstemp but mode 0o666.
+
+    The kernel then applies the current umask, so a new target gets the
+    usual permissions (mkstemp would make it 0600) without reading or
+    changing the process-wide umask.
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    while True:
+        tmp = os.path.join(directory, f".{name}.{secrets.token_hex(6)}.tmp")
+        try:
+            return os.open(tmp, flags, 0o666), tmp
+        except FileExistsError:
+            continue
+
+
+@contextmanager
+def atomic_open(
+    path: Path,
+    mode: str = "w",
+    encoding: str | None = "utf-8",
+    durability: str | None = None,
+    lock: bool = False,
+) -> Iterator[IO]:
+    """
+    Open a temporary file that replaces `path` when the block exits cleanly.
+
+    Readers see either the old or the new contents, never a partial file,
+    and concurrent writers cannot interleave: the last rename wins. If the
+    block raises, `path` is left untouched. Symlinks are written through.
+    """
+    if mode not in ("w", "wb"):
+        raise ValueError(f"atomic_open supports 'w' and 'wb', got {mode!r}")
+    level = durability or _durability
+    path = Path(os.path.realpath(path))
+    with file_lock(path) if lock else nullcontext():
+        fd, tmp = _create_temp(path.parent, path.name)
+        try:
+            with os.fdopen(fd, mode, encoding=None if "b" in mode else encoding) as f:
+                yield f
+                f.flush()
+                if level != "none":
+                    os.fsync(f.fileno())
+            try:
+                os.chmod(tmp, stat.S_IMODE(os.stat(path).st_mode))
+            except FileNotFoundError:
+                pass  # new file: keeps the umask-derived mode it was created with
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except FileNotFoundError:
+                pass
+            raise
+        if level == "full":
+            _fsync_dir(path.parent)
+
+
+def atomic_write(
+    path: Path,
+    data: str | bytes,
+    encoding: str = "utf-8",
+    durability: str | None = None,
+    lock: bool = False,
+) -> None:
+    """Write `data` to `path` atomically; see atomic_open."""
+    mode = "wb" if isinstance(data, bytes) else "w"
+    with atomic_open(path, mode, encoding=encoding, durability=durability, lock=lock) as f:
+        f.write(data)
+
+
+def _fsync_dir(directory: Path) -> None:
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:  # not supported on this platform
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
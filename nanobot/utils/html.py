@@ -0,0 +1,46 @@
+"""HTML to text/markdown extraction.
+
+Kept free of heavy imports: it runs in worker processes (see
+nanobot.utils.offload.run_in_process), which import only this module.
+"""
+
+import html
+import re
+
+
+def strip_tags(text: str) -> str:
+    """Remove HTML tags and decode entities."""
+    text = re.sub(r'<script[\s\S]*?</script>', '', text, flags=re.I)
+    text = re.sub(r'<style[\s\S]*?</style>', '', text, flags=re.I)
+    text = re.sub(r'<[^>]+>', '', text)
+    return html.unescape(text).strip()
+
+
+def normalize(text: str) -> str:
+    """Normalize whitespace."""
+    text = re.sub(r'[ \t]+', ' ', text)
+    return re.sub(r'\n{3,}', '\n\n', text).strip()
+
+
+def to_markdown(html: str) -> str:
+    """Convert HTML to markdown."""
+    # Convert links, headings, lists before stripping tags
+    text = re.sub(r'<a\s+[^>]*href=["\']([^"\']+)["\'][^>]*>([\s\S]*?)</a>',
+                  lambda m: f'[{strip_tags(m[2])}]({m[1]})', html, flags=re.I)
+    text = re.sub(r'<h([1-6])[^>]*>([\s\S]*?)</h\1>',
+                  lambda m: f'\n{"#" * int(m[1])} {strip_tags(m[2])}\n', text, flags=re.I)
+    text = re.sub(r'<li[^>]*>([\s\S]*?)</li>', lambda m: f'\n- {strip_tags(m[1])}', text, flags=re.I)
+    text = re.sub(r'</(p|div|section|article)>', '\n\n', text, flags=re.I)
+    text = re.sub(r'<(br|hr)\s*/?>', '\n', text, flags=re.I)
+    return normalize(strip_tags(text))
+
+
+def extract_readable(page: str, extract_mode: str = "markdown") -> str:
+    """Main content of an HTML page via Readability, as markdown or plain text."""
+    from readability import Document
+
+    doc = Document(page)
+    summary = doc.summary()
+    content = to_markdown(summary) if extract_mode == "markdown" else strip_tags(summary)
+    title = doc.title()
+    return f"# {title}\n\n{content}" if title else content
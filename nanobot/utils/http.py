@@ -0,0 +1,52 @@
+"""Process-wide pooled HTTP clients for tools and providers."""
+
+import asyncio
+import importlib.util
+import weakref
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any
+
+import httpx
+
+# Keep-alive pool shared by every caller of a client. Connections are
+# reused per host, so repeated calls skip DNS, TCP and TLS setup.
+DEFAULT_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0)
+DEFAULT_TIMEOUT = httpx.Timeout(30.0, connect=10.0)
+
+# HTTP/2 needs the optional `h2` package (pip install httpx[http2]).
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Clients are bound to the event loop that first used them, so the
+# registry is per loop (tests and CLI commands each run their own).
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, httpx.AsyncClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_http_client(name: str = "default", **options: Any) -> httpx.AsyncClient:
+    """
+    Shared AsyncClient for `name` on the running loop, created on first use.
+
+    `options` are passed to httpx.AsyncClient on creation only; callers that
+    need different client-level settings (redirects, TLS verification) use
+    their own name. Per-request settings such as `timeout` go on the call.
+    Clients ignore response cookies; pass them as headers when needed.
+    """
+    loop = asyncio.get_running_loop()
+    clients = _clients.setdefault(loop, {})
+    client = clients.get(name)
+    if client is None or client.is_closed:
+        options.setdefault("limits", DEFAULT_LIMITS)
+        options.setdefault("timeout", DEFAULT_TIMEOUT)
+        options.setdefault("http2", HTTP2_AVAILABLE)
+        client = clients[name] = httpx.AsyncClient(**options)
+        # Never store response cookies: they would leak between callers.
+        client.cookies.jar.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    return client
+
+
+async def close_http_clients() -> None:
+    """Close the running loop's clients and their pooled connections."""
+    clients = _clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.aclose()
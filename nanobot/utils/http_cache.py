@@ -0,0 +1,159 @@
+"""Size-bounded on-disk cache for web_fetch pages and web_search results."""
+
+import email.utils
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Mapping
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from loguru import logger
+
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+# Pages that say nothing about caching are reused this long before refetching.
+DEFAULT_HEURISTIC_TTL_S = 300
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    size INTEGER NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_lru ON entries (accessed_at);
+"""
+
+
+@dataclass
+class CacheEntry:
+    value: str
+    expires_at: float
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    @property
+    def revalidatable(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+
+def normalize_url(url: str) -> str:
+    """Cache key for a URL: lowercase scheme/host, no default port or fragment, sorted query."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    port = parts.port
+    if port and not ((scheme == "http" and port == 80) or (scheme == "https" and port == 443)):
+        host = f"{host}:{port}"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, parts.path or "/", query, ""))
+
+
+def normalize_query(query: str) -> str:
+    """Cache key for a search query: case and whitespace do not matter."""
+    return " ".join(query.lower().split())
+
+
+def freshness(headers: Mapping[str, str], default_ttl: float = DEFAULT_HEURISTIC_TTL_S) -> float | None:
+    """
+    Seconds a response may be reused without revalidation, or None if it must not be stored.
+
+    Follows Cache-Control (no-store, no-cache, max-age, s-maxage), then
+    Expires; a response with neither gets `default_ttl`.
+    """
+    cache_control = (headers.get("cache-control") or "").lower()
+    if "no-store" in cache_control:
+        return None
+    if "no-cache" in cache_control:
+        return 0.0
+    if m := re.search(r"(?:s-maxage|max-age)\s*=\s*(\d+)", cache_control):
+        return float(m.group(1))
+    if expires := headers.get("expires"):
+        try:
+            return max(0.0, email.utils.parsedate_to_datetime(expires).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return 0.0  # Invalid Expires means already expired
+    return default_ttl
+
+
+class WebCache:
+    """
+    SQLite-backed key/value cache with expiry, validators and LRU eviction.
+
+    Values are the tools' final text, so a hit skips both the download and
+    the extraction. When the total size passes `max_bytes`, least recently
+    used entries are dropped. Methods block; call them via run_blocking.
+    """
+
+    def __init__(self, path: Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._size = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def get(self, key: str) -> CacheEntry | None:
+        """Look up an entry, fresh or stale, and mark it recently used."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value, expires_at, etag, last_modified FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        return CacheEntry(*row)
+
+    def put(self, key: str, entry: CacheEntry) -> None:
+        size = len(entry.value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._db.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries "
+                "(key, value, expires_at, etag, last_modified, size, accessed_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, entry.value, entry.expires_at, entry.etag, entry.last_modified, size, time.time()),
+            )
+            self._size += size - (old[0] if old else 0)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def touch(self, key: str, expires_at: float) -> None:
+        """Extend an entry's lifetime after a successful revalidation (304)."""
+        with self._lock:
+            self._db.execute(
+                "UPDATE entries SET expires_at = ?, accessed_at = ? WHERE key = ?", (expires_at, time.time(), key)
+            )
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until under the size limit."""
+        target = self.max_bytes * 0.9  # some headroom, so eviction is not run on every put
+        evicted = 0
+        for key, size in self._db.execute("SELECT key, size FROM entries ORDER BY accessed_at").fetchall():
+            if self._size <= target:
+                break
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._size -= size
+            evicted += 1
+        logger.debug(f"Web cache: evicted {evicted} entries, {self._size} bytes left")
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,100 @@
+"""Shared bounded pools for blocking file I/O and CPU-heavy work."""
+
+import asyncio
+import functools
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, TypeVar
+
+from loguru import logger
+
+T = TypeVar("T")
+
+# Enough for overlapping file I/O, small enough that a burst of large
+# images or pages cannot spawn unbounded threads.
+DEFAULT_MAX_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+
+# Pure-Python CPU work (HTML extraction) holds the GIL, so a thread does
+# not help the loop much; it goes to a small process pool instead.
+DEFAULT_PROCESS_WORKERS = min(2, os.cpu_count() or 1)
+
+_executor: ThreadPoolExecutor | None = None
+_process_pool: ProcessPoolExecutor | None = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """The shared pool, created on first use."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=DEFAULT_MAX_WORKERS, thread_name_prefix="nanobot-offload")
+    return _executor
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking call in the shared pool and await its result.
+
+    Use it for anything that can take more than a millisecond or two:
+    file reads and writes, base64 of media, sync SDK calls.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), functools.partial(func, *args, **kwargs))
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """The shared process pool, created on first use."""
+    global _process_pool
+    if _process_pool is None:
+        # "spawn": forking a process that runs threads (the offload pool,
+        # channel SDKs) can deadlock the child.
+        _process_pool = ProcessPoolExecutor(
+            max_workers=DEFAULT_PROCESS_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _process_pool
+
+
+def _kill_process_pool(pool: ProcessPoolExecutor) -> None:
+    """Terminate the workers; the only way to stop a task that is already running."""
+    global _process_pool
+    if _process_pool is pool:
+        _process_pool = None
+    for process in list((getattr(pool, "_processes", None) or {}).values()):
+        process.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def run_in_process(func: Callable[..., T], *args: Any, timeout: float | None = None) -> T:
+    """
+    Run CPU-bound work in the shared process pool.
+
+    `func` must be a module-level function in a module that is cheap to
+    import, since each worker imports it. On timeout the pool is torn down
+    (other tasks in it fail with BrokenProcessPool) and TimeoutError is
+    raised; the next call starts fresh workers.
+    """
+    loop = asyncio.get_running_loop()
+    pool = get_process_pool()
+    future = loop.run_in_executor(pool, functools.partial(func, *args))
+    try:
+        return await asyncio.wait_for(future, timeout)
+    except asyncio.TimeoutError:
+        logger.warning(f"{getattr(func, '__name__', func)} timed out after {timeout}s; restarting process pool")
+        _kill_process_pool(pool)
+        raise
+    except BrokenProcessPool:
+        _kill_process_pool(pool)
+        raise
+
+
+def shutdown_offload(wait: bool = True) -> None:
+    """Shut the pools down; new ones are created if they are used again."""
+    global _executor, _process_pool
+    if _executor is not None:
+        _executor.shutdown(wait=wait)
+        _executor = None
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=wait, cancel_futures=True)
+        _process_pool = None
@@ -0,0 +1,225 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+from nanobot.agent.loop import AgentLoop
+from nanobot.agent.tools.n8n import N8nTool
+from nanobot.agent.usage import UsageLedger
+from nanobot.bus.events import InboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.config.schema import ToolSelectionConfig
+from nanobot.metrics import metrics
+from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from nanobot.tracing import tracer
+
+
+class StubProvider(LLMProvider):
+    """Replies with the last user message, optionally after a gate opens or failing."""
+
+    def __init__(self, error: Exception | None = None):
+        super().__init__()
+        self.error = error
+        self.gate: asyncio.Event | None = None
+        self.calls = 0
+
+    async def chat(self, messages: list[dict[str, Any]], **kwargs: Any) -> LLMResponse:
+        self.calls += 1
+        if self.gate:
+            await self.gate.wait()
+        if self.error:
+            raise self.error
+        return LLMResponse(
+            content=f"reply: {messages[-1]['content']}",
+            usage={"prompt_tokens": 100, "completion_tokens": 20},
+        )
+
+    def get_default_model(self) -> str:
+        return "stub"
+
+
+@pytest.fixture
+def make_loop(tmp_path, monkeypatch):
+    """Build AgentLoops isolated from the real home dir and n8n config."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    n8n_config = tmp_path / "n8n-config.json"
+    n8n_config.write_text('{"apiUrl": "http://n8n.invalid", "apiKey": "k"}')
+    monkeypatch.setattr(
+        "nanobot.agent.loop.N8nTool", lambda: N8nTool(config_path=str(n8n_config)),
+    )
+    tasks: list[asyncio.Task] = []
+
+    def _make(provider: LLMProvider, **kwargs: Any) -> tuple[AgentLoop, MessageBus]:
+        bus = MessageBus()
+        loop = AgentLoop(bus=bus, provider=provider, workspace=tmp_path / "workspace", **kwargs)
+        tasks.append(asyncio.create_task(loop.run()))
+        return loop, bus
+
+    yield _make
+    for task in tasks:
+        task.cancel()
+
+
+async def test_process_queued_resolves_reply_without_outbound(make_loop) -> None:
+    agent, bus = make_loop(StubProvider())
+
+    result = await asyncio.wait_for(agent.process_queued("ping", session_key="cron:job1"), timeout=5)
+
+    assert result == "reply: ping"
+    assert bus.outbound_size == 0
+    assert agent._pending_replies == {}
+
+
+async def test_process_queued_propagates_turn_error(make_loop) -> None:
+    agent, bus = make_loop(StubProvider(error=RuntimeError("boom")))
+
+    with pytest.raises(RuntimeError, match="boom"):
+        await asyncio.wait_for(agent.process_queued("ping", session_key="heartbeat"), timeout=5)
+    assert bus.outbound_size == 0
+
+
+async def test_cancelled_process_queued_drops_reply(make_loop) -> None:
+    provider = StubProvider()
+    provider.gate = asyncio.Event()
+    agent, bus = make_loop(provider)
+
+    caller = asyncio.create_task(agent.process_queued("ping", session_key="cron:job1"))
+    await asyncio.sleep(0.1)
+    caller.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await caller
+
+    provider.gate.set()
+    await asyncio.sleep(0.1)
+    assert bus.outbound_size == 0
+
+
+async def test_stop_wakes_idle_loop_immediately(make_loop) -> None:
+    agent, _ = make_loop(StubProvider())
+    await asyncio.sleep(0.05)
+
+    assert await asyncio.wait_for(agent.shutdown(timeout=5), timeout=0.5)
+
+
+async def test_shutdown_finishes_in_flight_turn(make_loop) -> None:
+    provider = StubProvider()
+    provider.gate = asyncio.Event()
+    agent, bus = make_loop(provider)
+    await bus.publish_inbound(
+        InboundMessage(channel="telegram", sender_id="u1", chat_id="c1", content="hi")
+    )
+    await asyncio.sleep(0.05)
+
+    shutdown = asyncio.create_task(agent.shutdown(timeout=5))
+    await asyncio.sleep(0.05)
+    assert not shutdown.done()
+
+    provider.gate.set()
+    assert await asyncio.wait_for(shutdown, timeout=1)
+    assert (await bus.consume_outbound()).content == "reply: hi"
+
+
+async def test_shutdown_reports_timeout(make_loop) -> None:
+    provider = StubProvider()
+    provider.gate = asyncio.Event()
+    agent, bus = make_loop(provider)
+    await bus.publish_inbound(
+        InboundMessage(channel="telegram", sender_id="u1", chat_id="c1", content="hi")
+    )
+    await asyncio.sleep(0.05)
+
+    assert await agent.shutdown(timeout=0.05) is False
+
+
+async def test_turn_records_metrics(make_loop) -> None:
+    metrics.reset()
+    agent, _ = make_loop(StubProvider())
+
+    await asyncio.wait_for(agent.process_queued("ping", session_key="cron:job1"), timeout=5)
+
+    recorded = set(metrics.histograms)
+    assert {
+        "nanobot_queue_wait_seconds",
+        "nanobot_turn_seconds",
+        "nanobot_context_build_seconds",
+        "nanobot_llm_request_seconds",
+        "nanobot_session_save_seconds",
+    } <= recorded
+
+
+async def test_turn_is_traced_end_to_end(make_loop) -> None:
+    tracer.spans.clear()
+    agent, _ = make_loop(StubProvider())
+
+    await asyncio.wait_for(agent.process_queued("ping", session_key="cron:job1"), timeout=5)
+
+    [trace] = tracer.traces(limit=1)
+    names = [s["name"] for s in trace]
+    assert {"bus.queue", "agent.turn", "context.build", "llm.request", "session.save"} <= set(names)
+    turn = next(s for s in trace if s["name"] == "agent.turn")
+    llm = next(s for s in trace if s["name"] == "llm.request")
+    assert llm["parent_id"] == turn["span_id"]
+
+
+async def test_session_budget_stops_llm_calls(make_loop, tmp_path) -> None:
+    provider = StubProvider()
+    ledger = UsageLedger(tmp_path / "usage", session_daily_tokens=100)
+    agent, _ = make_loop(provider, usage_ledger=ledger)
+
+    first = await asyncio.wait_for(agent.process_queued("a", session_key="cli:budget"), timeout=5)
+    second = await asyncio.wait_for(agent.process_queued("b", session_key="cli:budget"), timeout=5)
+    other = await asyncio.wait_for(agent.process_queued("c", session_key="cli:other"), timeout=5)
+
+    assert first.startswith("reply:")
+    assert "budget" in second
+    assert other.startswith("reply:")
+    assert provider.calls == 2
+
+
+async def test_profile_command_is_admin_only(make_loop, tmp_path) -> None:
+    provider = StubProvider()
+    agent, bus = make_loop(provider, admins=["42"])
+
+    async def send(sender: str, content: str) -> str:
+        await bus.publish_inbound(InboundMessage(channel="telegram", sender_id=sender, chat_id="c", content=content))
+        return (await asyncio.wait_for(bus.consume_outbound(), timeout=2)).content
+
+    assert (await send("7", "/profile on")) == "reply: /profile on"
+    assert "Profiler on" in await send("42|alice", "/profile on")
+    await send("7", "hello")
+    reply = await send("42", "/profile off")
+    assert "Report:" in reply
+    assert list((tmp_path / ".nanobot" / "profiles").glob("profile-*.txt"))
+    assert provider.calls == 2
+
+
+class LoadingProvider(LLMProvider):
+    """Loads web_fetch on the first call, then replies; records the tools offered."""
+
+    def __init__(self):
+        super().__init__()
+        self.offered: list[set[str]] = []
+
+    async def chat(self, messages: list[dict[str, Any]], tools: list[dict[str, Any]] | None = None,
+                   **kwargs: Any) -> LLMResponse:
+        self.offered.append({t["function"]["name"] for t in tools or []})
+        if len(self.offered) == 1:
+            call = ToolCallRequest(id="c1", name="load_tools", arguments={"names": ["web_fetch"]})
+            return LLMResponse(content=None, tool_calls=[call])
+        return LLMResponse(content="done")
+
+    def get_default_model(self) -> str:
+        return "stub"
+
+
+async def test_tool_selection_offers_subset_and_load_tools(make_loop) -> None:
+    provider = LoadingProvider()
+    agent, _ = make_loop(provider, tool_selection=ToolSelectionConfig(enabled=True))
+
+    result = await asyncio.wait_for(agent.process_queued("hello", session_key="cli:1"), timeout=5)
+
+    assert result == "done"
+    first, second = provider.offered
+    assert "load_tools" in first and "exec" in first
+    assert "web_fetch" not in first and len(first) < len(agent.tools)
+    assert second == first | {"web_fetch"}
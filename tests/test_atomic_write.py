@@ -0,0 +1,75 @@
+import asyncio
+import os
+import stat
+
+import pytest
+
+from nanobot.agent.tools.filesystem import EditFileTool
+from nanobot.utils.atomic import atomic_open, atomic_write, set_durability
+
+
+@pytest.mark.parametrize("durability", ["none", "file", "full"])
+def test_atomic_write_replaces_file(tmp_path, durability) -> None:
+    path = tmp_path / "data.json"
+    path.write_text("old")
+    os.chmod(path, 0o640)
+
+    atomic_write(path, "new", durability=durability)
+
+    assert path.read_text() == "new"
+    assert stat.S_IMODE(path.stat().st_mode) == 0o640
+    assert os.listdir(tmp_path) == ["data.json"]
+
+
+def test_new_file_follows_current_umask(tmp_path) -> None:
+    old = os.umask(0o027)
+    try:
+        atomic_write(tmp_path / "new.txt", "x")
+    finally:
+        os.umask(old)
+
+    assert stat.S_IMODE((tmp_path / "new.txt").stat().st_mode) == 0o640
+
+
+def test_failed_write_leaves_original(tmp_path) -> None:
+    path = tmp_path / "session.jsonl"
+    path.write_text("complete\n")
+
+    with pytest.raises(RuntimeError):
+        with atomic_open(path) as f:
+            f.write("partial")
+            raise RuntimeError("crash mid-write")
+
+    assert path.read_text() == "complete\n"
+    assert os.listdir(tmp_path) == ["session.jsonl"]
+
+
+def test_writes_through_symlinks(tmp_path) -> None:
+    target = tmp_path / "real.md"
+    target.write_text("old")
+    link = tmp_path / "link.md"
+    link.symlink_to(target)
+
+    atomic_write(link, "new")
+
+    assert link.is_symlink()
+    assert target.read_text() == "new"
+
+
+def test_unknown_durability_level() -> None:
+    with pytest.raises(ValueError):
+        set_durability("sometimes")
+
+
+async def test_concurrent_edits_are_not_lost(tmp_path) -> None:
+    path = tmp_path / "list.txt"
+    path.write_text("".join(f"item{i}: todo\n" for i in range(20)))
+    tool = EditFileTool()
+
+    results = await asyncio.gather(*(
+        tool.execute(str(path), old_text=f"item{i}: todo", new_text=f"item{i}: done") for i in range(20)
+    ))
+
+    assert all(r.startswith("Successfully") for r in results)
+    assert "todo" not in path.read_text()
+    assert os.listdir(tmp_path) == ["list.txt"]
@@ -0,0 +1,94 @@
+import asyncio
+import sys
+
+import pytest
+
+from nanobot.agent.jobs import JobManager
+from nanobot.agent.tools.jobs import JobKillTool, JobOutputTool, JobStatusTool
+from nanobot.agent.tools.shell import ExecTool
+from nanobot.bus.queue import MessageBus
+
+PY = sys.executable
+
+
+@pytest.fixture
+async def setup(tmp_path):
+    bus = MessageBus()
+    jobs = JobManager(bus, tmp_path / "jobs")
+    tool = ExecTool(working_dir=str(tmp_path), timeout=1, jobs=jobs)
+    tool.set_context("telegram", "42")
+    yield bus, jobs, tool
+    await jobs.close()
+
+
+def _job_id(result: str) -> str:
+    assert result.startswith("Started background job ")
+    return result.split()[3].rstrip(".")
+
+
+async def test_background_job_outlives_timeout_and_announces(setup, tmp_path) -> None:
+    bus, jobs, tool = setup
+    assert "background" in tool.parameters["properties"]
+
+    (tmp_path / "build.py").write_text("import time\nprint('building', flush=True)\ntime.sleep(1.5)\nprint('done')\n")
+    job_id = _job_id(await tool.execute(f"{PY} build.py", background=True))
+
+    status = await JobStatusTool(jobs).execute(job_id=job_id)
+    assert status.startswith(f"{job_id}: running")
+
+    msg = await asyncio.wait_for(bus.consume_inbound(), timeout=10)
+    assert msg.channel == "system" and msg.chat_id == "telegram:42"
+    assert f"[Background job {job_id} completed successfully]" in msg.content
+    assert "building\ndone" in msg.content
+
+    output = await JobOutputTool(jobs).execute(job_id=job_id)
+    assert output.startswith(f"[{job_id}: exited with code 0")
+    assert output.endswith("building\ndone\n")
+
+
+async def test_kill_job(setup) -> None:
+    bus, jobs, tool = setup
+    job_id = _job_id(await tool.execute("sleep 30", background=True))
+
+    assert await JobKillTool(jobs).execute(job_id=job_id) == f"Killed job {job_id}"
+    await asyncio.wait_for(jobs.close(), timeout=5)
+
+    assert (await JobStatusTool(jobs).execute()) == f"{job_id}: killed — sleep 30"
+    assert bus.inbound_size == 0  # killed jobs are not announced
+    assert (await JobKillTool(jobs).execute(job_id=job_id)).startswith(f"Job {job_id} is not running")
+
+
+async def test_guard_applies_to_background_jobs(setup) -> None:
+    _, jobs, tool = setup
+    assert "blocked by safety guard" in await tool.execute("rm -rf /", background=True)
+    assert jobs.list_jobs() == []
+
+
+def test_no_background_parameter_without_jobs(tmp_path) -> None:
+    assert "background" not in ExecTool(working_dir=str(tmp_path)).parameters["properties"]
+
+
+async def test_runaway_job_is_stopped_at_spool_limit(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr("nanobot.agent.jobs.SPOOL_CHECK_INTERVAL_S", 0.05)
+    bus = MessageBus()
+    jobs = JobManager(bus, tmp_path / "jobs", max_output_bytes=100_000)
+    try:
+        job = await jobs.start(f"{PY} -c \"while True: print('spam' * 100)\"", str(tmp_path), "cli", "1")
+        msg = await asyncio.wait_for(bus.consume_inbound(), timeout=10)
+        assert job.output_path.stat().st_size == 100_000
+    finally:
+        await jobs.close()
+
+    assert "was stopped: its output passed 100,000 bytes" in msg.content
+    assert "output passed the size limit" in job.describe()
+    assert not job.output_path.exists()  # deleted by close()
+
+
+async def test_close_deletes_spool_files(setup) -> None:
+    _, jobs, tool = setup
+    job_id = _job_id(await tool.execute("echo hi; sleep 30", background=True))
+    path = jobs.get(job_id).output_path
+    assert path.exists()
+
+    await jobs.close()
+    assert not path.exists()
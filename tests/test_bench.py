@@ -0,0 +1,68 @@
+import pytest
+
+from nanobot.agent.tools.shell import ExecTool
+from nanobot.bench import run_bench
+from nanobot.bench.guard import GUARD_COMMANDS, bench_guard
+from nanobot.providers.mock import MockProvider
+
+_TOOLS = [{"type": "function", "function": {"name": "list_dir"}}]
+
+
+async def test_mock_provider_scripts_tool_rounds() -> None:
+    provider = MockProvider(tool_rounds=1, reply="done")
+    messages = [{"role": "system", "content": "s"}, {"role": "user", "content": "hi"}]
+
+    first = await provider.chat(messages, tools=_TOOLS)
+    assert [tc.name for tc in first.tool_calls] == ["list_dir"]
+
+    messages += [
+        {"role": "assistant", "content": None, "tool_calls": [{"id": "x"}]},
+        {"role": "tool", "content": "ok"},
+        {"role": "user", "content": "Reflect on the results and decide next steps."},
+    ]
+    second = await provider.chat(messages, tools=_TOOLS)
+    assert second.content == "done"
+    assert not second.tool_calls
+    assert second.usage["prompt_tokens"] > 0
+
+
+async def test_mock_provider_skips_unavailable_tools() -> None:
+    provider = MockProvider(tool_rounds=3)
+    response = await provider.chat([{"role": "user", "content": "hi"}], tools=[])
+    assert response.content == "Done."
+
+
+def test_mock_latency_is_deterministic_per_seed() -> None:
+    a = MockProvider(latency_ms=100, jitter_ms=50, distribution="lognormal", seed=7)
+    b = MockProvider(latency_ms=100, jitter_ms=50, distribution="lognormal", seed=7)
+    assert [a._latency() for _ in range(5)] == [b._latency() for _ in range(5)]
+    with pytest.raises(ValueError):
+        MockProvider(distribution="bimodal")
+
+
+async def test_run_bench_reports_every_message(tmp_path) -> None:
+    provider = MockProvider(tool_rounds=1)
+    result = await run_bench(sessions=3, turns=2, provider=provider, workspace=tmp_path)
+
+    assert result.messages == 6
+    assert result.llm_calls == 12
+    assert 0 < result.p50_ms <= result.p95_ms <= result.max_ms
+    stages = {s["stage"] for s in result.stages}
+    assert {"turn", "llm_request", "tool", "queue_wait"} <= stages
+
+
+def test_bench_guard_times_every_command() -> None:
+    result = bench_guard(iterations=20)
+
+    assert result.commands == len(GUARD_COMMANDS)
+    assert result.blocked == 3  # rm -rf /, shutdown, and /etc outside the workspace
+    assert result.avg_us > 0
+
+
+def test_guard_alternation_matches_each_pattern(tmp_path) -> None:
+    tool = ExecTool(working_dir=str(tmp_path), deny_patterns=[r"\bfoo\b", r"bar$"], allow_patterns=[r"^echo\b"])
+
+    assert "dangerous pattern" in tool._guard_command("echo foo", str(tmp_path))
+    assert "dangerous pattern" in tool._guard_command("echo bar", str(tmp_path))
+    assert "not in allowlist" in tool._guard_command("ls", str(tmp_path))
+    assert tool._guard_command("echo food", str(tmp_path)) is None
@@ -1,5 +1,6 @@
 """Test session management with cache-friendly message handling."""
 
+import asyncio
 import pytest
 from pathlib import Path
 from nanobot.session.manager import Session, SessionManager
@@ -166,6 +167,20 @@ class TestSessionPersistence:
         assert history[0]["content"] == "msg20"
         assert history[-1]["content"] == "msg29"
 
+    async def test_async_save_and_load(self, tmp_path):
+        """Test that the offloaded save/load round-trip and keep the snapshot taken at call time."""
+        manager = SessionManager(tmp_path, sessions_dir=tmp_path / "sessions")
+        session = create_session_with_messages("test:async", 5)
+        save = asyncio.create_task(manager.save_async(session))
+        await asyncio.sleep(0)  # snapshot taken, write running in the pool
+        session.add_message("user", "after save")
+        await save
+
+        reloaded = SessionManager(tmp_path, sessions_dir=tmp_path / "sessions")
+        loaded = await reloaded.get_or_create_async("test:async")
+        assert [m["content"] for m in loaded.messages] == [f"msg{i}" for i in range(5)]
+        assert await reloaded.get_or_create_async("test:async") is loaded
+
     def test_clear_resets_session(self, temp_manager):
         """Test that clear() properly resets session."""
         session = create_session_with_messages("test:clear", 10)
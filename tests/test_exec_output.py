@@ -0,0 +1,80 @@
+import asyncio
+import sys
+
+import pytest
+
+from nanobot.agent.tools.shell import ExecTool, OutputCapture
+
+PY = sys.executable
+
+
+def test_capture_keeps_head_and_tail() -> None:
+    capture = OutputCapture(max_bytes=10)
+    for i in range(100):
+        capture.feed(f"{i:03d}\n".encode())
+
+    assert capture.total == 400
+    assert capture.text() == "000\n0\n... (390 bytes omitted) ...\n\n099\n"
+    assert capture.last_line == "099"
+
+
+@pytest.mark.parametrize("persistent", [False, True])
+async def test_large_output_is_bounded(tmp_path, persistent) -> None:
+    tool = ExecTool(working_dir=str(tmp_path), persistent=persistent, max_output_bytes=1000)
+    try:
+        result = await tool.execute(f"{PY} -c \"print('start'); print('x' * 2_000_000); print('end')\"")
+    finally:
+        if tool.shells is not None:
+            await tool.shells.close()
+
+    assert result.startswith("start\nxxx")
+    assert result.endswith("xxx\nend\n")
+    assert "bytes omitted" in result
+    assert len(result) < 1200
+
+
+@pytest.mark.parametrize("persistent", [False, True])
+async def test_runaway_output_is_killed(tmp_path, persistent) -> None:
+    tool = ExecTool(working_dir=str(tmp_path), persistent=persistent, kill_output_bytes=100_000)
+    try:
+        result = await tool.execute(f"{PY} -c \"while True: print('spam' * 100)\"")
+    finally:
+        if tool.shells is not None:
+            await tool.shells.close()
+
+    assert "(Killed: output passed 100000 bytes" in result
+
+
+async def test_progress_updates(tmp_path) -> None:
+    sent = []
+
+    async def send(msg):
+        sent.append(msg)
+
+    tool = ExecTool(working_dir=str(tmp_path), progress_interval=0.05, send_callback=send)
+    tool.set_context("telegram", "42")
+    script = "import time\nfor i in range(3):\n    print(f'step {i}', flush=True)\n    time.sleep(0.3)"
+    result = await tool.execute(f"{PY} -c \"{script}\"")
+
+    assert result == "step 0\nstep 1\nstep 2\n"
+    assert sent and all(m.chat_id == "42" for m in sent)
+    assert sent[0].content.endswith("step 0")
+    await asyncio.sleep(0.1)
+    assert len(sent) <= 3  # stopped with the command, one update per new line
+
+
+@pytest.mark.parametrize("command", ["sleep 10", f"{PY} -c \"while True: print('spam' * 100)\""])
+async def test_killed_process_is_reaped(tmp_path, monkeypatch, command) -> None:
+    started = []
+    real_create = asyncio.create_subprocess_shell
+
+    async def create(*args, **kwargs):
+        started.append(await real_create(*args, **kwargs))
+        return started[-1]
+
+    monkeypatch.setattr(asyncio, "create_subprocess_shell", create)
+    tool = ExecTool(working_dir=str(tmp_path), timeout=1, kill_output_bytes=100_000)
+    result = await tool.execute(command)
+
+    assert "timed out" in result or "Killed" in result
+    assert started[0].returncode is not None
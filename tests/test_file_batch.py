@@ -0,0 +1,62 @@
+from nanobot.agent.tools.filesystem import EditFileTool, ListDirTool, ReadFilesTool
+
+
+async def test_read_files_shares_output_budget(tmp_path) -> None:
+    (tmp_path / "a.txt").write_text("alpha\n")
+    (tmp_path / "b.txt").write_text("b" * 100)
+
+    result = await ReadFilesTool(max_bytes=60).execute(files=[
+        {"path": str(tmp_path / "a.txt")},
+        {"path": str(tmp_path / "b.txt"), "byte_offset": 10},
+        {"path": str(tmp_path / "missing.txt")},
+    ])
+    sections = result.split("\n\n=== ")
+
+    assert sections[0] == f"=== {tmp_path / 'a.txt'} ===\nalpha\n"
+    assert sections[1].startswith(f"{tmp_path / 'b.txt'} ===\n{'b' * 20}\n\n[Showing bytes 10-30 of 100")
+    assert sections[2].endswith("Error: File not found: " + str(tmp_path / "missing.txt"))
+
+
+async def test_multi_edit_is_all_or_nothing(tmp_path) -> None:
+    path = tmp_path / "config.py"
+    path.write_text("HOST = 'localhost'\nPORT = 8000\n")
+    tool = EditFileTool()
+
+    failed = await tool.execute(str(path), edits=[
+        {"old_text": "localhost", "new_text": "0.0.0.0"},
+        {"old_text": "PORT = 9000", "new_text": "PORT = 8080"},
+    ])
+    assert failed.startswith("Error: edit 2: old_text not found")
+    assert path.read_text() == "HOST = 'localhost'\nPORT = 8000\n"
+
+    ok = await tool.execute(str(path), edits=[
+        {"old_text": "localhost", "new_text": "0.0.0.0"},
+        {"old_text": "PORT = 8000", "new_text": "PORT = 8080"},
+    ])
+    assert ok.endswith("(2 replacements)")
+    assert path.read_text() == "HOST = '0.0.0.0'\nPORT = 8080\n"
+
+
+async def test_single_edit_still_works(tmp_path) -> None:
+    path = tmp_path / "notes.md"
+    path.write_text("todo: write tests\n")
+
+    assert await EditFileTool().execute(str(path), old_text="todo", new_text="done") == f"Successfully edited {path}"
+    assert path.read_text() == "done: write tests\n"
+
+
+async def test_list_dir_depth_and_glob(tmp_path) -> None:
+    (tmp_path / "src" / "pkg").mkdir(parents=True)
+    (tmp_path / "src" / "pkg" / "core.py").write_text("")
+    (tmp_path / "src" / "main.py").write_text("")
+    (tmp_path / "README.md").write_text("")
+    tool = ListDirTool()
+
+    assert await tool.execute(str(tmp_path)) == "📄 README.md\n📁 src"
+    assert (await tool.execute(str(tmp_path), depth=2)).splitlines() == [
+        "📄 README.md", "📁 src", "📄 src/main.py", "📁 src/pkg",
+    ]
+    assert (await tool.execute(str(tmp_path), depth=3, glob="*.py")).splitlines() == [
+        "📄 src/main.py", "📄 src/pkg/core.py",
+    ]
+    assert await tool.execute(str(tmp_path), glob="*.rs") == f"No files matching *.rs in {tmp_path}"
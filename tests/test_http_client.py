@@ -0,0 +1,41 @@
+import asyncio
+
+import httpx
+
+from nanobot.utils.http import close_http_clients, get_http_client
+
+
+async def test_clients_are_shared_per_name() -> None:
+    default = get_http_client()
+    assert get_http_client() is default
+    other = get_http_client("web_fetch", follow_redirects=True)
+    assert other is not default and other.follow_redirects
+
+    await close_http_clients()
+    assert default.is_closed
+    assert get_http_client() is not default
+    await close_http_clients()
+
+
+def test_each_event_loop_gets_its_own_client() -> None:
+    async def grab() -> httpx.AsyncClient:
+        client = get_http_client()
+        await close_http_clients()
+        return client
+
+    assert asyncio.run(grab()) is not asyncio.run(grab())
+
+
+async def test_response_cookies_are_not_kept() -> None:
+    client = get_http_client()
+    client._transport = httpx.MockTransport(
+        lambda request: httpx.Response(
+            200, headers={"set-cookie": "session=secret; Path=/"}, text=request.headers.get("cookie", ""),
+        )
+    )
+    first = await client.get("https://example.com/")
+    second = await client.get("https://example.com/")
+
+    assert first.cookies["session"] == "secret"  # still visible to the caller
+    assert second.text == ""
+    await close_http_clients()
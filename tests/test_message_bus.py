@@ -0,0 +1,156 @@
+import asyncio
+
+import pytest
+
+from nanobot.bus.events import InboundMessage, MessagePriority
+from nanobot.bus.queue import COALESCE_MAX_WINDOWS, MessageBus
+
+
+def _msg(channel: str, content: str, chat_id: str = "c1") -> InboundMessage:
+    return InboundMessage(channel=channel, sender_id="u1", chat_id=chat_id, content=content)
+
+
+def _background(content: str) -> InboundMessage:
+    return InboundMessage(
+        channel="cli", sender_id="user", chat_id="direct", content=content,
+        priority=MessagePriority.BACKGROUND,
+    )
+
+
+def test_priority_derived_from_channel() -> None:
+    assert _msg("telegram", "hi").priority == MessagePriority.INTERACTIVE
+    assert _msg("cli", "hi").priority == MessagePriority.INTERACTIVE
+    assert _msg("system", "done").priority == MessagePriority.SYSTEM
+    assert _background("job").priority == MessagePriority.BACKGROUND
+
+
+async def test_interactive_served_before_background() -> None:
+    bus = MessageBus()
+    await bus.publish_inbound(_background("job1"))
+    await bus.publish_inbound(_background("job2"))
+    await bus.publish_inbound(_msg("system", "announce"))
+    await bus.publish_inbound(_msg("telegram", "hello"))
+
+    order = [(await bus.consume_inbound()).content for _ in range(4)]
+    assert order == ["hello", "announce", "job1", "job2"]
+    assert bus.inbound_size == 0
+
+
+async def test_starved_lane_is_eventually_served() -> None:
+    bus = MessageBus(starvation_limit=2)
+    await bus.publish_inbound(_background("job"))
+    for i in range(5):
+        await bus.publish_inbound(_msg("telegram", f"m{i}", chat_id=f"c{i}"))
+
+    order = [(await bus.consume_inbound()).content for _ in range(6)]
+    assert order.index("job") == 2
+
+
+async def test_consume_blocks_until_published() -> None:
+    bus = MessageBus()
+    consumer = asyncio.create_task(bus.consume_inbound())
+    await asyncio.sleep(0)
+    assert not consumer.done()
+
+    await bus.publish_inbound(_msg("telegram", "late"))
+    msg = await asyncio.wait_for(consumer, timeout=1.0)
+    assert msg.content == "late"
+
+
+async def test_lane_sizes() -> None:
+    bus = MessageBus()
+    await bus.publish_inbound(_msg("system", "a"))
+    assert bus.lane_sizes() == {"interactive": 0, "system": 1, "background": 0}
+
+
+@pytest.mark.parametrize("limit", [0, -3])
+def test_starvation_limit_clamped(limit: int) -> None:
+    assert MessageBus(starvation_limit=limit).starvation_limit == 1
+
+
+async def test_queued_messages_for_same_session_are_coalesced() -> None:
+    bus = MessageBus()
+    await bus.publish_inbound(_msg("telegram", "hey"))
+    await bus.publish_inbound(_msg("telegram", "are you there?"))
+    await bus.publish_inbound(_msg("telegram", "other chat", chat_id="c2"))
+
+    assert bus.inbound_size == 2
+    first = await bus.consume_inbound()
+    assert first.content == "hey\nare you there?"
+    assert first.metadata["coalesced_count"] == 2
+    assert (await bus.consume_inbound()).content == "other chat"
+
+
+async def test_consumed_message_is_not_merged_into() -> None:
+    bus = MessageBus()
+    await bus.publish_inbound(_msg("telegram", "one"))
+    assert (await bus.consume_inbound()).content == "one"
+
+    await bus.publish_inbound(_msg("telegram", "two"))
+    assert (await bus.consume_inbound()).content == "two"
+
+
+async def test_commands_are_never_coalesced() -> None:
+    bus = MessageBus()
+    await bus.publish_inbound(_msg("telegram", "before"))
+    await bus.publish_inbound(_msg("telegram", "/new"))
+    await bus.publish_inbound(_msg("telegram", "after"))
+
+    order = [(await bus.consume_inbound()).content for _ in range(3)]
+    assert order == ["before", "/new", "after"]
+
+
+async def test_coalescing_can_be_disabled() -> None:
+    bus = MessageBus(coalesce_queued=False)
+    await bus.publish_inbound(_msg("telegram", "a"))
+    await bus.publish_inbound(_msg("telegram", "b"))
+    assert bus.inbound_size == 2
+
+
+async def test_window_merges_burst_and_labels_senders() -> None:
+    bus = MessageBus(coalesce_window_ms=20)
+    await bus.publish_inbound(_msg("telegram", "first"))
+    await bus.publish_inbound(
+        InboundMessage(channel="telegram", sender_id="u2", chat_id="c1", content="second")
+    )
+    assert bus.inbound_size == 0
+
+    msg = await asyncio.wait_for(bus.consume_inbound(), timeout=1.0)
+    assert msg.content == "u1: first\nu2: second"
+    assert msg.sender_id == "u2"
+
+
+async def test_window_flushed_before_command() -> None:
+    bus = MessageBus(coalesce_window_ms=10_000)
+    await bus.publish_inbound(_msg("telegram", "held"))
+    await bus.publish_inbound(_msg("telegram", "/help"))
+
+    order = [(await bus.consume_inbound()).content for _ in range(2)]
+    assert order == ["held", "/help"]
+
+
+async def test_window_releases_continuous_burst_at_cap() -> None:
+    window_ms = 50
+    bus = MessageBus(coalesce_window_ms=window_ms)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    released_at = None
+    while loop.time() - start < 0.6:
+        await bus.publish_inbound(_msg("telegram", "typing"))
+        await asyncio.sleep(0.02)
+        if bus.inbound_size and released_at is None:
+            released_at = loop.time() - start
+
+    cap = window_ms / 1000 * COALESCE_MAX_WINDOWS
+    assert released_at is not None
+    assert cap <= released_at < cap + 0.1
+
+
+async def test_stop_flushes_held_messages() -> None:
+    bus = MessageBus(coalesce_window_ms=10_000)
+    await bus.publish_inbound(_msg("telegram", "held"))
+    assert bus.inbound_size == 0
+
+    bus.stop()
+    assert bus.inbound_size == 1
+    assert (await bus.consume_inbound()).content == "held"
@@ -0,0 +1,77 @@
+from nanobot.bus.events import InboundMessage, OutboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.bus.wal import INBOUND, OUTBOUND, WAL_IDS_KEY, MessageLog
+
+
+def _msg(content: str, message_id: str | None = None, chat_id: str = "c1") -> InboundMessage:
+    metadata = {"message_id": message_id} if message_id else {}
+    return InboundMessage(
+        channel="telegram", sender_id="u1", chat_id=chat_id, content=content, metadata=metadata,
+    )
+
+
+def test_unacked_messages_are_pending(tmp_path) -> None:
+    log = MessageLog(tmp_path / "bus.db")
+    first, second = _msg("one"), _msg("two")
+    log.append(INBOUND, first)
+    log.append(INBOUND, second)
+    log.ack(first)
+
+    pending = log.pending(INBOUND)
+    assert [m.content for m in pending] == ["two"]
+    assert pending[0].timestamp == second.timestamp
+    assert pending[0].priority == second.priority
+    assert log.pending(OUTBOUND) == []
+
+
+def test_duplicate_channel_message_is_rejected(tmp_path) -> None:
+    log = MessageLog(tmp_path / "bus.db")
+    assert log.append(INBOUND, _msg("hi", message_id="42")) is not None
+    assert log.append(INBOUND, _msg("hi", message_id="42")) is None
+    assert log.append(INBOUND, _msg("hi", message_id="42", chat_id="c2")) is not None
+
+
+def test_prune_keeps_pending_entries(tmp_path) -> None:
+    log = MessageLog(tmp_path / "bus.db", retention_s=-1)
+    done, open_ = _msg("done", message_id="1"), _msg("open")
+    log.append(INBOUND, done)
+    log.append(INBOUND, open_)
+    log.ack(done)
+    log.prune()
+
+    assert [m.content for m in log.pending(INBOUND)] == ["open"]
+    # Pruned keys no longer block redelivery.
+    assert log.append(INBOUND, _msg("done", message_id="1")) is not None
+
+
+async def test_restart_replays_unacked_messages(tmp_path) -> None:
+    bus = MessageBus(log=MessageLog(tmp_path / "bus.db"))
+    await bus.publish_inbound(_msg("handled"))
+    await bus.publish_inbound(_msg("in flight", chat_id="c2"))
+    await bus.publish_outbound(OutboundMessage(channel="telegram", chat_id="c1", content="reply"))
+    bus.ack(await bus.consume_inbound())
+    await bus.consume_inbound()  # the process dies mid-turn
+    bus.log.close()
+
+    restarted = MessageBus(log=MessageLog(tmp_path / "bus.db"))
+    assert restarted.replay() == 2
+    assert (await restarted.consume_inbound()).content == "in flight"
+    assert (await restarted.consume_outbound()).content == "reply"
+
+
+async def test_bus_drops_redelivered_message(tmp_path) -> None:
+    bus = MessageBus(log=MessageLog(tmp_path / "bus.db"), coalesce_queued=False)
+    await bus.publish_inbound(_msg("hi", message_id="7"))
+    await bus.publish_inbound(_msg("hi", message_id="7"))
+    assert bus.inbound_size == 1
+
+
+async def test_coalesced_message_acks_all_parts(tmp_path) -> None:
+    bus = MessageBus(log=MessageLog(tmp_path / "bus.db"))
+    await bus.publish_inbound(_msg("a"))
+    await bus.publish_inbound(_msg("b"))
+
+    merged = await bus.consume_inbound()
+    assert len(merged.metadata[WAL_IDS_KEY]) == 2
+    bus.ack(merged)
+    assert bus.log.pending(INBOUND) == []
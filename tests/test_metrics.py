@@ -0,0 +1,100 @@
+import asyncio
+import json
+
+from nanobot.metrics import MetricsRegistry, MetricsServer
+from nanobot.metrics.registry import Histogram
+from nanobot.tracing import Tracer
+
+
+def test_histogram_buckets_are_inclusive_upper_bounds() -> None:
+    hist = Histogram(buckets=(1.0, 2.0))
+    for value in (0.5, 1.0, 1.5, 3.0):
+        hist.observe(value)
+    assert hist.counts == [2, 1, 1]
+    assert hist.count == 4
+    assert hist.total == 6.0
+
+
+def test_histogram_quantile_interpolates() -> None:
+    hist = Histogram(buckets=(1.0, 2.0))
+    for _ in range(10):
+        hist.observe(1.5)
+    assert 1.0 < hist.quantile(0.5) <= 2.0
+    assert Histogram().quantile(0.5) == 0.0
+
+
+def test_render_prometheus_text() -> None:
+    registry = MetricsRegistry()
+    registry.observe("nanobot_tool_seconds", 0.02, tool="exec")
+    registry.inc("nanobot_llm_tokens_total", 30, model="m", kind="prompt")
+
+    text = registry.render()
+    assert "# TYPE nanobot_tool_seconds histogram" in text
+    assert 'nanobot_tool_seconds_bucket{tool="exec",le="0.025"} 1' in text
+    assert 'nanobot_tool_seconds_bucket{tool="exec",le="+Inf"} 1' in text
+    assert 'nanobot_tool_seconds_count{tool="exec"} 1' in text
+    assert 'nanobot_llm_tokens_total{kind="prompt",model="m"} 30' in text
+
+
+def test_timer_records_even_on_error() -> None:
+    registry = MetricsRegistry()
+    try:
+        with registry.timer("nanobot_turn_seconds", channel="cli"):
+            raise ValueError
+    except ValueError:
+        pass
+    [series] = registry.snapshot()["histograms"]
+    assert series["labels"] == {"channel": "cli"}
+    assert series["count"] == 1
+
+
+async def _get(port: int, path: str) -> tuple[str, str]:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: x\r\n\r\n".encode())
+    await writer.drain()
+    raw = (await reader.read()).decode()
+    writer.close()
+    head, body = raw.split("\r\n\r\n", 1)
+    return head.split("\r\n")[0], body
+
+
+async def test_server_serves_metrics_and_stats() -> None:
+    registry = MetricsRegistry()
+    registry.observe("nanobot_turn_seconds", 0.3, channel="telegram")
+    server = MetricsServer("127.0.0.1", 0, registry=registry)
+    await server.start()
+    try:
+        status, body = await _get(server.port, "/metrics")
+        assert status == "HTTP/1.1 200 OK"
+        assert 'nanobot_turn_seconds_count{channel="telegram"} 1' in body
+
+        status, body = await _get(server.port, "/stats")
+        assert json.loads(body)["histograms"][0]["name"] == "nanobot_turn_seconds"
+
+        status, _ = await _get(server.port, "/nope")
+        assert status == "HTTP/1.1 404 Not Found"
+    finally:
+        await server.stop()
+
+
+async def test_traces_only_served_on_loopback_with_tracing_enabled() -> None:
+    tracer = Tracer()
+    with tracer.span("agent.turn", session="telegram:42"):
+        pass
+    server = MetricsServer("127.0.0.1", 0, registry=MetricsRegistry(), tracer=tracer)
+    await server.start()
+    try:
+        status, body = await _get(server.port, "/traces")
+        assert status == "HTTP/1.1 200 OK"
+        assert json.loads(body)[0][0]["name"] == "agent.turn"
+
+        tracer.enabled = False
+        status, _ = await _get(server.port, "/traces")
+        assert status == "HTTP/1.1 404 Not Found"
+
+        tracer.enabled = True
+        server.host = "0.0.0.0"  # as if bound to every interface
+        status, _ = await _get(server.port, "/traces")
+        assert status == "HTTP/1.1 404 Not Found"
+    finally:
+        await server.stop()
@@ -0,0 +1,120 @@
+import asyncio
+
+from nanobot.bus.dispatch import OutboundDispatcher
+from nanobot.bus.events import OutboundMessage
+from nanobot.bus.queue import MessageBus
+
+
+def _out(channel: str, content: str, chat_id: str = "c1") -> OutboundMessage:
+    return OutboundMessage(channel=channel, chat_id=chat_id, content=content)
+
+
+async def _eventually(predicate, timeout: float = 1.0) -> None:
+    """Wait until `predicate()` holds; a GC pause can outlast any fixed sleep."""
+    async def _poll() -> None:
+        while not predicate():
+            await asyncio.sleep(0.005)
+    await asyncio.wait_for(_poll(), timeout)
+
+
+class RecordingSender:
+    """Records sends; channels listed in `blocked` wait for `release`."""
+
+    def __init__(self, blocked: set[str] = frozenset()):
+        self.sent: list[str] = []
+        self.blocked = blocked
+        self.release = asyncio.Event()
+
+    async def __call__(self, msg: OutboundMessage) -> None:
+        if msg.channel in self.blocked or msg.chat_id in self.blocked:
+            await self.release.wait()
+        if msg.content == "fail":
+            raise RuntimeError("send failed")
+        self.sent.append(msg.content)
+
+
+async def test_slow_channel_does_not_block_others() -> None:
+    sender = RecordingSender(blocked={"email"})
+    dispatcher = OutboundDispatcher(sender)
+    dispatcher.submit(_out("email", "mail"))
+    dispatcher.submit(_out("telegram", "tg"))
+
+    await _eventually(lambda: sender.sent)
+    assert sender.sent == ["tg"]
+
+    sender.release.set()
+    await asyncio.wait_for(dispatcher.join(), timeout=1.0)
+    assert sender.sent == ["tg", "mail"]
+    await dispatcher.close()
+
+
+async def test_order_kept_within_channel_and_after_errors() -> None:
+    sender = RecordingSender()
+    dispatcher = OutboundDispatcher(sender)
+    for content in ["a", "fail", "b", "c"]:
+        dispatcher.submit(_out("telegram", content))
+
+    await asyncio.wait_for(dispatcher.join(), timeout=1.0)
+    assert sender.sent == ["a", "b", "c"]
+    await dispatcher.close()
+
+
+async def test_per_chat_workers_isolate_chats() -> None:
+    sender = RecordingSender(blocked={"slow"})
+    dispatcher = OutboundDispatcher(sender, per_chat=True)
+    dispatcher.submit(_out("telegram", "to slow", chat_id="slow"))
+    dispatcher.submit(_out("telegram", "to fast", chat_id="fast"))
+
+    await _eventually(lambda: sender.sent)
+    assert sender.sent == ["to fast"]
+    sender.release.set()
+    await asyncio.wait_for(dispatcher.join(), timeout=1.0)
+    await dispatcher.close()
+
+
+async def test_idle_worker_exits() -> None:
+    sender = RecordingSender()
+    dispatcher = OutboundDispatcher(sender, idle_timeout=0.01)
+    dispatcher.submit(_out("telegram", "x"))
+
+    await _eventually(lambda: not dispatcher._workers)
+    assert sender.sent == ["x"]
+    assert dispatcher.pending == 0
+
+    dispatcher.submit(_out("telegram", "y"))
+    await asyncio.wait_for(dispatcher.join(), timeout=1.0)
+    assert sender.sent == ["x", "y"]
+    await dispatcher.close()
+
+
+async def test_bus_dispatch_outbound_fans_out_concurrently() -> None:
+    bus = MessageBus()
+    slow_sender = RecordingSender(blocked={"email"})
+    fast_sender = RecordingSender()
+    bus.subscribe_outbound("email", slow_sender)
+    bus.subscribe_outbound("telegram", fast_sender)
+    task = asyncio.create_task(bus.dispatch_outbound())
+
+    await bus.publish_outbound(_out("email", "mail"))
+    await bus.publish_outbound(_out("telegram", "tg"))
+    await _eventually(lambda: fast_sender.sent)
+    assert fast_sender.sent == ["tg"]
+    assert slow_sender.sent == []
+
+    slow_sender.release.set()
+    await _eventually(lambda: slow_sender.sent)
+    assert slow_sender.sent == ["mail"]
+    task.cancel()
+
+
+async def test_bus_stop_drains_queued_messages() -> None:
+    bus = MessageBus()
+    sender = RecordingSender()
+    bus.subscribe_outbound("telegram", sender)
+    task = asyncio.create_task(bus.dispatch_outbound())
+    await asyncio.sleep(0)
+
+    await bus.publish_outbound(_out("telegram", "last words"))
+    bus.stop()
+    await asyncio.wait_for(task, timeout=1.0)
+    assert sender.sent == ["last words"]
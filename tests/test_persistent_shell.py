@@ -0,0 +1,85 @@
+import asyncio
+import shutil
+
+import pytest
+
+from nanobot.agent.tools.shell import ExecTool
+
+pytestmark = pytest.mark.skipif(shutil.which("bash") is None, reason="needs bash")
+
+
+@pytest.fixture
+async def tool(tmp_path):
+    tool = ExecTool(working_dir=str(tmp_path), timeout=5, persistent=True)
+    yield tool
+    await tool.shells.close()
+
+
+async def test_state_carries_over_between_commands(tool, tmp_path) -> None:
+    (tmp_path / "sub").mkdir()
+
+    assert await tool.execute("cd sub && export GREETING=hi") == "(no output)"
+    assert await tool.execute("pwd") == f"{tmp_path / 'sub'}\n"
+    assert await tool.execute("echo $GREETING") == "hi\n"
+
+
+async def test_output_exit_code_and_stderr(tool) -> None:
+    result = await tool.execute("printf 'no newline'; echo oops >&2; false")
+    assert result == "no newline\nSTDERR:\noops\n\n\nExit code: 1"
+
+
+async def test_sessions_are_separate(tool) -> None:
+    tool.set_context("telegram", "1")
+    await tool.execute("export WHO=one")
+    tool.set_context("telegram", "2")
+    assert await tool.execute("echo ${WHO:-nobody}") == "nobody\n"
+    assert len(tool.shells) == 2
+
+
+async def test_timeout_resets_shell(tool) -> None:
+    tool.timeout = 0.5
+    await tool.execute("export KEPT=yes")
+
+    assert "shell session was reset" in await tool.execute("sleep 10")
+    assert await tool.execute("echo ${KEPT:-gone}") == "gone\n"
+
+
+async def test_exit_starts_new_shell(tool) -> None:
+    assert "Shell exited" in await tool.execute("echo bye; exit 3")
+    assert await tool.execute("echo again") == "again\n"
+
+
+async def test_guard_still_applies(tool) -> None:
+    assert "blocked by safety guard" in await tool.execute("rm -rf /")
+
+
+async def test_idle_and_max_sessions(tmp_path) -> None:
+    tool = ExecTool(working_dir=str(tmp_path), persistent=True, idle_timeout=0, max_sessions=2)
+    try:
+        for chat in ("a", "b", "c"):
+            tool.set_context("cli", chat)
+            await tool.execute("true")
+        assert len(tool.shells) == 1  # idle shells reaped on each use
+
+        tool.shells.idle_timeout = 600
+        for chat in ("a", "b", "c"):
+            tool.set_context("cli", chat)
+            await tool.execute("true")
+        assert len(tool.shells) == 2
+    finally:
+        await tool.shells.close()
+
+
+async def test_busy_shell_is_not_evicted(tmp_path) -> None:
+    tool = ExecTool(working_dir=str(tmp_path), persistent=True, max_sessions=1)
+    try:
+        tool.set_context("cli", "a")
+        slow = asyncio.create_task(tool.execute("sleep 0.5; echo a"))
+        await asyncio.sleep(0.2)
+
+        tool.set_context("cli", "b")
+        assert await tool.execute("echo b") == "b\n"  # pool full of busy shells: one-shot
+        assert await slow == "a\n"
+        assert len(tool.shells) == 1
+    finally:
+        await tool.shells.close()
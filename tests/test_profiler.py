@@ -0,0 +1,63 @@
+import asyncio
+import time
+
+from nanobot.profiling import LoopWatchdog, Profiler
+
+
+def _busy(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+async def test_report_has_profiled_functions_and_stalls(tmp_path) -> None:
+    profiler = Profiler(lag_interval_s=0.01, stall_threshold_s=0.05)
+    profiler.start(tmp_path)
+    assert profiler.active
+    await asyncio.sleep(0.03)  # let the watchdog take a few samples
+
+    with profiler.section():
+        _busy(0.1)  # blocks the loop: a stall and a slow callback
+        await asyncio.sleep(0.03)
+
+    assert " 0 stall(s)" not in profiler.status()
+    report = await profiler.stop()
+    assert not profiler.active
+
+    text = report.read_text()
+    assert "_busy" in text
+    assert "stalled" in text
+    assert "took" in text  # asyncio's slow-callback warning
+    assert list(tmp_path.glob("profile-*.prof"))
+    assert not asyncio.get_running_loop().get_debug()
+
+
+async def test_sections_are_free_when_inactive(tmp_path) -> None:
+    profiler = Profiler()
+    with profiler.section():
+        pass
+    assert await profiler.stop() is None
+
+    profiler.start(tmp_path)
+    report = await profiler.stop()  # nothing ran inside a section
+    assert "no turns or tool calls" in report.read_text()
+
+
+async def test_stop_inside_section(tmp_path) -> None:
+    profiler = Profiler()
+    profiler.start(tmp_path)
+    with profiler.section():
+        assert await profiler.stop() is not None
+    assert not profiler.active
+
+
+async def test_watchdog_reports_blocking_stack() -> None:
+    watchdog = LoopWatchdog(threshold_s=0.05)
+    watchdog.start()
+    await asyncio.sleep(0.06)
+    _busy(0.25)
+    await asyncio.sleep(0.05)
+    await watchdog.stop()
+
+    assert watchdog.stalls == 1
+    assert "_busy" in watchdog.last_stack
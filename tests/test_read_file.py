@@ -0,0 +1,43 @@
+import pytest
+
+from nanobot.agent.tools import filesystem
+from nanobot.agent.tools.filesystem import ReadFileTool
+
+
+@pytest.fixture(params=[False, True], ids=["read", "mmap"])
+def log_file(request, tmp_path, monkeypatch):
+    if request.param:
+        monkeypatch.setattr(filesystem, "MMAP_THRESHOLD", 0)
+    path = tmp_path / "app.log"
+    path.write_text("".join(f"line {i}\n" for i in range(1, 101)), encoding="utf-8")
+    return path
+
+
+async def test_small_file_is_read_whole(log_file) -> None:
+    text = await ReadFileTool().execute(str(log_file))
+    assert text == log_file.read_text(encoding="utf-8")
+
+
+async def test_line_range(log_file) -> None:
+    text = await ReadFileTool().execute(str(log_file), offset=10, limit=3)
+    assert text.startswith("line 10\nline 11\nline 12\n\n[Showing bytes")
+    assert "offset=13" in text
+
+
+async def test_tail(log_file) -> None:
+    text = await ReadFileTool().execute(str(log_file), tail=2)
+    assert text.startswith("line 99\nline 100\n\n[Showing bytes")
+
+
+async def test_byte_cap_adds_notice(log_file) -> None:
+    text = await ReadFileTool(max_bytes=21).execute(str(log_file))
+    assert text.startswith("line 1\nline 2\nline 3\n")
+    assert "Continue with byte_offset=21" in text
+
+    rest = await ReadFileTool(max_bytes=21).execute(str(log_file), byte_offset=21)
+    assert rest.startswith("line 4\n")
+
+
+async def test_max_bytes_cannot_exceed_tool_cap(log_file) -> None:
+    text = await ReadFileTool(max_bytes=21).execute(str(log_file), max_bytes=10_000)
+    assert "[Showing bytes 0-21 of" in text
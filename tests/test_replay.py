@@ -0,0 +1,49 @@
+import json
+
+from nanobot.bench import RecordedProvider, replay_sessions
+from nanobot.bench.replay import load_turns
+
+
+def _write_session(path, pairs) -> None:
+    lines = [{"_type": "metadata", "created_at": "2026-01-01T00:00:00", "metadata": {}}]
+    for user, assistant in pairs:
+        lines.append({"role": "user", "content": user, "timestamp": "2026-01-01T00:00:00"})
+        lines.append({"role": "assistant", "content": assistant, "timestamp": "2026-01-01T00:00:01"})
+    path.write_text("\n".join(json.dumps(line) for line in lines) + "\n")
+
+
+def test_load_turns_pairs_user_and_assistant(tmp_path) -> None:
+    path = tmp_path / "telegram_1.jsonl"
+    _write_session(path, [("hi", "hello"), ("again", "sure")])
+    with open(path, "a") as f:
+        f.write("not json\n" + json.dumps({"role": "user", "content": "dangling"}) + "\n")
+    assert load_turns(path) == [("hi", "hello"), ("again", "sure")]
+
+
+async def test_recorded_provider_replays_in_order() -> None:
+    provider = RecordedProvider([("hi", "first"), ("hi", "second")])
+    messages = [{"role": "user", "content": "hi"}]
+    assert (await provider.chat(messages)).content == "first"
+    assert (await provider.chat(messages)).content == "second"
+    assert (await provider.chat(messages)).content == "OK."
+
+
+async def test_replay_reports_growing_prompts(tmp_path) -> None:
+    path = tmp_path / "cli_direct.jsonl"
+    _write_session(path, [(f"question {i}", "answer " * 50) for i in range(4)])
+
+    result = await replay_sessions([path], workspace=tmp_path / "scratch")
+
+    assert [t.turn for t in result.turns] == [0, 1, 2, 3]
+    prompts = [t.prompt_tokens for t in result.turns]
+    assert prompts == sorted(prompts) and prompts[-1] > prompts[0]
+    assert [t.history_messages for t in result.turns] == [2, 4, 6, 8]
+    assert all(t.context_build_ms > 0 and t.save_ms > 0 for t in result.turns)
+    assert path.read_text().count("question") == 4  # source is untouched
+
+
+async def test_replay_respects_max_turns(tmp_path) -> None:
+    path = tmp_path / "s.jsonl"
+    _write_session(path, [("a", "b"), ("c", "d"), ("e", "f")])
+    result = await replay_sessions([path], max_turns=2, workspace=tmp_path / "scratch")
+    assert len(result.turns) == 2
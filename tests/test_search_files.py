@@ -0,0 +1,105 @@
+import os
+import re
+
+import pytest
+
+from nanobot.agent.tools import search
+from nanobot.agent.tools.search import SearchFilesTool, TrigramIndex, required_literals
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "app.py").write_text("import os\n\ndef main():\n    return load_config()\n")
+    (tmp_path / "src" / "config.py").write_text("def load_config():\n    return {}\n")
+    (tmp_path / "README.md").write_text("Call load_config() first.\n")
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "node_modules" / "dep.js").write_text("load_config()\n")
+    (tmp_path / "blob.bin").write_bytes(b"load_config\0\0")
+    return tmp_path
+
+
+@pytest.mark.parametrize("use_index", [True, False])
+async def test_search_with_and_without_index(workspace, use_index) -> None:
+    tool = SearchFilesTool(workspace, use_index=use_index)
+    result = await tool.execute("load_config\\(", glob="*.py")
+
+    assert result.splitlines() == [
+        "src/app.py:4:     return load_config()",
+        "src/config.py:1: def load_config():",
+    ]
+
+
+async def test_search_uses_index(workspace, monkeypatch) -> None:
+    tool = SearchFilesTool(workspace)
+    assert len(tool.index) == 0
+
+    await tool.execute("load_config")
+    assert len(tool.index) == 4
+
+    scanned = []
+    real_read = search._read_text
+    monkeypatch.setattr(search, "_read_text", lambda path: scanned.append(path) or real_read(path))
+    result = await tool.execute("def load_config")
+
+    assert result == "src/config.py:1: def load_config():"
+    assert scanned == [str(workspace / "src" / "config.py")]  # the other files never opened
+
+
+async def test_literal_ignore_case_and_context(workspace) -> None:
+    tool = SearchFilesTool(workspace)
+    result = await tool.execute("DEF MAIN(", literal=True, ignore_case=True, context=1)
+
+    assert result.splitlines() == [
+        "src/app.py-2- ",
+        "src/app.py:3: def main():",
+        "src/app.py-4-     return load_config()",
+    ]
+
+
+async def test_result_limit_and_subdirectory(workspace) -> None:
+    tool = SearchFilesTool(workspace)
+
+    limited = await tool.execute("load_config", max_results=1)
+    assert limited.splitlines()[-1] == "[Stopped after 1 matches]"
+
+    scoped = await tool.execute("load_config", path="src")
+    assert "README.md" not in scoped and "src/config.py" in scoped
+
+
+async def test_invalid_regex_and_no_match(workspace) -> None:
+    tool = SearchFilesTool(workspace)
+    assert (await tool.execute("(")).startswith("Error: Invalid regex")
+    assert await tool.execute("nothing_here") == "No matches for: nothing_here"
+
+
+def test_index_updates_on_change(workspace) -> None:
+    index = TrigramIndex(workspace)
+    assert index.refresh() == 4  # node_modules skipped; the binary file is indexed as empty
+    assert index.refresh() == 0
+
+    config = workspace / "src" / "config.py"
+    config.write_text("def read_settings():\n    return {}\n")
+    os.utime(config, (1, 1))
+    (workspace / "README.md").unlink()
+
+    assert index.refresh() == 1
+    assert [os.path.basename(p) for p in index.candidates(["load_config"])] == ["app.py"]
+    assert [os.path.basename(p) for p in index.candidates(["read_settings"])] == ["config.py"]
+
+
+def test_required_literals() -> None:
+    assert required_literals(r"load_config\(") == ["load_config("]
+    assert required_literals(r"def \w+_config") == ["def ", "_config"]
+    assert required_literals(r"colou?r_name") == ["colo", "r_name"]
+    assert required_literals(r"(optional)?tail") == ["tail"]
+    assert required_literals(r"foo|bar") == []
+
+
+def test_required_literals_skip_quantifiers_and_flags() -> None:
+    assert required_literals(r"x{10,20}") == []
+    assert required_literals(r"ab{0,2}c") == []
+    assert required_literals(r"abc{2,}def") == ["def"]
+    assert required_literals(r"(?x)f o o") == []
+    assert required_literals(r"(?i:abc)def") == []
+    assert required_literals(r"f o o", re.VERBOSE) == []
@@ -0,0 +1,87 @@
+from typing import Any
+
+from nanobot.agent.tools.base import Tool
+from nanobot.agent.tools.registry import ToolRegistry
+from nanobot.agent.tools.selection import LoadToolsTool, ToolSelector, keywords
+
+
+class NamedTool(Tool):
+    def __init__(self, name: str, description: str):
+        self._name, self._description = name, description
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def description(self) -> str:
+        return self._description
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {"type": "object", "properties": {}}
+
+    async def execute(self, **kwargs: Any) -> str:
+        return "ok"
+
+
+def _setup(max_tools: int = 2) -> tuple[ToolRegistry, ToolSelector, LoadToolsTool]:
+    reg = ToolRegistry()
+    for name, description in [
+        ("read_file", "Read the contents of a file."),
+        ("web_search", "Search the web. Returns titles and URLs."),
+        ("cron", "Schedule reminders and recurring tasks."),
+        ("n8n", "Manage n8n workflows: list, activate or run them."),
+    ]:
+        reg.register(NamedTool(name, description))
+    selector = ToolSelector(reg, core=["read_file", "load_tools"], max_tools=max_tools)
+    load = LoadToolsTool(selector)
+    reg.register(load)
+    return reg, selector, load
+
+
+def test_keywords_drop_stopwords_and_plurals() -> None:
+    assert keywords("Please list the n8n workflows") == {"list", "n8n", "workflow"}
+
+
+def test_select_offers_core_plus_matches() -> None:
+    _, selector, _ = _setup()
+
+    assert selector.select("hello there") == {"read_file", "load_tools"}
+    assert selector.select("remind me about the recurring backup") == {"read_file", "load_tools", "cron"}
+
+
+def test_select_caps_matches_and_ranks_name_hits_first() -> None:
+    _, selector, _ = _setup(max_tools=1)
+    # "search" hits web_search's name (2) and description (1); cron only matches its description (2)
+    assert selector.match("search for recurring tasks") == ["web_search", "cron"]
+    assert selector.select("search for recurring tasks") == {"read_file", "load_tools", "web_search"}
+
+
+def test_selector_sees_tools_registered_later() -> None:
+    reg, selector, _ = _setup()
+    assert selector.match("github issue") == []
+    reg.register(NamedTool("github", "Open and comment on GitHub issues."))
+    assert selector.match("github issue") == ["github"]
+
+
+async def test_load_tools_by_name_query_and_listing() -> None:
+    _, _, load = _setup()
+
+    listing = await load.execute()
+    assert "- cron: Schedule reminders and recurring tasks" in listing
+    assert "load_tools" not in listing
+
+    assert await load.execute(names=["cron", "nope"]) == "Loaded: cron. Error: Unknown tool(s): nope"
+    assert await load.execute(query="web search") == "Loaded: web_search"
+    assert load.loaded == {"cron", "web_search"}
+    assert "No tools match" in await load.execute(query="quantum")
+
+    load.begin_turn()
+    assert load.loaded == set()
+
+
+def test_registry_returns_definition_subset() -> None:
+    reg, _, _ = _setup()
+    names = [d["function"]["name"] for d in reg.get_definitions({"cron", "read_file"})]
+    assert names == ["read_file", "cron"]
@@ -1,3 +1,4 @@
+import json
 from typing import Any
 
 from nanobot.agent.tools.base import Tool
@@ -86,3 +87,30 @@ async def test_registry_returns_validation_error() -> None:
     reg.register(SampleTool())
     result = await reg.execute("sample", {"query": "hi"})
     assert "Invalid parameters" in result
+
+
+def test_registry_caches_definitions_until_tools_change() -> None:
+    reg = ToolRegistry()
+    reg.register(SampleTool())
+    defs = reg.get_definitions()
+    assert reg.get_definitions() is defs
+    assert json.loads(reg.get_definitions_json()) == defs
+
+    class OtherTool(SampleTool):
+        @property
+        def name(self) -> str:
+            return "other"
+
+    reg.register(OtherTool())
+    assert [d["function"]["name"] for d in reg.get_definitions()] == ["sample", "other"]
+    assert '"other"' in reg.get_definitions_json()
+
+    reg.unregister("other")
+    assert [d["function"]["name"] for d in reg.get_definitions()] == ["sample"]
+    assert '"other"' not in reg.get_definitions_json()
+
+
+def test_validator_is_compiled_once() -> None:
+    tool = SampleTool()
+    assert tool.validator is tool.validator
+    assert tool.validate_params({"query": "hi", "count": 2}) == []
@@ -0,0 +1,94 @@
+import asyncio
+import json
+
+import pytest
+
+from nanobot.bus.events import InboundMessage, OutboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.tracing import TRACE_KEY, Tracer, tracer
+from nanobot.tracing.tracer import group_traces
+
+
+def test_nested_spans_share_trace_and_link_parents() -> None:
+    t = Tracer()
+    with t.span("outer") as outer:
+        with t.span("inner", tool="exec") as inner:
+            pass
+
+    assert inner.trace_id == outer.trace_id
+    assert inner.parent_id == outer.span_id
+    assert outer.parent_id is None
+    assert [s.name for s in t.spans] == ["inner", "outer"]
+    assert inner.attrs == {"tool": "exec"}
+
+
+def test_span_marks_errors() -> None:
+    t = Tracer()
+    with pytest.raises(RuntimeError):
+        with t.span("boom"):
+            raise RuntimeError("bad")
+    [span] = t.spans
+    assert span.status == "error"
+    assert span.attrs["error"] == "bad"
+
+
+def test_parent_taken_from_metadata() -> None:
+    t = Tracer()
+    with t.span("receive") as receive:
+        metadata = t.inject({})
+    with t.span("turn", parent=metadata) as turn:
+        pass
+
+    assert metadata[TRACE_KEY] == receive.context()
+    assert turn.trace_id == receive.trace_id
+    assert turn.parent_id == receive.span_id
+
+
+def test_inject_prefers_active_span_over_passed_through_context() -> None:
+    t = Tracer()
+    inbound = t.inject({})
+    with t.span("turn", parent=inbound) as turn:
+        outbound = t.inject(dict(inbound))
+    assert outbound[TRACE_KEY] == turn.context()
+    assert t.inject(outbound) is outbound
+
+
+def test_disabled_tracer_records_nothing() -> None:
+    t = Tracer(enabled=False)
+    with t.span("x") as span:
+        pass
+    assert span is None
+    assert t.inject({}) == {}
+    assert len(t.spans) == 0
+
+
+def test_jsonl_export_and_grouping(tmp_path) -> None:
+    path = tmp_path / "traces.jsonl"
+    t = Tracer()
+    t.configure(export_path=path)
+    with t.span("a"):
+        with t.span("b"):
+            pass
+    with t.span("c"):
+        pass
+    t.configure(export_path=None)
+
+    spans = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(spans) == 3
+    grouped = group_traces(spans)
+    assert [[s["name"] for s in trace] for trace in grouped] == [["c"], ["a", "b"]]
+
+
+async def test_bus_stamps_trace_context() -> None:
+    bus = MessageBus()
+    await bus.publish_inbound(InboundMessage(channel="telegram", sender_id="u", chat_id="c", content="hi"))
+    inbound = await bus.consume_inbound()
+    assert inbound.metadata[TRACE_KEY]["trace_id"]
+
+    with tracer.span("agent.turn", parent=inbound.metadata) as turn:
+        await bus.publish_outbound(OutboundMessage(
+            channel="telegram", chat_id="c", content="ok", metadata=inbound.metadata,
+        ))
+    outbound = await asyncio.wait_for(bus.consume_outbound(), timeout=1)
+    assert outbound.metadata[TRACE_KEY] == turn.context()
+    assert turn.trace_id == inbound.metadata[TRACE_KEY]["trace_id"]
@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+from nanobot.agent.usage import BudgetExceededError, UsageLedger, read_usage
+from nanobot.providers.openai_codex_provider import _parse_usage
+
+
+def test_record_appends_to_day_file(tmp_path) -> None:
+    ledger = UsageLedger(tmp_path)
+    ledger.record({"prompt_tokens": 10, "completion_tokens": 5}, model="m", site="turn",
+                  session_key="telegram:1", channel="telegram")
+
+    [day_file] = tmp_path.glob("*.jsonl")
+    [entry] = read_usage(day_file)
+    assert entry["session"] == "telegram:1"
+    assert entry["site"] == "turn"
+    assert entry["prompt_tokens"] + entry["completion_tokens"] == 15
+    assert ledger.today_total == 15
+
+
+def test_totals_survive_restart(tmp_path) -> None:
+    UsageLedger(tmp_path).record({"prompt_tokens": 50, "completion_tokens": 50},
+                                 model="m", site="turn", session_key="s")
+    ledger = UsageLedger(tmp_path, session_daily_tokens=100)
+
+    assert ledger.today_total == 100
+    with pytest.raises(BudgetExceededError):
+        ledger.check("s")
+    ledger.check("another")
+
+
+def test_daily_budget_applies_to_all_sessions(tmp_path) -> None:
+    ledger = UsageLedger(tmp_path, daily_tokens=30)
+    ledger.record({"prompt_tokens": 30}, model="m", site="subagent", session_key="a")
+
+    with pytest.raises(BudgetExceededError, match="Daily"):
+        ledger.check("b")
+
+
+def test_unlimited_by_default(tmp_path) -> None:
+    ledger = UsageLedger(tmp_path)
+    ledger.record({"prompt_tokens": 10**9}, model="m", site="turn", session_key="s")
+    ledger.check("s")
+
+
+def test_read_usage_skips_bad_lines(tmp_path) -> None:
+    path = tmp_path / "2026-01-01.jsonl"
+    path.write_text(json.dumps({"prompt_tokens": 1}) + "\nnot json\n")
+    assert read_usage(path) == [{"prompt_tokens": 1}]
+
+
+def test_codex_usage_mapped_to_prompt_and_completion() -> None:
+    assert _parse_usage({"input_tokens": 12, "output_tokens": 3, "total_tokens": 15}) == {
+        "prompt_tokens": 12, "completion_tokens": 3, "total_tokens": 15,
+    }
+    assert _parse_usage(None) == {}
+
+
+async def test_record_in_event_loop_is_written_in_batches(tmp_path, monkeypatch) -> None:
+    ledger = UsageLedger(tmp_path, daily_tokens=25)
+    opened = []
+    real_open = open
+    monkeypatch.setattr("builtins.open", lambda *a, **kw: opened.append(a[0]) or real_open(*a, **kw))
+    for _ in range(3):
+        ledger.record({"prompt_tokens": 10}, model="m", site="turn", session_key="s")
+
+    assert opened == []  # nothing written on the event loop
+    with pytest.raises(BudgetExceededError):
+        ledger.check("s")  # totals are current before the flush
+
+    await ledger.flush()
+    assert len(opened) == 1
+    [day_file] = tmp_path.glob("*.jsonl")
+    assert len(read_usage(day_file)) == 3
@@ -0,0 +1,122 @@
+import json
+import time
+
+import httpx
+import pytest
+
+from nanobot.agent.tools.web import WebFetchTool, WebSearchTool
+from nanobot.utils.http_cache import CacheEntry, WebCache, freshness, normalize_url
+
+
+@pytest.fixture
+def serve(monkeypatch):
+    """Route the tools' HTTP client to an in-process handler; returns the seen requests."""
+    real_client = httpx.AsyncClient
+    seen: list[httpx.Request] = []
+
+    def _serve(handler):
+        def _record(request):
+            seen.append(request)
+            return handler(request)
+
+        monkeypatch.setattr(
+            "nanobot.agent.tools.web.httpx.AsyncClient",
+            lambda **kwargs: real_client(transport=httpx.MockTransport(_record), **kwargs),
+        )
+        return seen
+
+    return _serve
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = WebCache(tmp_path / "web_cache.db")
+    yield cache
+    cache.close()
+
+
+def test_normalize_url() -> None:
+    assert normalize_url("HTTPS://Example.com:443/a?b=2&a=1#top") == "https://example.com/a?a=1&b=2"
+    assert normalize_url("http://example.com") == "http://example.com/"
+    assert normalize_url("http://example.com:8080/") == "http://example.com:8080/"
+
+
+def test_freshness() -> None:
+    assert freshness({"cache-control": "public, max-age=60"}) == 60
+    assert freshness({"cache-control": "no-store"}) is None
+    assert freshness({"cache-control": "no-cache"}) == 0
+    assert freshness({"expires": "Thu, 01 Jan 1970 00:00:00 GMT"}) == 0
+    assert freshness({}, default_ttl=42) == 42
+
+
+def test_lru_eviction(tmp_path) -> None:
+    cache = WebCache(tmp_path / "web_cache.db", max_bytes=1000)
+    later = time.time() + 60
+    cache.put("a", CacheEntry("x" * 400, later))
+    cache.put("b", CacheEntry("x" * 400, later))
+    cache.get("a")  # now "b" is least recently used
+    cache.put("c", CacheEntry("x" * 400, later))
+
+    assert cache.get("b") is None
+    assert cache.get("a") and cache.get("c")
+    assert cache.size == 800
+    cache.close()
+
+    assert WebCache(tmp_path / "web_cache.db", max_bytes=1000).size == 800
+
+
+async def test_fresh_page_is_served_from_cache(serve, cache) -> None:
+    seen = serve(lambda request: httpx.Response(
+        200, headers={"content-type": "text/plain", "cache-control": "max-age=60"}, text="hello"))
+    tool = WebFetchTool(cache=cache)
+
+    first = json.loads(await tool.execute("https://example.com/page"))
+    second = json.loads(await tool.execute("https://EXAMPLE.com/page#intro", maxChars=100))
+
+    assert len(seen) == 1
+    assert not first["cached"] and second["cached"]
+    assert second["text"] == "hello"
+
+
+async def test_stale_page_is_revalidated(serve, cache) -> None:
+    def handler(request):
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"cache-control": "max-age=60"})
+        return httpx.Response(200, headers={"content-type": "text/plain", "etag": '"v1"',
+                                            "cache-control": "no-cache"}, text="hello")
+
+    seen = serve(handler)
+    tool = WebFetchTool(cache=cache)
+
+    await tool.execute("https://example.com/page")
+    revalidated = json.loads(await tool.execute("https://example.com/page"))
+    await tool.execute("https://example.com/page")  # fresh again after the 304
+
+    assert len(seen) == 2
+    assert seen[1].headers["if-none-match"] == '"v1"'
+    assert revalidated["cached"] and revalidated["text"] == "hello"
+
+
+async def test_no_store_is_not_cached(serve, cache) -> None:
+    seen = serve(lambda request: httpx.Response(
+        200, headers={"content-type": "text/plain", "cache-control": "no-store"}, text="secret"))
+    tool = WebFetchTool(cache=cache)
+
+    await tool.execute("https://example.com/page")
+    await tool.execute("https://example.com/page")
+
+    assert len(seen) == 2
+    assert cache.size == 0
+
+
+async def test_search_results_are_cached_by_query(serve, cache) -> None:
+    seen = serve(lambda request: httpx.Response(200, json={"web": {"results": [
+        {"title": "Cats", "url": "https://example.com/cats", "description": "All about cats"},
+    ]}}))
+    tool = WebSearchTool(api_key="key", cache=cache)
+
+    first = await tool.execute("cute  cats")
+    second = await tool.execute("Cute Cats")
+
+    assert len(seen) == 1
+    assert second == first and "All about cats" in first
@@ -0,0 +1,71 @@
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+from nanobot.agent.tools.web import WebFetchTool
+from nanobot.utils.offload import run_in_process
+
+_PAGE = (
+    "<html><head><title>Cats</title></head><body><article>"
+    + "<p>Cats are small carnivorous mammals that people keep as pets. </p>" * 20
+    + '<p>See <a href="https://example.com/more">more</a>.</p></article></body></html>'
+)
+
+
+@pytest.fixture
+def serve(monkeypatch):
+    """Route the tool's HTTP client to an in-process handler."""
+    real_client = httpx.AsyncClient
+
+    def _serve(handler):
+        monkeypatch.setattr(
+            "nanobot.agent.tools.web.httpx.AsyncClient",
+            lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs),
+        )
+
+    return _serve
+
+
+async def test_html_is_extracted_in_worker_process(serve) -> None:
+    serve(lambda request: httpx.Response(200, headers={"content-type": "text/html"}, text=_PAGE))
+    result = json.loads(await WebFetchTool().execute("https://example.com/cats"))
+
+    assert result["extractor"] == "readability"
+    assert result["text"].startswith("# Cats")
+    assert "[more](https://example.com/more)" in result["text"]
+    assert not result["truncated"]
+
+
+async def test_download_stops_at_byte_limit(serve) -> None:
+    sent = []
+
+    async def body():
+        for _ in range(100):
+            sent.append(1)
+            yield b"x" * 1000
+
+    serve(lambda request: httpx.Response(200, headers={"content-type": "text/plain"}, content=body()))
+    result = json.loads(await WebFetchTool(max_bytes=5000).execute("https://example.com/big"))
+
+    assert result["truncated"]
+    assert result["length"] == 5000
+    assert len(sent) < 100
+
+
+async def test_truncated_json_falls_back_to_raw(serve) -> None:
+    payload = json.dumps({"items": list(range(1000))})
+    serve(lambda request: httpx.Response(200, headers={"content-type": "application/json"}, text=payload))
+    result = json.loads(await WebFetchTool(max_bytes=100).execute("https://example.com/api"))
+    assert result["extractor"] == "raw"
+    assert result["truncated"]
+
+
+async def test_process_pool_timeout_recovers() -> None:
+    start = time.perf_counter()
+    with pytest.raises(asyncio.TimeoutError):
+        await run_in_process(time.sleep, 30, timeout=0.5)
+    assert time.perf_counter() - start < 10
+    assert await run_in_process(sum, [1, 2, 3], timeout=30) == 6